@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION INFERENCE BACKENDS
+========================================
+
+The following program is used to run Stream Classification model with eager, TorchScript or ONNX Runtime backend
+"""
+
+# %%
+# Importing Libraries
+from model import *
+import io
+import time
+import zlib
+from collections import OrderedDict
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+# %%
+# Available Backends
+backend_names = ('eager', 'torchscript', 'onnx')
+
+# %%
+# Eager Model Loading Function
+def load_eager(laddr, num_classes, device = 'cpu', phases = None, architecture = 'convnext'):
+    """
+    This function is used to load trained model weights into eager model
+
+    Model is built on meta device, so random weight initialization is skipped, and weights file is memory
+    mapped & assigned to model as is, without extra copy. Model on CPU therefore keeps reading its weights from
+    file pages, so weights file must only be replaced by renaming new file over it, never overwritten or
+    truncated in place. ConvNeXt weights trained with early exit heads are loaded into early exit model.
+
+    Function Input
+    ===============
+    laddr : Absolute address of model weights file
+    num_classes : Number of Stream Classification labels
+    device : Device to load model on ( default : cpu )
+    phases : Dictionary to record time in seconds of model construction & weights loading into ( default : None )
+    architecture : Model architecture of weights file, out of 'convnext', 'convnext_exits' & 'mobilenet' ( default : convnext )
+
+    Function Output
+    ================
+    Eager model in evaluation mode
+    """
+    phases = OrderedDict() if phases is None else phases
+    st = time.perf_counter()
+    try:
+        state_dict = torch.load(laddr, map_location = device, mmap = True, weights_only = True)
+    except RuntimeError:
+        # Weights saved in legacy format can not be memory mapped
+        state_dict = torch.load(laddr, map_location = device, weights_only = True)
+    loading = time.perf_counter() - st
+    if architecture == 'convnext' and any(i.startswith('exits.') for i in state_dict):
+        architecture = 'convnext_exits'
+    st = time.perf_counter()
+    with torch.device('meta'):
+        mod = model_architectures[architecture](num_classes)
+    phases['Model Construction'] = time.perf_counter() - st
+    st = time.perf_counter()
+    mod.load_state_dict(state_dict, assign = True)
+    mod.to(device)
+    mod.eval()
+    phases['Weights Loading'] = loading + time.perf_counter() - st
+    return mod
+
+# %%
+# CPU bfloat16 Support Function
+def cpu_supports_bf16():
+    """
+    This function is used to find if CPU has native bfloat16 instructions, without which bfloat16 autocast is slower than float32
+
+    Function Input
+    ===============
+    None
+
+    Function Output
+    ================
+    Boolean variable, True if CPU reports AVX512 bfloat16 or AMX bfloat16 support
+    """
+    if not torch.backends.mkldnn.is_available():
+        return False
+    try:
+        with open('/proc/cpuinfo') as file1:
+            flags = set(' '.join(i for i in file1 if i.startswith('flags')).split())
+    except OSError:
+        return False
+    return bool(flags & {'avx512_bf16', 'amx_bf16'})
+
+# %%
+# Model Version Function
+def model_version(laddr, chunk_size = 1 << 20):
+    """
+    This function is used to find version of model file from its content, so same file reports same version on every host
+
+    Function Input
+    ===============
+    laddr : Absolute address of model file
+    chunk_size : Number of bytes to read at a time ( default : 1 MB )
+
+    Function Output
+    ================
+    Model version as CRC32 checksum of file in hexadecimal
+    """
+    crc = 0
+    with open(laddr, 'rb') as file1:
+        for chunk in iter(lambda: file1.read(chunk_size), b''):
+            crc = zlib.crc32(chunk, crc)
+    return f'{crc:08x}'
+
+# %%
+# TorchScript Conversion Function
+def to_torchscript(mod, device = 'cpu', optimize = True, channels_last = False):
+    """
+    This function is used to trace eager model, freeze its weights & optimize its graph for inference
+
+    Optimized graph may contain backend specific operators which can not be saved, so exported archives
+    are only frozen & optimized again when loaded.
+
+    Function Input
+    ===============
+    mod : Eager model in evaluation mode
+    device : Device on which model is loaded ( default : cpu )
+    optimize : Boolean variable to apply inference graph optimizations after freezing ( default : True )
+    channels_last : Boolean variable to trace model with weights & input in channels last memory format ( default : False )
+
+    Function Output
+    ================
+    Frozen TorchScript module, optimized if required
+    """
+    memory_format = torch.channels_last if channels_last else torch.contiguous_format
+    with torch.no_grad():
+        frozen = torch.jit.freeze(torch.jit.trace(mod.to(memory_format = memory_format), torch.rand(dummy_input_shape, device = device).contiguous(memory_format = memory_format)).eval())
+        return torch.jit.optimize_for_inference(frozen) if optimize else frozen
+
+# %%
+# ONNX Conversion Function
+def to_onnx(mod, opset = 17):
+    """
+    This function is used to export eager model to ONNX with dynamic batch size
+
+    Function Input
+    ===============
+    mod : Eager model in evaluation mode, loaded on cpu
+    opset : ONNX opset version to export with ( default : 17 )
+
+    Function Output
+    ================
+    Serialized ONNX model as bytes
+    """
+    buf = io.BytesIO()
+    with torch.no_grad():
+        torch.onnx.export(mod, torch.rand(dummy_input_shape), buf, input_names = ['input'], output_names = ['logits'], dynamic_axes = {'input': {0: 'batch'}, 'logits': {0: 'batch'}}, opset_version = opset, dynamo = False)
+    return buf.getvalue()
+
+# %%
+# Eager Backend Class
+class Eager_Backend:
+    def __init__(self, laddr, num_classes, device = 'cpu', channels_last = False, bf16 = False, architecture = 'convnext'):
+        """
+        This method is used to initialize backend which runs model eagerly, as defined in model.py
+
+        Method Input
+        =============
+        laddr : Absolute address of model weights file
+        num_classes : Number of Stream Classification labels
+        device : Device to run model on ( default : cpu )
+        channels_last : Boolean variable to run model & input in channels last memory format ( default : False )
+        bf16 : Boolean variable to run model under CPU bfloat16 autocast ( default : False )
+        architecture : Model architecture of weights file, out of 'convnext', 'convnext_exits' & 'mobilenet' ( default : convnext )
+
+        Method Output
+        ==============
+        None
+        """
+        self.name = 'eager'
+        self.device = device
+        self.phases = OrderedDict()
+        self.memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        self.bf16 = bf16
+        self.mod = load_eager(laddr, num_classes, device, self.phases, architecture).to(memory_format = self.memory_format)
+
+    def __call__(self, inp_tensor):
+        """
+        This method is used to perform forward pass on preprocessed input batch
+
+        Method Input
+        =============
+        inp_tensor : Torch tensor with following shape:
+                            [ Batch x Channel x Height x Width ]
+
+        Method Output
+        ==============
+        Model logits as float32 Torch tensor
+        """
+        with torch.no_grad(), torch.autocast('cpu', dtype = torch.bfloat16, enabled = self.bf16):
+            return self.mod(inp_tensor.to(self.device, memory_format = self.memory_format)).float()
+
+# %%
+# Early Exit Backend Class
+class Early_Exit_Backend(Eager_Backend):
+    def __init__(self, laddr, num_classes, device = 'cpu', channels_last = False, bf16 = False, threshold = 0.9, stats = None):
+        """
+        This method is used to initialize eager backend in which every frame stops at first head of early exit model
+        whose top label probability reaches threshold
+
+        Method Input
+        =============
+        laddr : Absolute address of model weights file, trained with early exit heads
+        num_classes : Number of Stream Classification labels
+        device : Device to run model on ( default : cpu )
+        channels_last : Boolean variable to run model & input in channels last memory format ( default : False )
+        bf16 : Boolean variable to run model under CPU bfloat16 autocast ( default : False )
+        threshold : Top label probability at which frame exits ( default : 0.9 )
+        stats : Dictionary of frame counts per exit head to accumulate into, kept across model reloads ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        super(Early_Exit_Backend, self).__init__(laddr, num_classes, device, channels_last, bf16)
+        if not isinstance(self.mod, Early_Exit_Model):
+            raise ValueError(f'Early exit requires model trained with early exit heads, {laddr} has none')
+        self.threshold = threshold
+        self.stats = dict() if stats is None else stats
+        for name in self.mod.exit_names:
+            self.stats.setdefault(name, 0)
+
+    @property
+    def stages(self):
+        """
+        This method is used to fetch forward passes to warm up backend with, without counting frames per exit head
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Tuple of forward pass through all model stages
+        """
+        return (super(Early_Exit_Backend, self).__call__,)
+
+    def __call__(self, inp_tensor):
+        """
+        This method is used to perform early exit forward pass on preprocessed input batch
+
+        Method Input
+        =============
+        inp_tensor : Torch tensor with following shape:
+                            [ Batch x Channel x Height x Width ]
+
+        Method Output
+        ==============
+        Model logits of exit head of every frame as float32 Torch tensor
+        """
+        with torch.no_grad(), torch.autocast('cpu', dtype = torch.bfloat16, enabled = self.bf16):
+            logits, exits = self.mod.early_exit(inp_tensor.to(self.device, memory_format = self.memory_format), self.threshold)
+        for name, count in zip(self.mod.exit_names, torch.bincount(exits, minlength = len(self.mod.exit_names)).tolist()):
+            self.stats[name] += count
+        return logits
+
+# %%
+# TorchScript Backend Class
+class TorchScript_Backend(Eager_Backend):
+    def __init__(self, laddr, num_classes, device = 'cpu', channels_last = False, bf16 = False, architecture = 'convnext'):
+        """
+        This method is used to initialize backend which runs frozen & optimized TorchScript graph
+
+        Model file can either be TorchScript archive written by export_model.py or Trainer quantizer,
+        or model weights file, which is then traced & frozen at startup. Frozen graph has its dtypes
+        fixed at tracing, so it is always run in float32.
+
+        Method Input
+        =============
+        laddr : Absolute address of TorchScript archive or model weights file
+        num_classes : Number of Stream Classification labels
+        device : Device to run model on ( default : cpu )
+        channels_last : Boolean variable to run model & input in channels last memory format ( default : False )
+        bf16 : Unused, accepted for same signature as other backends ( default : False )
+        architecture : Model architecture of weights file, unused for TorchScript archives ( default : convnext )
+
+        Method Output
+        ==============
+        None
+        """
+        self.name = 'torchscript'
+        self.device = device
+        self.phases = OrderedDict()
+        self.memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        self.bf16 = False
+        st = time.perf_counter()
+        try:
+            self.mod = torch.jit.load(laddr, map_location = device)
+        except RuntimeError:
+            mod = load_eager(laddr, num_classes, device, self.phases, architecture)
+            st = time.perf_counter()
+            self.mod = to_torchscript(mod, device, channels_last = channels_last)
+            self.phases['TorchScript Conversion'] = time.perf_counter() - st
+            return
+        self.phases['TorchScript Loading'] = time.perf_counter() - st
+        st = time.perf_counter()
+        try:
+            self.mod = torch.jit.optimize_for_inference(self.mod)
+        except RuntimeError:
+            # Graphs which can not be optimized further, such as quantized models, are run as loaded
+            pass
+        self.phases['Graph Optimization'] = time.perf_counter() - st
+
+# %%
+# ONNX Runtime Backend Class
+class ONNX_Backend:
+    def __init__(self, laddr, num_classes, device = 'cpu', threads = 0, architecture = 'convnext'):
+        """
+        This method is used to initialize backend which runs model on ONNX Runtime CPU execution provider
+
+        Model file can either be ONNX model written by export_model.py, or model weights file,
+        which is then exported to ONNX in memory at startup.
+
+        Method Input
+        =============
+        laddr : Absolute address of ONNX model or model weights file
+        num_classes : Number of Stream Classification labels
+        device : Device requested for model, only cpu is supported ( default : cpu )
+        threads : Number of intra operation threads, 0 for ONNX Runtime default ( default : 0 )
+        architecture : Model architecture of weights file, unused for ONNX models ( default : convnext )
+
+        Method Output
+        ==============
+        None
+        """
+        if onnxruntime is None:
+            raise ImportError('ONNX backend requires onnxruntime, install it with "pip3 install onnxruntime"')
+        self.name = 'onnx'
+        self.device = 'cpu'
+        self.phases = OrderedDict()
+        self.bf16 = False
+        if laddr.endswith('.onnx'):
+            with open(laddr, 'rb') as file1:
+                model_bytes = file1.read()
+        else:
+            mod = load_eager(laddr, num_classes, 'cpu', self.phases, architecture)
+            st = time.perf_counter()
+            model_bytes = to_onnx(mod)
+            self.phases['ONNX Conversion'] = time.perf_counter() - st
+        st = time.perf_counter()
+        opts = onnxruntime.SessionOptions()
+        opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(model_bytes, opts, providers = ['CPUExecutionProvider'])
+        self.__input__ = self.session.get_inputs()[0].name
+        self.phases['ONNX Session Creation'] = time.perf_counter() - st
+
+    def __call__(self, inp_tensor):
+        """
+        This method is used to perform forward pass on preprocessed input batch
+
+        Method Input
+        =============
+        inp_tensor : Torch tensor with following shape:
+                            [ Batch x Channel x Height x Width ]
+
+        Method Output
+        ==============
+        Model logits as Torch tensor
+        """
+        out1 = self.session.run(None, {self.__input__: inp_tensor.cpu().numpy()})[0]
+        return torch.from_numpy(out1)
+
+# %%
+# Backend Loading Function
+def load_backend(name, laddr, num_classes, device = 'cpu', channels_last = False, bf16 = False, architecture = 'convnext', exit_threshold = 0.0, exit_stats = None):
+    """
+    This function is used to initialize subject inference backend
+
+    ONNX Runtime picks its own memory layout, so channels last & bfloat16 only apply to eager & TorchScript
+    backends, and bfloat16 only to eager backend. Early exit only applies to eager backend of ConvNeXt model,
+    as traced graphs run all stages.
+
+    Function Input
+    ===============
+    name : Backend name, out of 'eager', 'torchscript' & 'onnx'
+    laddr : Absolute address of model file for subject backend
+    num_classes : Number of Stream Classification labels
+    device : Device to run model on ( default : cpu )
+    channels_last : Boolean variable to run model & input in channels last memory format ( default : False )
+    bf16 : Boolean variable to run model under CPU bfloat16 autocast ( default : False )
+    architecture : Model architecture of weights file, out of 'convnext', 'convnext_exits' & 'mobilenet' ( default : convnext )
+    exit_threshold : Top label probability at which frame exits at early exit head, 0 to run all stages ( default : 0.0 )
+    exit_stats : Dictionary of frame counts per exit head to accumulate into ( default : None )
+
+    Function Output
+    ================
+    Backend object, callable on preprocessed input batch
+    """
+    if name == 'eager' and architecture == 'convnext' and exit_threshold > 0:
+        return Early_Exit_Backend(laddr, num_classes, device, channels_last, bf16, exit_threshold, exit_stats)
+    if name == 'eager':
+        return Eager_Backend(laddr, num_classes, device, channels_last, bf16, architecture)
+    if name == 'torchscript':
+        return TorchScript_Backend(laddr, num_classes, device, channels_last, bf16, architecture)
+    if name == 'onnx':
+        return ONNX_Backend(laddr, num_classes, device, threads = torch.get_num_threads(), architecture = architecture)
+    raise ValueError(f'Unknown inference backend: {name}, expected one of {backend_names}')
+
+# %%
+# Cascade Backend Class
+class Cascade_Backend:
+    def __init__(self, screener, model, threshold = 0.9, audit = 0.0, stats = None):
+        """
+        This method is used to initialize backend which runs screener model on every frame, and escalates
+        only frames whose screener confidence is below threshold to main model
+
+        To measure how far cascade drifts from main model only path, random audit fraction of frames accepted
+        by screener are run through main model too, and their top labels compared. Audited frames are answered
+        with main model logits, as they are already computed.
+
+        Method Input
+        =============
+        screener : Backend object of screener model
+        model : Backend object of main model
+        threshold : Screener top label probability below which frame is escalated to main model ( default : 0.9 )
+        audit : Fraction of frames accepted by screener to also run through main model ( default : 0.0 )
+        stats : Dictionary of cascade counters to accumulate into, kept across model reloads ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        self.screener = screener
+        self.model = model
+        self.threshold = threshold
+        self.audit = audit
+        self.name = model.name
+        self.device = model.device
+        self.bf16 = model.bf16
+        self.phases = OrderedDict([(f'Screener {k}', v) for k, v in screener.phases.items()] + list(model.phases.items()))
+        self.stats = {'screened': 0, 'escalated': 0, 'audited': 0, 'agreed': 0} if stats is None else stats
+        self.timings = dict()
+
+    @property
+    def stages(self):
+        """
+        This method is used to fetch backends of cascade stages, in order of execution
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Tuple of screener & main model backend objects, or forward passes of main model if it has stages of its own
+        """
+        return (self.screener,) + tuple(getattr(self.model, 'stages', (self.model,)))
+
+    def __call__(self, inp_tensor):
+        """
+        This method is used to perform cascaded forward pass on preprocessed input batch
+
+        Time in seconds of last call's screening & escalation stages is kept in timings dictionary.
+
+        Method Input
+        =============
+        inp_tensor : Torch tensor with following shape:
+                            [ Batch x Channel x Height x Width ]
+
+        Method Output
+        ==============
+        Screener or main model logits per frame, as float32 Torch tensor
+        """
+        st = time.perf_counter()
+        logits = self.screener(inp_tensor).float().cpu()
+        confidence = torch.softmax(logits, dim = 1).max(dim = 1).values
+        escalate = confidence < self.threshold
+        audited = ~escalate & (torch.rand(len(logits)) < self.audit) if self.audit > 0 else torch.zeros_like(escalate)
+        self.timings = {'screen': time.perf_counter() - st}
+        run = escalate | audited
+        if run.any():
+            st = time.perf_counter()
+            rows = run.nonzero().flatten()
+            main_logits = self.model(inp_tensor[rows.to(inp_tensor.device)]).float().cpu()
+            audited_rows = audited[rows]
+            self.stats['agreed'] += int((main_logits[audited_rows].argmax(dim = 1) == logits[rows[audited_rows]].argmax(dim = 1)).sum())
+            logits[rows] = main_logits
+            self.timings['escalate'] = time.perf_counter() - st
+        self.stats['screened'] += len(logits)
+        self.stats['escalated'] += int(escalate.sum())
+        self.stats['audited'] += int(audited.sum())
+        return logits
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION INFERENCE SERVER BENCHMARK
+================================================
+
+The following program is used to measure capacity of inference server under concurrent synthetic clients
+"""
+
+# %%
+# Importing Libraries
+# Only inference client is imported here, so client processes started by spawn stay light
+from inference_client import *
+import os
+import sys
+import json
+import shlex
+import pickle
+import signal
+import socket
+import argparse
+import tempfile
+import itertools
+import subprocess
+import multiprocessing
+
+# %%
+# Server Script Address
+server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'inference_server.py')
+
+# %%
+# Random Model Function
+def random_model(dirname, labels = ('Advertisement', 'News', 'Program')):
+    """
+    This function is used to save randomly initialized model & its labels, so server can be benchmarked without trained model
+
+    Function Input
+    ===============
+    dirname : Absolute address of directory to save model & labels files in
+    labels : Stream Classification labels of model ( default : Advertisement, News & Program )
+
+    Function Output
+    ================
+    Tuple of model weights file & one hot encoded labels file addresses
+                            ( Model Address, Labels Address )
+    """
+    # Torch is only needed here, so it is not imported into client processes
+    from model import Model, torch
+    laddr, OHE = os.path.join(dirname, 'random.model'), os.path.join(dirname, 'random.labels')
+    torch.save(Model(len(labels)).state_dict(), laddr)
+    with open(OHE, 'wb') as file1:
+        pickle.dump({label: idx for idx, label in enumerate(labels)}, file1)
+    return laddr, OHE
+
+# %%
+# Process Tree Monitor Class
+class Process_Monitor:
+    def __init__(self, pid, interval = 0.5):
+        """
+        This method is used to initialize sampler of CPU usage & resident memory of process along with its child processes
+
+        Samples are read from /proc, so child processes such as model replicas are included without extra dependencies.
+
+        Method Input
+        =============
+        pid : Process ID of subject process
+        interval : Time in seconds between samples ( default : 0.5 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.pid = pid
+        self.interval = interval
+        self.__clock__ = os.sysconf('SC_CLK_TCK')
+        self.__page__ = os.sysconf('SC_PAGE_SIZE')
+        self.__stop__ = threading.Event()
+        self.__thread__ = None
+        self.__samples__ = list()
+
+    def __tree__(self):
+        """
+        This method is used to find subject process & all of its descendants
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        List of process IDs
+        """
+        parents = dict()
+        for name in os.listdir('/proc'):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat') as file1:
+                    parents[int(name)] = int(file1.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        tree, frontier = [self.pid], [self.pid]
+        while len(frontier) != 0:
+            frontier = [pid for pid, ppid in parents.items() if ppid in frontier]
+            tree.extend(frontier)
+        return tree
+
+    def __sample__(self):
+        """
+        This method is used to read total CPU time & resident memory of process tree
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Tuple of CPU time in seconds & resident memory in bytes
+                            ( CPU Time, Resident Memory )
+        """
+        cpu, rss = 0.0, 0
+        for pid in self.__tree__():
+            try:
+                with open(f'/proc/{pid}/stat') as file1:
+                    fields = file1.read().rsplit(')', 1)[1].split()
+                with open(f'/proc/{pid}/statm') as file1:
+                    rss += int(file1.read().split()[1]) * self.__page__
+            except (OSError, IndexError, ValueError):
+                continue
+            cpu += (int(fields[11]) + int(fields[12])) / self.__clock__
+        return cpu, rss
+
+    def __run__(self):
+        """
+        This method is used to take samples until monitor is stopped
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        while not self.__stop__.is_set():
+            self.__samples__.append((time.monotonic(),) + self.__sample__())
+            self.__stop__.wait(self.interval)
+
+    def start(self):
+        """
+        This method is used to start sampling in background thread
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        self.__samples__ = list()
+        self.__stop__.clear()
+        self.__thread__ = threading.Thread(target = self.__run__, daemon = True)
+        self.__thread__.start()
+
+    def stop(self):
+        """
+        This method is used to stop sampling & summarize samples
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of average CPU usage in percent of one core & peak resident memory in megabytes
+                            { 'cpu_percent', 'rss_mb' }
+        """
+        self.__stop__.set()
+        self.__thread__.join()
+        self.__samples__.append((time.monotonic(),) + self.__sample__())
+        first, last = self.__samples__[0], self.__samples__[-1]
+        return {'cpu_percent': (last[1] - first[1]) / max(last[0] - first[0], 1e-9) * 100, 'rss_mb': max(i[2] for i in self.__samples__) / 2 ** 20}
+
+# %%
+# Local Server Class
+class Local_Server:
+    def __init__(self, laddr, OHE, max_batch = 32, workers = 16, extra_args = (), log_addr = os.devnull, startup_timeout = 300):
+        """
+        This method is used to start inference server in separate process on free local port & wait until it serves requests
+
+        Method Input
+        =============
+        laddr : Absolute address of model file
+        OHE : Absolute address of one hot encoded labels file
+        max_batch : Maximum number of frames per batched forward pass ( default : 32 )
+        workers : Number of GRPC server workers ( default : 16 )
+        extra_args : Additional inference server arguments ( default : none )
+        log_addr : Absolute address of file to write server output to ( default : discarded )
+        startup_timeout : Maximum time in seconds to wait for server to serve requests ( default : 300 )
+
+        Method Output
+        ==============
+        None
+        """
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.server_ip = f'127.0.0.1:{sock.getsockname()[1]}'
+        cmd = [sys.executable, '-u', server_script, '-la', laddr, '-ohe', OHE, '-ip', self.server_ip, '-mbs', str(max_batch), '-wrk', str(workers), '-mip', ''] + list(extra_args)
+        self.__log__ = open(log_addr, 'a')
+        self.process = subprocess.Popen(cmd, cwd = os.path.dirname(server_script), stdout = self.__log__, stderr = subprocess.STDOUT)
+        channel = grpc.insecure_channel(self.server_ip)
+        st = time.monotonic()
+        try:
+            while True:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f'Inference server exited with code {self.process.returncode}, see {log_addr}')
+                if time.monotonic() - st > startup_timeout:
+                    raise TimeoutError(f'Inference server did not start in {startup_timeout} s, see {log_addr}')
+                try:
+                    grpc.channel_ready_future(channel).result(timeout = 1)
+                    communication_pb2_grpc.sc_serviceStub(channel).model_info(communication_pb2.info_input(), timeout = 5)
+                    break
+                except (grpc.FutureTimeoutError, grpc.RpcError):
+                    continue
+        except BaseException:
+            self.stop()
+            raise
+        finally:
+            channel.close()
+
+    def stop(self, timeout = 30):
+        """
+        This method is used to shut down inference server like Ctrl+C, killing it if it does not exit in time
+
+        Method Input
+        =============
+        timeout : Time in seconds to wait for server to exit ( default : 30 )
+
+        Method Output
+        ==============
+        None
+        """
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGINT)
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.__log__.close()
+
+# %%
+# Synthetic Client Function
+def synthetic_client(server_ip, payload, frames, fps, duration, warmup, streaming, encoding, timeout, seed, start, records):
+    """
+    This function is used to send frames at fixed rate & record latency of every request sent after warm up
+
+    Requests are scheduled at fixed times, and latency is measured from scheduled time, so time a request waits
+    behind slow responses is counted instead of hidden.
+
+    Function Input
+    ===============
+    server_ip : Server IP at which GRPC server is running
+    payload : Width & height of synthetic frames in pixels
+    frames : Number of frames per request
+    fps : Target number of requests per second
+    duration : Time in seconds to record requests for, after warm up
+    warmup : Time in seconds to send requests without recording them
+    streaming : Boolean variable to send requests over stream instead of separate calls
+    encoding : Image encoding to send frames with, out of 'raw', 'jpeg' & 'webp'
+    timeout : Deadline in seconds for separate inference calls
+    seed : Seed value for synthetic frame pixels
+    start : Event set once every client is connected
+    records : List to append request records to, with drop reason appended to status code name of calls dropped by server
+                            ( Scheduled Time, Latency, Status Code Name )
+
+    Function Output
+    ================
+    None
+    """
+    def done(fut, scheduled):
+        try:
+            fut.result()
+            code = 'OK'
+        except Frame_Dropped as e:
+            code = e.code
+        except grpc.RpcError as e:
+            code = e.code().name
+        records.append((scheduled, time.perf_counter() - scheduled, code))
+    img = Image.fromarray(np.random.default_rng(seed).integers(0, 256, (payload[1], payload[0], 3), dtype = np.uint8))
+    client = sc_client(server_ip, streaming = streaming, encoding = encoding, resize = False, timeout = timeout)
+    pending = list()
+    start.wait()
+    st = time.perf_counter()
+    for idx in itertools.count():
+        scheduled = st + idx / fps
+        if scheduled >= st + warmup + duration:
+            break
+        time.sleep(max(scheduled - time.perf_counter(), 0))
+        recorded = scheduled >= st + warmup
+        if streaming:
+            fut = client.submit([img] * frames)
+            if recorded:
+                pending.append(fut)
+                fut.add_done_callback(lambda fut, scheduled = scheduled: done(fut, scheduled))
+            continue
+        try:
+            client([img] * frames)
+            code = 'OK'
+        except grpc.RpcError as e:
+            # Frames dropped by server are told apart from calls which hit their own deadline
+            code = e.code().name + (f':{dropped_reason(e)}' if dropped_reason(e) else '')
+        if recorded:
+            records.append((scheduled, time.perf_counter() - scheduled, code))
+    unanswered = futures.wait(pending, timeout).not_done
+    records.extend([(None, timeout, 'DEADLINE_EXCEEDED')] * len(unanswered))
+
+# %%
+# Client Process Function
+def client_process(server_ip, clients, payload, frames, fps, duration, warmup, streaming, encoding, timeout, seed, ready, start, results):
+    """
+    This function is used to run group of synthetic clients as threads of a single process
+
+    Function Input
+    ===============
+    server_ip : Server IP at which GRPC server is running
+    clients : Number of synthetic clients in this process
+    payload : Width & height of synthetic frames in pixels
+    frames : Number of frames per request
+    fps : Target number of requests per second of every client
+    duration : Time in seconds to record requests for, after warm up
+    warmup : Time in seconds to send requests without recording them
+    streaming : Boolean variable to send requests over stream instead of separate calls
+    encoding : Image encoding to send frames with, out of 'raw', 'jpeg' & 'webp'
+    timeout : Deadline in seconds for separate inference calls
+    seed : Seed value for synthetic frame pixels of first client
+    ready : Queue to report process readiness to
+    start : Event set once every client process is ready
+    results : Queue to put request records of all clients of this process into
+
+    Function Output
+    ================
+    None
+    """
+    records = list()
+    threads = [threading.Thread(target = synthetic_client, args = (server_ip, payload, frames, fps, duration, warmup, streaming, encoding, timeout, seed + i, start, records)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    ready.put(True)
+    for thread in threads:
+        thread.join()
+    results.put(records)
+
+# %%
+# Load Generation Function
+def generate_load(server_ip, clients, processes, payload, frames, fps, duration, warmup, streaming = False, encoding = 'raw', timeout = 5, seed = 42):
+    """
+    This function is used to drive inference server with concurrent synthetic clients, spread over client processes
+
+    Function Input
+    ===============
+    server_ip : Server IP at which GRPC server is running
+    clients : Number of concurrent synthetic clients
+    processes : Number of client processes to spread clients over
+    payload : Width & height of synthetic frames in pixels
+    frames : Number of frames per request
+    fps : Target number of requests per second of every client
+    duration : Time in seconds to record requests for, after warm up
+    warmup : Time in seconds to send requests without recording them
+    streaming : Boolean variable to send requests over stream instead of separate calls ( default : False )
+    encoding : Image encoding to send frames with, out of 'raw', 'jpeg' & 'webp' ( default : raw )
+    timeout : Deadline in seconds for separate inference calls ( default : 5 )
+    seed : Seed value for synthetic frame pixels ( default : 42 )
+
+    Function Output
+    ================
+    List of request records of all clients
+                            [ ( Scheduled Time, Latency, Status Code Name ), ... ]
+    """
+    ctx = multiprocessing.get_context('spawn')
+    ready, results, start = ctx.Queue(), ctx.Queue(), ctx.Event()
+    processes = max(min(processes, clients), 1)
+    shares = [clients // processes + (1 if i < clients % processes else 0) for i in range(processes)]
+    procs = [ctx.Process(target = client_process, args = (server_ip, share, payload, frames, fps, duration, warmup, streaming, encoding, timeout, seed + sum(shares[:i]), ready, start, results), daemon = True) for i, share in enumerate(shares)]
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        ready.get()
+    start.set()
+    records = list()
+    for _ in procs:
+        records.extend(results.get())
+    for proc in procs:
+        proc.join()
+    return records
+
+# %%
+# Result Summary Function
+def summarize(records, frames):
+    """
+    This function is used to find throughput, latency percentiles & status counts of recorded requests
+
+    Throughput is measured from first scheduled request until last response, so an overloaded server
+    is not credited with requests it answered after recording time.
+
+    Function Input
+    ===============
+    records : List of request records
+                            ( Scheduled Time, Latency, Status Code Name )
+    frames : Number of frames per request
+
+    Function Output
+    ================
+    Dictionary of request summary
+                            { 'requests', 'completed', 'errors', 'throughput_fps', 'p50_ms', 'p95_ms', 'p99_ms' }
+    """
+    answered = [i for i in records if i[2] == 'OK']
+    latencies = np.array([i[1] for i in answered]) * 1000
+    span = max([i[0] + i[1] for i in answered], default = 0) - min([i[0] for i in answered], default = 0)
+    errors = dict()
+    for record in records:
+        if record[2] != 'OK':
+            errors[record[2]] = errors.get(record[2], 0) + 1
+    summary = {'requests': len(records), 'completed': len(latencies), 'errors': errors, 'throughput_fps': len(latencies) * frames / span if span > 0 else 0.0}
+    for pct in (50, 95, 99):
+        summary[f'p{pct}_ms'] = float(np.percentile(latencies, pct)) if len(latencies) != 0 else float('nan')
+    return summary
+
+# %%
+# Markdown Table Function
+def markdown_table(rows):
+    """
+    This function is used to format benchmark results as Markdown table
+
+    Function Input
+    ===============
+    rows : List of benchmark result dictionaries
+
+    Function Output
+    ================
+    Markdown table as string
+    """
+    cols = [('server_args', 'Server Arguments', '{}'), ('max_batch', 'Max Batch', '{}'), ('workers', 'Workers', '{}'), ('payload', 'Payload', '{}'), ('payload_kb', 'Request KB', '{:.1f}'), ('clients', 'Clients', '{}'), ('offered_fps', 'Offered FPS', '{:.1f}'), ('throughput_fps', 'Throughput FPS', '{:.1f}'), ('speedup', 'Speedup', '{:.2f}x'), ('p50_ms', 'p50 ms', '{:.1f}'), ('p95_ms', 'p95 ms', '{:.1f}'), ('p99_ms', 'p99 ms', '{:.1f}'), ('cpu_percent', 'CPU %', '{:.0f}'), ('rss_mb', 'RSS MB', '{:.0f}'), ('errors', 'Errors', '{}')]
+    lines = ['| ' + ' | '.join(i[1] for i in cols) + ' |', '|' + '|'.join(':---:' for _ in cols) + '|']
+    for row in rows:
+        lines.append('| ' + ' | '.join(fmt.format(sum(row[key].values()) if key == 'errors' else row[key]) for key, _, fmt in cols) + ' |')
+    return '\n'.join(lines)
+
+# %%
+# Benchmark Execution
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Stream Classification Inference Server Benchmark.')
+    parser.add_argument('-c', '--clients', type = int, help = 'Number of Concurrent Synthetic Clients', default = 8)
+    parser.add_argument('-fps', '--fps', type = float, help = 'Target Number of Requests per Second of Every Client', default = 5)
+    parser.add_argument('-fpr', '--frames_per_request', type = int, help = 'Number of Frames per Request', default = 1)
+    parser.add_argument('-mbs', '--max_batches', nargs = '+', type = int, help = 'Maximum Batch Sizes of Server to Sweep', default = [8, 32])
+    parser.add_argument('-wrk', '--workers', nargs = '+', type = int, help = 'Numbers of GRPC Server Workers to Sweep', default = [16])
+    parser.add_argument('-ps', '--payload_sizes', nargs = '+', type = int, help = 'Width & Height in Pixels of Square Synthetic Frames to Sweep', default = [224, 640])
+    parser.add_argument('-d', '--duration', type = float, help = 'Time in Seconds to Record Requests for per Configuration', default = 20)
+    parser.add_argument('-wt', '--warmup_time', type = float, help = 'Time in Seconds to Send Requests Before Recording per Configuration', default = 5)
+    parser.add_argument('-cp', '--client_processes', type = int, help = 'Number of Processes to Spread Synthetic Clients Over', default = max(os.cpu_count() // 4, 1))
+    parser.add_argument('-st', '--streaming', action = 'store_true', help = 'Send Requests Over Streams Instead of Separate Calls')
+    parser.add_argument('-enc', '--encoding', type = str, choices = ['raw', 'jpeg', 'webp'], help = 'Image Encoding to Send Frames With', default = 'raw')
+    parser.add_argument('-to', '--timeout', type = float, help = 'Deadline in Seconds for Separate Inference Calls', default = 5)
+    parser.add_argument('-sa', '--server_args', action = 'append', type = str, help = 'Additional Inference Server Arguments, Quoted => "-bk onnx -aio", Repeat to Compare Server Configurations Against First One', default = None)
+    parser.add_argument('-la', '--laddr', type = str, help = 'Absolute Address of Model File ( Empty for Randomly Initialized Model )', default = '')
+    parser.add_argument('-ohe', '--OHE', type = str, help = 'Absolute Address of One Hot Encoded Labels File of Given Model', default = '/resources/OHE.labels')
+    parser.add_argument('-o', '--output', type = str, help = 'Absolute Address of Benchmark Results Files Without Extension', default = './benchmark')
+    args = vars(parser.parse_args())
+    args['server_args'] = args['server_args'] or ['']
+    print("""
+    ====================================================
+    | Stream Classification Inference Server Benchmark |
+    ====================================================
+    """)
+    print(f'Synthetic Clients: {args["clients"]} over {min(args["client_processes"], args["clients"])} processes')
+    print(f'Target Request Rate per Client: {args["fps"]} requests/s of {args["frames_per_request"]} frames')
+    print(f'Request Mode: {"Streaming" if args["streaming"] else "Separate Calls"} with {args["encoding"]} frames')
+    print(f'Maximum Batch Sizes: {args["max_batches"]}')
+    print(f'GRPC Server Workers: {args["workers"]}')
+    print(f'Payload Sizes: {args["payload_sizes"]}')
+    print(f'Server Configurations: {[i or "default" for i in args["server_args"]]}')
+    print(f'Recording Time per Configuration: {args["duration"]} s after {args["warmup_time"]} s warm up')
+    print('---------------------------------------------')
+    tmp_dir = tempfile.TemporaryDirectory()
+    if args['laddr']:
+        laddr, OHE = args['laddr'], args['OHE']
+    else:
+        laddr, OHE = random_model(tmp_dir.name)
+        print('>>>>> Randomly Initialized Model Saved')
+    rows, baseline = list(), dict()
+    for server_args, max_batch, workers in itertools.product(args['server_args'], args['max_batches'], args['workers']):
+        server = Local_Server(laddr, OHE, max_batch, workers, shlex.split(server_args), args['output'] + '_server.log')
+        print(f'>>>>> Inference Server Started at {server.server_ip} with Maximum Batch Size {max_batch} & {workers} Workers, {"Arguments " + repr(server_args) if server_args else "Default Arguments"}')
+        monitor = Process_Monitor(server.process.pid)
+        try:
+            for size in args['payload_sizes']:
+                payload = (size, size)
+                img = Image.fromarray(np.random.default_rng(0).integers(0, 256, (size, size, 3), dtype = np.uint8))
+                request_kb = len(sc_client(server.server_ip, encoding = args['encoding'], resize = False).input_processor(np.stack([np.asarray(img)] * args['frames_per_request'])).SerializeToString()) / 1024
+                monitor.start()
+                records = generate_load(server.server_ip, args['clients'], args['client_processes'], payload, args['frames_per_request'], args['fps'], args['duration'], args['warmup_time'], args['streaming'], args['encoding'], args['timeout'])
+                usage = monitor.stop()
+                row = {'server_args': server_args or 'default', 'max_batch': max_batch, 'workers': workers, 'payload': f'{size}x{size}', 'payload_kb': request_kb, 'clients': args['clients'], 'offered_fps': args['clients'] * args['fps'] * args['frames_per_request']}
+                row.update(summarize(records, args['frames_per_request']))
+                row.update(usage)
+                # Every configuration is compared with first server arguments under same batch size, workers & payload
+                baseline.setdefault((max_batch, workers, size), row['throughput_fps'])
+                row['speedup'] = row['throughput_fps'] / baseline[(max_batch, workers, size)] if baseline[(max_batch, workers, size)] > 0 else float('nan')
+                rows.append(row)
+                print(f'>>>>> {row["payload"]} | Throughput: {row["throughput_fps"]:.1f} frames/s ({row["speedup"]:.2f}x) | p50: {row["p50_ms"]:.1f} ms | p95: {row["p95_ms"]:.1f} ms | p99: {row["p99_ms"]:.1f} ms | CPU: {row["cpu_percent"]:.0f} % | RSS: {row["rss_mb"]:.0f} MB | Errors: {row["errors"]}')
+        finally:
+            server.stop()
+    with open(args['output'] + '.json', 'w') as file1:
+        json.dump({'settings': args, 'results': rows}, file1, indent = 4)
+    table = markdown_table(rows)
+    with open(args['output'] + '.md', 'w') as file1:
+        file1.write(table + '\n')
+    print('---------------------------------------------')
+    print(table)
+    print(f'\n>>>>> Benchmark Results Saved at {args["output"]}.json & {args["output"]}.md')
+    tmp_dir.cleanup()
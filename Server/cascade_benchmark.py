@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION CASCADE BENCHMARK
+=======================================
+
+The following program is used to compare screener & model cascade against model only inference, on labelled frames
+"""
+
+# %%
+# Importing Libraries
+from backends import *
+import time
+import pickle
+import random
+import argparse
+
+# %%
+# Labelled Frames Loading Function
+def load_frames(addr, class_ohe, batch_size = 32, max_frames = 0, seed = 42):
+    """
+    This function is used to load labelled frames from images sub-directories, in same layout as training data
+
+    Frames are resized to model input size, as inference server would do, so they can be stacked into batches.
+    Sub-directories which are not in one hot encoded labels are skipped.
+
+    Function Input
+    ===============
+    addr : Absolute address of the parent directory of images sub-directories
+    class_ohe : Dictionary of one hot encoded labels
+    batch_size : Number of frames per batch ( default : 32 )
+    max_frames : Maximum number of randomly sampled frames to load, 0 for all ( default : 0 )
+    seed : Seed value for frame sampling ( default : 42 )
+
+    Function Output
+    ================
+    Tuple of list of stacked uint8 Numpy images & Numpy array of class indices
+                            ( Batches, Labels )
+    """
+    files = [(f'{addr}/{cla}/{i}', idx) for cla, idx in class_ohe.items() if os.path.isdir(f'{addr}/{cla}') for i in sorted(os.listdir(f'{addr}/{cla}'))]
+    if max_frames > 0 and len(files) > max_frames:
+        files = random.Random(seed).sample(files, max_frames)
+    size = tuple(dummy_input_shape[:1:-1])
+    frames = list()
+    for path, _ in files:
+        # Files are closed right away, so large evaluation sets do not run out of file handles
+        with Image.open(path) as img:
+            frames.append(np.asarray(img.convert('RGB').resize(size, Image.BILINEAR)))
+    batches = [np.stack(frames[i:i + batch_size]) for i in range(0, len(frames), batch_size)]
+    return batches, np.array([i for _, i in files])
+
+# %%
+# Backend Evaluation Function
+def evaluate(backend, batches, transforms):
+    """
+    This function is used to run subject backend over all batches & time its forward passes
+
+    Function Input
+    ===============
+    backend : Backend object subject to evaluation
+    batches : List of stacked uint8 Numpy images
+    transforms : Batch_Transforms object to preprocess batches with, excluded from timing
+
+    Function Output
+    ================
+    Tuple of average forward pass time per frame in milliseconds & Numpy array of predicted class indices
+                            ( Time per Frame, Predictions )
+    """
+    # Cascade stages are warmed up separately, so warm up passes are not counted in its escalation rate
+    for stage in getattr(backend, 'stages', (backend,)):
+        for _ in range(2):
+            stage(transforms(batches[0]))
+    elapsed, preds = 0.0, list()
+    for btch_dat in batches:
+        inp_tensor = transforms(btch_dat)
+        st = time.perf_counter()
+        with torch.no_grad():
+            logits = backend(inp_tensor)
+        elapsed += time.perf_counter() - st
+        preds.append(logits.argmax(dim = 1).cpu().numpy())
+    preds = np.concatenate(preds)
+    return elapsed / len(preds) * 1000, preds
+
+# %%
+# Benchmark Execution
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Stream Classification Cascade Benchmark.')
+    parser.add_argument('-d', '--data', type = str, help = 'Absolute Address of the Parent Directory of Labelled Images Sub-Directories', default = '/data')
+    parser.add_argument('-ohe', '--OHE', type = str, help = 'Absolute Address of One Hot Encoded Labels File', default = '/resources/OHE.labels')
+    parser.add_argument('-la', '--laddr', type = str, help = 'Absolute Address of Model File', default = '/resources/convnext.model')
+    parser.add_argument('-scr', '--screener', type = str, help = 'Absolute Address of MobileNetV3-Small Screener Model File', default = '/resources/screener.model')
+    parser.add_argument('-bk', '--backend', type = str, choices = backend_names, help = 'Inference Backend to Run Both Models With', default = 'eager')
+    parser.add_argument('-th', '--thresholds', nargs = '+', type = float, help = 'Screener Confidence Thresholds Below Which Frame is Escalated to Model', default = [0.5, 0.7, 0.8, 0.9, 0.95])
+    parser.add_argument('-bs', '--batch_size', type = int, help = 'Batch Size of Input Data', default = 32)
+    parser.add_argument('-mf', '--max_frames', type = int, help = 'Maximum Number of Randomly Sampled Frames to Evaluate On ( 0 for All )', default = 1000)
+    parser.add_argument('-sd', '--seed', type = int, help = 'Seed Value for Frame Sampling', default = 42)
+    args = vars(parser.parse_args())
+    print("""
+    ===========================================
+    | Stream Classification Cascade Benchmark |
+    ===========================================
+    """)
+    with open(args['OHE'], 'rb') as file1:
+        class_ohe = pickle.load(file1)
+    batches, labels = load_frames(args['data'], class_ohe, args['batch_size'], args['max_frames'], args['seed'])
+    if len(labels) == 0:
+        raise SystemExit(f'>>>>> No Labelled Frames Found in {args["data"]} for Labels {list(class_ohe)}')
+    print(f'>>>>> {len(labels)} Labelled Frames Loaded')
+    transforms = Batch_Transforms(size = dummy_input_shape[2:])
+    model = load_backend(args['backend'], args['laddr'], len(class_ohe))
+    screener = load_backend(args['backend'], args['screener'], len(class_ohe), architecture = 'mobilenet')
+    print(f'>>>>> Model & Screener Loaded with {args["backend"]} Backend')
+    print('---------------------------------------------')
+    print(f'{"Path":>18} | {"Escalated":>9} | {"Time (ms/frame)":>15} | {"Speedup":>8} | {"Accuracy":>8} | {"Agreement with Model":>20}')
+    model_time, model_preds = evaluate(model, batches, transforms)
+    rows = [('Model Only', 1.0, model_time, model_preds), ('Screener Only', 0.0) + evaluate(screener, batches, transforms)]
+    for threshold in args['thresholds']:
+        cascade = Cascade_Backend(screener, model, threshold)
+        cascade_time, cascade_preds = evaluate(cascade, batches, transforms)
+        rows.append((f'Cascade @ {threshold:g}', cascade.stats['escalated'] / len(labels), cascade_time, cascade_preds))
+    for path, escalated, path_time, preds in rows:
+        print(f'{path:>18} | {escalated * 100:>8.1f}% | {path_time:>15.2f} | {model_time / path_time:>7.2f}x | {(preds == labels).mean() * 100:>7.2f}% | {(preds == model_preds).mean() * 100:>19.2f}%')
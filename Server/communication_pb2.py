@@ -14,12 +14,20 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x63ommunication.proto\"\x81\x01\n\x0cserver_input\x12\x0c\n\x04imgs\x18\x01 \x01(\x0c\x12\r\n\x05\x62\x61tch\x18\x02 \x01(\x05\x12\r\n\x05width\x18\x03 \x01(\x05\x12\x0e\n\x06height\x18\x04 \x01(\x05\x12\x0f\n\x07\x63hannel\x18\x05 \x01(\x05\x12\x11\n\tdata_type\x18\x06 \x01(\t\x12\x11\n\tclient_id\x18\x07 \x01(\t\"X\n\rserver_output\x12\x1d\n\x15stream_classification\x18\x01 \x01(\x0c\x12\x15\n\rprobabilities\x18\x02 \x01(\x0c\x12\x11\n\tdata_type\x18\x03 \x01(\t2:\n\nsc_service\x12,\n\tinference\x12\r.server_input\x1a\x0e.server_output\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x63ommunication.proto\"\xb0\x02\n\x0cserver_input\x12\x0c\n\x04imgs\x18\x01 \x01(\x0c\x12\r\n\x05\x62\x61tch\x18\x02 \x01(\x05\x12\r\n\x05width\x18\x03 \x01(\x05\x12\x0e\n\x06height\x18\x04 \x01(\x05\x12\x0f\n\x07\x63hannel\x18\x05 \x01(\x05\x12\x11\n\tdata_type\x18\x06 \x01(\t\x12\x11\n\tclient_id\x18\x07 \x01(\t\x12\x10\n\x08\x65ncoding\x18\x08 \x01(\t\x12\x14\n\x0c\x65ncoded_imgs\x18\t \x03(\x0c\x12\x0f\n\x07\x63ompact\x18\n \x01(\x08\x12\r\n\x05top_k\x18\x0b \x01(\x05\x12\x12\n\nfull_probs\x18\x0c \x01(\x08\x12\x14\n\x0c\x63\x61pture_time\x18\r \x01(\x01\x12\x15\n\rstage_timings\x18\x0e \x01(\x08\x12\x10\n\x08shm_name\x18\x0f \x01(\t\x12\x12\n\nshm_offset\x18\x10 \x01(\x03\"\x9c\x02\n\rserver_output\x12\x1d\n\x15stream_classification\x18\x01 \x01(\x0c\x12\x15\n\rprobabilities\x18\x02 \x01(\x0c\x12\x11\n\tdata_type\x18\x03 \x01(\t\x12\x15\n\rclass_indices\x18\x04 \x01(\x0c\x12\x12\n\nindex_type\x18\x05 \x01(\t\x12\r\n\x05top_k\x18\x06 \x01(\x05\x12\x13\n\x0btop_indices\x18\x07 \x01(\x0c\x12\x19\n\x11top_probabilities\x18\x08 \x01(\x0c\x12\x1a\n\x12\x66ull_probabilities\x18\t \x01(\x0c\x12\x0e\n\x06status\x18\n \x01(\t\x12\x15\n\rmodel_version\x18\x0b \x01(\t\x12\x15\n\rstage_timings\x18\x0c \x01(\t\"1\n\ninfo_input\x12\x11\n\tclient_id\x18\x01 \x01(\t\x12\x10\n\x08shm_name\x18\x02 \x01(\t\"\xbc\x01\n\x0binfo_output\x12\x0e\n\x06height\x18\x01 \x01(\x05\x12\r\n\x05width\x18\x02 \x01(\x05\x12\x0f\n\x07\x63hannel\x18\x03 \x01(\x05\x12\x15\n\rchannel_order\x18\x04 \x01(\t\x12\x0e\n\x06labels\x18\x05 \x03(\t\x12\x15\n\rmodel_version\x18\x06 \x01(\t\x12\x13\n\x0bunix_socket\x18\x07 \x01(\t\x12\x13\n\x0binstance_id\x18\x08 \x01(\t\x12\x15\n\rshared_memory\x18\t \x01(\x08\"\x1d\n\x0creload_input\x12\r\n\x05laddr\x18\x01 \x01(\t\"G\n\rreload_output\x12\x15\n\rmodel_version\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"$\n\x0fsubscribe_input\x12\x11\n\tclient_id\x18\x01 \x01(\t\"\xc4\x01\n\x10transition_event\x12\x11\n\tclient_id\x18\x01 \x01(\t\x12\x0e\n\x06stream\x18\x02 \x01(\x05\x12\r\n\x05label\x18\x03 \x01(\t\x12\x16\n\x0eprevious_label\x18\x04 \x01(\t\x12\x13\n\x0b\x66rame_index\x18\x05 \x01(\x03\x12\x11\n\ttimestamp\x18\x06 \x01(\x01\x12\x12\n\nconfidence\x18\x07 \x01(\x02\x12\x18\n\x10segment_duration\x18\x08 \x01(\x01\x12\x10\n\x08snapshot\x18\t \x01(\x08\" \n\rprofile_input\x12\x0f\n\x07\x62\x61tches\x18\x01 \x01(\x05\"@\n\x0eprofile_output\x12\r\n\x05paths\x18\x01 \x03(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t2\xb3\x02\n\nsc_service\x12,\n\tinference\x12\r.server_input\x1a\x0e.server_output\"\x00\x12\x37\n\x10inference_stream\x12\r.server_input\x1a\x0e.server_output\"\x00(\x01\x30\x01\x12)\n\nmodel_info\x12\x0b.info_input\x1a\x0c.info_output\"\x00\x12/\n\x0creload_model\x12\r.reload_input\x1a\x0e.reload_output\"\x00\x12\x34\n\tsubscribe\x12\x10.subscribe_input\x1a\x11.transition_event\"\x00\x30\x01\x12,\n\x07profile\x12\x0e.profile_input\x1a\x0f.profile_output\"\x00\x62\x06proto3')
 
 
 
 _SERVER_INPUT = DESCRIPTOR.message_types_by_name['server_input']
 _SERVER_OUTPUT = DESCRIPTOR.message_types_by_name['server_output']
+_INFO_INPUT = DESCRIPTOR.message_types_by_name['info_input']
+_INFO_OUTPUT = DESCRIPTOR.message_types_by_name['info_output']
+_RELOAD_INPUT = DESCRIPTOR.message_types_by_name['reload_input']
+_RELOAD_OUTPUT = DESCRIPTOR.message_types_by_name['reload_output']
+_SUBSCRIBE_INPUT = DESCRIPTOR.message_types_by_name['subscribe_input']
+_TRANSITION_EVENT = DESCRIPTOR.message_types_by_name['transition_event']
+_PROFILE_INPUT = DESCRIPTOR.message_types_by_name['profile_input']
+_PROFILE_OUTPUT = DESCRIPTOR.message_types_by_name['profile_output']
 server_input = _reflection.GeneratedProtocolMessageType('server_input', (_message.Message,), {
   'DESCRIPTOR' : _SERVER_INPUT,
   '__module__' : 'communication_pb2'
@@ -34,14 +42,86 @@ server_output = _reflection.GeneratedProtocolMessageType('server_output', (_mess
   })
 _sym_db.RegisterMessage(server_output)
 
+info_input = _reflection.GeneratedProtocolMessageType('info_input', (_message.Message,), {
+  'DESCRIPTOR' : _INFO_INPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:info_input)
+  })
+_sym_db.RegisterMessage(info_input)
+
+info_output = _reflection.GeneratedProtocolMessageType('info_output', (_message.Message,), {
+  'DESCRIPTOR' : _INFO_OUTPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:info_output)
+  })
+_sym_db.RegisterMessage(info_output)
+
+reload_input = _reflection.GeneratedProtocolMessageType('reload_input', (_message.Message,), {
+  'DESCRIPTOR' : _RELOAD_INPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:reload_input)
+  })
+_sym_db.RegisterMessage(reload_input)
+
+reload_output = _reflection.GeneratedProtocolMessageType('reload_output', (_message.Message,), {
+  'DESCRIPTOR' : _RELOAD_OUTPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:reload_output)
+  })
+_sym_db.RegisterMessage(reload_output)
+
+subscribe_input = _reflection.GeneratedProtocolMessageType('subscribe_input', (_message.Message,), {
+  'DESCRIPTOR' : _SUBSCRIBE_INPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:subscribe_input)
+  })
+_sym_db.RegisterMessage(subscribe_input)
+
+transition_event = _reflection.GeneratedProtocolMessageType('transition_event', (_message.Message,), {
+  'DESCRIPTOR' : _TRANSITION_EVENT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:transition_event)
+  })
+_sym_db.RegisterMessage(transition_event)
+
+profile_input = _reflection.GeneratedProtocolMessageType('profile_input', (_message.Message,), {
+  'DESCRIPTOR' : _PROFILE_INPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:profile_input)
+  })
+_sym_db.RegisterMessage(profile_input)
+
+profile_output = _reflection.GeneratedProtocolMessageType('profile_output', (_message.Message,), {
+  'DESCRIPTOR' : _PROFILE_OUTPUT,
+  '__module__' : 'communication_pb2'
+  # @@protoc_insertion_point(class_scope:profile_output)
+  })
+_sym_db.RegisterMessage(profile_output)
+
 _SC_SERVICE = DESCRIPTOR.services_by_name['sc_service']
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
   _SERVER_INPUT._serialized_start=24
-  _SERVER_INPUT._serialized_end=153
-  _SERVER_OUTPUT._serialized_start=155
-  _SERVER_OUTPUT._serialized_end=243
-  _SC_SERVICE._serialized_start=245
-  _SC_SERVICE._serialized_end=303
+  _SERVER_INPUT._serialized_end=328
+  _SERVER_OUTPUT._serialized_start=331
+  _SERVER_OUTPUT._serialized_end=615
+  _INFO_INPUT._serialized_start=617
+  _INFO_INPUT._serialized_end=666
+  _INFO_OUTPUT._serialized_start=669
+  _INFO_OUTPUT._serialized_end=857
+  _RELOAD_INPUT._serialized_start=859
+  _RELOAD_INPUT._serialized_end=888
+  _RELOAD_OUTPUT._serialized_start=890
+  _RELOAD_OUTPUT._serialized_end=961
+  _SUBSCRIBE_INPUT._serialized_start=963
+  _SUBSCRIBE_INPUT._serialized_end=999
+  _TRANSITION_EVENT._serialized_start=1002
+  _TRANSITION_EVENT._serialized_end=1198
+  _PROFILE_INPUT._serialized_start=1200
+  _PROFILE_INPUT._serialized_end=1232
+  _PROFILE_OUTPUT._serialized_start=1234
+  _PROFILE_OUTPUT._serialized_end=1298
+  _SC_SERVICE._serialized_start=1301
+  _SC_SERVICE._serialized_end=1608
 # @@protoc_insertion_point(module_scope)
@@ -19,6 +19,31 @@ class sc_serviceStub(object):
                 request_serializer=communication__pb2.server_input.SerializeToString,
                 response_deserializer=communication__pb2.server_output.FromString,
                 )
+        self.inference_stream = channel.stream_stream(
+                '/sc_service/inference_stream',
+                request_serializer=communication__pb2.server_input.SerializeToString,
+                response_deserializer=communication__pb2.server_output.FromString,
+                )
+        self.model_info = channel.unary_unary(
+                '/sc_service/model_info',
+                request_serializer=communication__pb2.info_input.SerializeToString,
+                response_deserializer=communication__pb2.info_output.FromString,
+                )
+        self.reload_model = channel.unary_unary(
+                '/sc_service/reload_model',
+                request_serializer=communication__pb2.reload_input.SerializeToString,
+                response_deserializer=communication__pb2.reload_output.FromString,
+                )
+        self.subscribe = channel.unary_stream(
+                '/sc_service/subscribe',
+                request_serializer=communication__pb2.subscribe_input.SerializeToString,
+                response_deserializer=communication__pb2.transition_event.FromString,
+                )
+        self.profile = channel.unary_unary(
+                '/sc_service/profile',
+                request_serializer=communication__pb2.profile_input.SerializeToString,
+                response_deserializer=communication__pb2.profile_output.FromString,
+                )
 
 
 class sc_serviceServicer(object):
@@ -30,6 +55,36 @@ class sc_serviceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def inference_stream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def model_info(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def reload_model(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def subscribe(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def profile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_sc_serviceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -38,6 +93,31 @@ def add_sc_serviceServicer_to_server(servicer, server):
                     request_deserializer=communication__pb2.server_input.FromString,
                     response_serializer=communication__pb2.server_output.SerializeToString,
             ),
+            'inference_stream': grpc.stream_stream_rpc_method_handler(
+                    servicer.inference_stream,
+                    request_deserializer=communication__pb2.server_input.FromString,
+                    response_serializer=communication__pb2.server_output.SerializeToString,
+            ),
+            'model_info': grpc.unary_unary_rpc_method_handler(
+                    servicer.model_info,
+                    request_deserializer=communication__pb2.info_input.FromString,
+                    response_serializer=communication__pb2.info_output.SerializeToString,
+            ),
+            'reload_model': grpc.unary_unary_rpc_method_handler(
+                    servicer.reload_model,
+                    request_deserializer=communication__pb2.reload_input.FromString,
+                    response_serializer=communication__pb2.reload_output.SerializeToString,
+            ),
+            'subscribe': grpc.unary_stream_rpc_method_handler(
+                    servicer.subscribe,
+                    request_deserializer=communication__pb2.subscribe_input.FromString,
+                    response_serializer=communication__pb2.transition_event.SerializeToString,
+            ),
+            'profile': grpc.unary_unary_rpc_method_handler(
+                    servicer.profile,
+                    request_deserializer=communication__pb2.profile_input.FromString,
+                    response_serializer=communication__pb2.profile_output.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'sc_service', rpc_method_handlers)
@@ -64,3 +144,88 @@ class sc_service(object):
             communication__pb2.server_output.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def inference_stream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/sc_service/inference_stream',
+            communication__pb2.server_input.SerializeToString,
+            communication__pb2.server_output.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def model_info(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sc_service/model_info',
+            communication__pb2.info_input.SerializeToString,
+            communication__pb2.info_output.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def reload_model(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sc_service/reload_model',
+            communication__pb2.reload_input.SerializeToString,
+            communication__pb2.reload_output.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def subscribe(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/sc_service/subscribe',
+            communication__pb2.subscribe_input.SerializeToString,
+            communication__pb2.transition_event.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def profile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sc_service/profile',
+            communication__pb2.profile_input.SerializeToString,
+            communication__pb2.profile_output.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
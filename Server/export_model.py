@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION MODEL EXPORTER
+====================================
+
+The following program is used to export trained Stream Classification model to TorchScript & ONNX formats
+"""
+
+# %%
+# Importing Libraries
+from backends import *
+import time
+import pickle
+import argparse
+
+# %%
+# Backend Timing Function
+def time_backend(backend, batch_size, rounds = 10):
+    """
+    This function is used to find average forward pass time of subject backend
+
+    Function Input
+    ===============
+    backend : Backend object subject to timing
+    batch_size : Batch size of dummy input
+    rounds : Number of timed forward passes, after two warm up passes ( default : 10 )
+
+    Function Output
+    ================
+    Tuple of average time per batch in milliseconds & logits of last pass
+                            ( Time per Batch, Logits )
+    """
+    inp_tensor = torch.rand((batch_size,) + tuple(dummy_input_shape[1:]), generator = torch.Generator().manual_seed(0))
+    for _ in range(2):
+        out1 = backend(inp_tensor)
+    st = time.perf_counter()
+    for _ in range(rounds):
+        out1 = backend(inp_tensor)
+    return (time.perf_counter() - st) / rounds * 1000, out1
+
+# %%
+# Exporter Execution
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Stream Classification Model Exporter.')
+    parser.add_argument('-f', '--formats', nargs = '+', type = str, choices = ['torchscript', 'onnx'], help = 'Formats to Export Model To', default = ['torchscript', 'onnx'])
+    parser.add_argument('-o', '--output', type = str, help = 'Absolute Address of Exported Model Files Without Extension', default = '/resources/convnext')
+    parser.add_argument('-op', '--opset', type = int, help = 'ONNX Opset Version', default = 17)
+    parser.add_argument('-bs', '--batch_size', type = int, help = 'Batch Size to Verify & Time Exported Models With', default = 8)
+    parser.add_argument('-ohe', '--OHE', type = str, help = 'Absolute Address of One Hot Encoded Labels File', default = '/resources/OHE.labels')
+    parser.add_argument('-la', '--laddr', type = str, help = 'Absolute Address of Model File', default = '/resources/convnext.model')
+    parser.add_argument('-arc', '--architecture', type = str, choices = list(model_architectures), help = 'Model Architecture of Model File ( ConvNeXt-Tiny / ConvNeXt-Tiny with Early Exit Heads / MobileNetV3-Small Screener )', default = 'convnext')
+    args = vars(parser.parse_args())
+    print("""
+    ========================================
+    | Stream Classification Model Exporter |
+    ========================================
+    """)
+    with open(args['OHE'], 'rb') as file1:
+        num_classes = len(pickle.load(file1))
+    mod = load_eager(args['laddr'], num_classes, architecture = args['architecture'])
+    print('>>>>> Eager Model Loaded')
+    exported = {'eager': args['laddr']}
+    if 'torchscript' in args['formats']:
+        exported['torchscript'] = args['output'] + '.pt'
+        torch.jit.save(to_torchscript(mod, optimize = False), exported['torchscript'])
+        print(f'>>>>> TorchScript Model Saved: {exported["torchscript"]}')
+    if 'onnx' in args['formats']:
+        exported['onnx'] = args['output'] + '.onnx'
+        with open(exported['onnx'], 'wb') as file1:
+            file1.write(to_onnx(mod, args['opset']))
+        print(f'>>>>> ONNX Model Saved: {exported["onnx"]}')
+    print('---------------------------------------------')
+    print(f'{"Backend":>12} | {"Batch Time (ms)":>16} | {"Speedup":>8} | {"Max Abs Logit Difference":>24}')
+    eager_time, eager_out = None, None
+    for name, laddr in exported.items():
+        try:
+            backend_time, backend_out = time_backend(load_backend(name, laddr, num_classes, architecture = args['architecture']), args['batch_size'])
+        except ImportError as e:
+            print(f'{name:>12} | {str(e)}')
+            continue
+        if eager_time is None:
+            eager_time, eager_out = backend_time, backend_out
+        max_diff = (backend_out - eager_out).abs().max().item()
+        print(f'{name:>12} | {backend_time:>16.2f} | {eager_time / backend_time:>7.2f}x | {max_diff:>24.2e}')
@@ -10,42 +10,723 @@ The following program is used to perform inference on the subject data
 # Importing Libraries
 from PIL import Image
 import numpy as np
+import io
+import os
+import time
+import queue
+import atexit
+import hashlib
+import threading
+from multiprocessing import shared_memory
+from collections import deque
+from concurrent import futures
 import grpc
 import communication_pb2
 import communication_pb2_grpc
 
+# %%
+# Dropped Frame Exception Class
+class Frame_Dropped(Exception):
+    def __init__(self, code):
+        """
+        This method is used to initialize exception for stream frames dropped by server admission control
+
+        Method Input
+        =============
+        code : Name of GRPC status code reported by server
+                            Example : 'DEADLINE_EXCEEDED', 'RESOURCE_EXHAUSTED', 'ABORTED'
+
+        Method Output
+        ==============
+        None
+        """
+        super().__init__(code)
+        self.code = code
+
+# %%
+# Dropped Frame Reason Function
+def dropped_reason(error):
+    """
+    This function is used to find reason for which inference server dropped frames of failed call
+
+    Server sends reason in sc-rejected trailing metadata, so frames it dropped can be told apart from calls which
+    failed with same status code on client side, such as DEADLINE_EXCEEDED raised by deadline of call itself.
+
+    Function Input
+    ===============
+    error : grpc.RpcError raised by inference call
+
+    Function Output
+    ================
+    Reason of drop, out of 'deadline', 'queue_full', 'superseded', 'shared_memory', 'invalid_image' & 'replica_failed',
+    empty if frames were not dropped by server
+    """
+    for key, value in (error.trailing_metadata() or ()) if isinstance(error, grpc.Call) else ():
+        if key == 'sc-rejected':
+            return value
+    return ''
+
+# %%
+# Stage Timings Parsing Function
+def parse_timings(value):
+    """
+    This function is used to parse stage timings returned by inference server
+
+    Function Input
+    ===============
+    value : Stage timings as comma separated string
+                            Example : 'decode=0.412,queue=3.105,preprocess=1.870,forward=41.203,smoothing=0.051,serialize=0.090,total=47.001'
+
+    Function Output
+    ================
+    Dictionary of time in milliseconds taken by every stage
+    """
+    return {stage: float(elapsed) for stage, elapsed in (i.split('=') for i in value.split(','))}
+
+# %%
+# Shared Memory Frame Ring Class
+class Shared_Frame_Ring:
+    def __init__(self, slots = 8, slot_size = 8, grace = 1, prefix = 'sc_ring_'):
+        """
+        This method is used to create shared memory ring through which frames are handed to inference servers on same host
+
+        Ring is split into fixed size slots, & every request occupies one slot until its response arrives. Slot of
+        failed request is only reused after grace period, as server may still be reading it.
+
+        Method Input
+        =============
+        slots : Number of frame slots in ring ( default : 8 )
+        slot_size : Size of every frame slot in megabytes ( default : 8 )
+        grace : Time in seconds after which slot of failed request is reused ( default : 1 )
+        prefix : Name prefix of ring, which inference servers only attach rings with ( default : sc_ring_ )
+
+        Method Output
+        ==============
+        None
+        """
+        self.slot_size = slot_size * 1024 * 1024
+        self.grace = grace
+        self.shm = shared_memory.SharedMemory(name = prefix + os.urandom(8).hex(), create = True, size = slots * self.slot_size)
+        self.name = self.shm.name
+        self.__free__ = queue.SimpleQueue()
+        for i in range(slots):
+            self.__free__.put(i * self.slot_size)
+        self.__retired__ = deque()
+        self.__lock__ = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, inp1):
+        """
+        This method is used to copy frames into free slot of ring
+
+        Method Input
+        =============
+        inp1 : Stacked frames as Numpy array
+
+        Method Output
+        ==============
+        Offset in bytes of slot holding frames, None if frames do not fit in a slot or all slots are in use
+        """
+        if inp1.nbytes > self.slot_size:
+            return None
+        with self.__lock__:
+            while len(self.__retired__) != 0 and self.__retired__[0][0] <= time.monotonic():
+                self.__free__.put(self.__retired__.popleft()[1])
+        try:
+            offset = self.__free__.get_nowait()
+        except queue.Empty:
+            return None
+        np.ndarray(inp1.shape, dtype = inp1.dtype, buffer = self.shm.buf, offset = offset)[...] = inp1
+        return offset
+
+    def release(self, offset, failed = False):
+        """
+        This method is used to return slot to ring, once server is done with its frames
+
+        Method Input
+        =============
+        offset : Offset in bytes of slot, as returned by write
+        failed : Boolean variable, True if request failed, so slot is only reused after grace period ( default : False )
+
+        Method Output
+        ==============
+        None
+        """
+        if not failed:
+            self.__free__.put(offset)
+            return
+        with self.__lock__:
+            self.__retired__.append((time.monotonic() + self.grace, offset))
+
+    def close(self):
+        """
+        This method is used to release ring, servers keep their mapping until they detach it
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        if self.shm is None:
+            return
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+# %%
+# Inference Server Channel Pool Class
+class Channel_Pool:
+    def __init__(self, servers, spillover = 8, probe_interval = 5, probe_timeout = 1, slow_latency = 2, backoff = 1, max_backoff = 30):
+        """
+        This method is used to initialize pool of channels to multiple inference servers
+
+        Every session is routed to its highest ranked server by rendezvous hashing of its client ID, so it stays on
+        same server, and its averaging window stays consistent, as long as that server is healthy. When that server
+        already has spillover requests awaiting response, request is sent to server with least outstanding requests
+        instead. Servers which fail or respond slowly are drained, i.e. no new requests are routed to them, and are
+        probed again after exponential backoff until they recover.
+
+        Method Input
+        =============
+        servers : List of server IPs at which GRPC servers are running
+                            Format : [ "IP:Port", ... ]
+        spillover : Number of outstanding requests on session server after which requests spill to least loaded server ( default : 8 )
+        probe_interval : Interval in seconds to probe health of servers, 0 to disable probing ( default : 5 )
+        probe_timeout : Time in seconds after which health probe is considered failed ( default : 1 )
+        slow_latency : Average response time in seconds after which server is drained as slow ( default : 2 )
+        backoff : Time in seconds to wait before probing drained server for the first time ( default : 1 )
+        max_backoff : Maximum time in seconds to wait between probes of drained server ( default : 30 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.servers = list(servers)
+        self.spillover = spillover
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.slow_latency = slow_latency
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.channels = {i: grpc.insecure_channel(i) for i in self.servers}
+        self.stubs = {i: communication_pb2_grpc.sc_serviceStub(self.channels[i]) for i in self.servers}
+        self.__outstanding__ = {i: 0 for i in self.servers}
+        self.__latency__ = {i: 0.0 for i in self.servers}
+        self.__healthy__ = {i: True for i in self.servers}
+        self.__retry_at__ = {i: 0.0 for i in self.servers}
+        self.__probed_at__ = {i: time.monotonic() for i in self.servers}
+        self.__backoff__ = {i: backoff for i in self.servers}
+        self.__lock__ = threading.Lock()
+        self.__closed__ = threading.Event()
+        # With single server there is nowhere to drain to, so it is not probed
+        if self.probe_interval > 0 and len(self.servers) > 1:
+            threading.Thread(target = self.__probe__, daemon = True).start()
+
+    def replace(self, server, channel):
+        """
+        This method is used to reach subject server through another channel, such as its Unix domain socket
+
+        Method Input
+        =============
+        server : Server IP subject to reach through new channel
+        channel : GRPC channel to subject server
+
+        Method Output
+        ==============
+        None
+        """
+        old = self.channels[server]
+        self.channels[server] = channel
+        self.stubs[server] = communication_pb2_grpc.sc_serviceStub(channel)
+        if old is not channel:
+            old.close()
+
+    def __rank__(self, key):
+        """
+        This method is used to rank servers for subject session by rendezvous hashing
+
+        Method Input
+        =============
+        key : Client ID of subject session
+
+        Method Output
+        ==============
+        List of server IPs, highest ranked first
+        """
+        return sorted(self.servers, key = lambda i: hashlib.md5(f'{key}|{i}'.encode('utf-8')).digest(), reverse = True)
+
+    def pick(self, key):
+        """
+        This method is used to choose server for next request of subject session
+
+        Method Input
+        =============
+        key : Client ID of subject session
+
+        Method Output
+        ==============
+        Server IP, highest ranked healthy server unless it is overloaded
+        """
+        ranked = self.__rank__(key)
+        with self.__lock__:
+            healthy = [i for i in ranked if self.__healthy__[i]]
+            if len(healthy) == 0:
+                # Every server is drained, so the one due to be retried first is tried
+                return min(ranked, key = lambda i: self.__retry_at__[i])
+            server = healthy[0]
+            if self.spillover > 0 and self.__outstanding__[server] >= self.spillover:
+                least = min(healthy, key = lambda i: self.__outstanding__[i])
+                if self.__outstanding__[least] < self.__outstanding__[server]:
+                    return least
+            return server
+
+    def acquire(self, server):
+        """
+        This method is used to record request sent to subject server
+
+        Method Input
+        =============
+        server : Server IP to which request is sent
+
+        Method Output
+        ==============
+        Time at which request is sent
+        """
+        with self.__lock__:
+            self.__outstanding__[server] += 1
+        return time.perf_counter()
+
+    def release(self, server, start, error = None):
+        """
+        This method is used to record response of subject server & drain it if it failed or is responding slowly
+
+        Method Input
+        =============
+        server : Server IP which responded
+        start : Time at which request was sent, as returned by acquire
+        error : GRPC error raised by request, None if it succeeded ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        elapsed = time.perf_counter() - start
+        with self.__lock__:
+            self.__outstanding__[server] -= 1
+            if error is None:
+                latency = self.__latency__[server]
+                self.__latency__[server] = elapsed if latency == 0 else 0.8 * latency + 0.2 * elapsed
+        if error is not None and self.failed(error):
+            self.drain(server)
+        elif self.slow_latency > 0 and self.__latency__[server] > self.slow_latency:
+            self.drain(server)
+
+    def failed(self, error):
+        """
+        This method is used to find whether GRPC error means server failure, rather than dropped frame
+
+        Method Input
+        =============
+        error : GRPC error raised by request
+
+        Method Output
+        ==============
+        Boolean variable, True if server is unreachable or failed internally
+        """
+        return isinstance(error, grpc.RpcError) and error.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.INTERNAL, grpc.StatusCode.UNKNOWN)
+
+    def drain(self, server):
+        """
+        This method is used to stop routing requests to subject server until it passes a probe after backoff
+
+        Method Input
+        =============
+        server : Server IP subject to drain
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            if not self.__healthy__[server] and time.monotonic() < self.__retry_at__[server]:
+                return
+            self.__healthy__[server] = False
+            self.__retry_at__[server] = time.monotonic() + self.__backoff__[server]
+            self.__backoff__[server] = min(self.__backoff__[server] * 2, self.max_backoff)
+
+    def __recover__(self, server):
+        """
+        This method is used to route requests to subject server again after it passed a probe
+
+        Method Input
+        =============
+        server : Server IP subject to recover
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            self.__healthy__[server] = True
+            self.__backoff__[server] = self.backoff
+            self.__latency__[server] = 0.0
+
+    def __probe__(self):
+        """
+        This method is used to continuously probe healthy servers & drained servers due for retry
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        while not self.__closed__.wait(min(self.probe_interval, self.backoff)):
+            for server in self.servers:
+                now = time.monotonic()
+                with self.__lock__:
+                    healthy = self.__healthy__[server]
+                    due = self.__probed_at__[server] + self.probe_interval if healthy else self.__retry_at__[server]
+                if now < due:
+                    continue
+                self.__probed_at__[server] = now
+                try:
+                    self.stubs[server].model_info(communication_pb2.info_input(client_id = 'health_probe'), timeout = self.probe_timeout)
+                except grpc.RpcError:
+                    self.drain(server)
+                    continue
+                if not healthy:
+                    self.__recover__(server)
+
+    def status(self):
+        """
+        This method is used to report state of every server in pool
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of server IPs to their state
+                            { Server IP : { 'healthy', 'outstanding', 'latency', 'backoff' } }
+        """
+        with self.__lock__:
+            return {i: {'healthy': self.__healthy__[i], 'outstanding': self.__outstanding__[i], 'latency': self.__latency__[i], 'backoff': self.__backoff__[i]} for i in self.servers}
+
+    def close(self):
+        """
+        This method is used to stop probing & close channels to all servers
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        self.__closed__.set()
+        for channel in self.channels.values():
+            channel.close()
+
 # %%
 # Main Client Inference Class
 class sc_client:
-    def __init__(self, server_ip, id_len = 10):
+    def __init__(self, server_ip, id_len = 10, streaming = False, in_flight = 4, encoding = 'raw', quality = 90, resize = False, compact = False, top_k = 0, full_probs = False, timeout = None, spillover = 8, probe_interval = 5, slow_latency = 2, timings = False, shared_memory = False, ring_slots = 8, slot_size = 8):
         """
         This method is used to initialize Stream Classification inference client
 
         Method Input
         =============
-        server_ip : Server IP at which GRPC server is running
-                            Format : "IP:Port"
+        server_ip : Server IP at which GRPC server is running, or list of them to balance sessions across
+                            Format : "IP:Port" or [ "IP:Port", ... ]
                             Example : '0.0.0.0:1234'
         id_len : Length of client randomized id ( default : 10 )
+        streaming : Boolean variable to send requests over single long lived stream instead of separate calls ( default : False )
+        in_flight : Maximum number of requests awaiting response on stream ( default : 4 )
+        encoding : Image encoding to send frames with, out of 'raw', 'jpeg' & 'webp' ( default : raw )
+        quality : Quality of encoded images ( 1 - 100 ) ( default : 90 )
+        resize : Boolean variable to resize images locally to model input size reported by server ( default : False )
+        compact : Boolean variable to receive class indices & float16 probabilities instead of label strings, always enabled with top_k or full_probs ( default : False )
+        top_k : Number of most probable classes to additionally receive for every image, 0 to disable ( default : 0 )
+        full_probs : Boolean variable to additionally receive probabilities of all classes ( default : False )
+        timeout : Deadline in seconds for separate inference calls, None for no deadline ( default : None )
+        spillover : Number of outstanding requests on session server after which requests spill to least loaded server ( default : 8 )
+        probe_interval : Interval in seconds to probe health of multiple servers, 0 to disable probing ( default : 5 )
+        slow_latency : Average response time in seconds after which server is drained as slow, 0 to disable ( default : 2 )
+        timings : Boolean variable to receive stage timings with every response over stream, separate calls always receive them ( default : False )
+        shared_memory : Boolean variable to hand raw frames to servers on same host through shared memory ring, when servers allow it ( default : False )
+        ring_slots : Number of frame slots in shared memory ring ( default : 8 )
+        slot_size : Size of every shared memory frame slot in megabytes ( default : 8 )
 
         Method Output
         ==============
         None
         """
         self.sc_server_ip = server_ip
-        self.channel = grpc.insecure_channel(self.sc_server_ip)
-        self.stub = communication_pb2_grpc.sc_serviceStub(self.channel)
+        self.streaming = streaming
+        self.in_flight = in_flight
+        self.encoding = encoding
+        self.quality = quality
+        self.resize = resize
+        # Top-k & full probabilities are only carried by compact responses
+        self.compact = compact or top_k > 0 or full_probs
+        self.top_k = top_k
+        self.full_probs = full_probs
+        self.timeout = timeout
+        self.timings = timings
+        self.model_version = None
+        self.stage_timings = None
+        self.ring = None
+        self.local_servers = set()
+        self.__model_info__ = None
+        self.__stream__ = None
+        self.__stream_lock__ = threading.Lock()
+        self.pool = Channel_Pool([server_ip] if isinstance(server_ip, str) else server_ip, spillover = spillover, probe_interval = probe_interval, slow_latency = slow_latency)
         self.client_name_chars = np.array(['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z'])
         self.client_name = ''.join(np.random.choice(self.client_name_chars, size = id_len).tolist())
+        if self.resize or self.compact:
+            try:
+                self.model_info()
+            except grpc.RpcError:
+                pass
+        if shared_memory and self.encoding == 'raw':
+            self.__shared_memory__(ring_slots, slot_size)
+
+    def __shared_memory__(self, ring_slots = 8, slot_size = 8):
+        """
+        This method is used to switch servers on same host to their Unix domain socket & shared memory frames
+
+        Server is on same host if Unix domain socket it reports exists locally, & server reached through it reports same
+        instance ID. Shared memory ring is only created once such server is found, & server then has to attach it,
+        otherwise its frames are sent in requests.
+
+        Method Input
+        =============
+        ring_slots : Number of frame slots in shared memory ring ( default : 8 )
+        slot_size : Size of every shared memory frame slot in megabytes ( default : 8 )
+
+        Method Output
+        ==============
+        None
+        """
+        for server in self.pool.servers:
+            try:
+                info = self.pool.stubs[server].model_info(communication_pb2.info_input(client_id = self.client_name), timeout = 1)
+            except grpc.RpcError:
+                continue
+            if server.startswith('unix:'):
+                channel = self.pool.channels[server]
+            elif info.unix_socket != '' and os.path.exists(info.unix_socket):
+                channel = grpc.insecure_channel('unix:' + info.unix_socket)
+            else:
+                continue
+            stub = communication_pb2_grpc.sc_serviceStub(channel)
+            try:
+                local = stub.model_info(communication_pb2.info_input(client_id = self.client_name), timeout = 1)
+                if local.instance_id == info.instance_id:
+                    if self.ring is None:
+                        self.ring = Shared_Frame_Ring(ring_slots, slot_size)
+                    local = stub.model_info(communication_pb2.info_input(client_id = self.client_name, shm_name = self.ring.name), timeout = 1)
+            except grpc.RpcError:
+                local = None
+            if local is not None and local.instance_id == info.instance_id and local.shared_memory:
+                self.pool.replace(server, channel)
+                self.local_servers.add(server)
+            elif channel is not self.pool.channels[server]:
+                channel.close()
+        if self.ring is not None and len(self.local_servers) == 0:
+            self.ring.close()
+            self.ring = None
+
+    def __release__(self, request, server, error = None):
+        """
+        This method is used to return shared memory slot of request to ring, once server answered it
+
+        Server which could not read frames from ring is switched back to frames in requests.
+
+        Method Input
+        =============
+        request : GRPC request object
+        server : Server IP to which request was sent
+        error : Exception raised by request, or status code name of dropped frames, None if it succeeded ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        if getattr(request, 'shm_name', '') == '':
+            return
+        # Server may still read frames of failed request, while dropped frames are already answered
+        self.ring.release(request.shm_offset, isinstance(error, Exception))
+        if (error.code().name if isinstance(error, grpc.RpcError) else error) == 'FAILED_PRECONDITION':
+            self.local_servers.discard(server)
+
+    def model_info(self):
+        """
+        This method is used to fetch model input requirements & labels from GRPC server, once per client
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Model information as dictionary, empty if server does not provide it
+                            { 'height', 'width', 'channel', 'channel_order', 'labels', 'model_version' }
+        """
+        if self.__model_info__ is None:
+            try:
+                info = self.__unary__('model_info', communication_pb2.info_input(client_id = self.client_name))
+                self.__model_info__ = {'height': info.height, 'width': info.width, 'channel': info.channel, 'channel_order': info.channel_order, 'labels': list(info.labels), 'model_version': info.model_version}
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                self.__model_info__ = dict()
+        return self.__model_info__
+
+    def __unary__(self, rpc, request, timeout = None):
+        """
+        This method is used to send unary request to server of this session, failing over to next server if it is unavailable
+
+        Request with frames in shared memory ring, which server could not read, is sent again with frames in request.
+
+        Method Input
+        =============
+        rpc : Name of unary RPC
+        request : GRPC request object, or function building it for picked server
+        timeout : Deadline in seconds, None for no deadline ( default : None )
+
+        Method Output
+        ==============
+        GRPC response object
+        """
+        error, attempts = None, 0
+        while attempts < len(self.pool.servers):
+            server = self.pool.pick(self.client_name)
+            inp_req = request(server) if callable(request) else request
+            st = self.pool.acquire(server)
+            try:
+                out1, call = getattr(self.pool.stubs[server], rpc).with_call(inp_req, timeout = timeout)
+            except grpc.RpcError as e:
+                self.pool.release(server, st, e)
+                self.__release__(inp_req, server, e)
+                if getattr(inp_req, 'shm_name', '') != '' and e.code() == grpc.StatusCode.FAILED_PRECONDITION:
+                    continue
+                if not self.pool.failed(e):
+                    raise
+                error, attempts = e, attempts + 1
+                continue
+            self.pool.release(server, st)
+            self.__release__(inp_req, server)
+            for key, value in call.trailing_metadata() or ():
+                if key == 'sc-stage-timings':
+                    self.stage_timings = parse_timings(value)
+            return out1
+        raise error
+
+    def reload_model(self, laddr = ''):
+        """
+        This method is used to ask every GRPC server to load new model version, if servers allow reload through RPC
+
+        Method Input
+        =============
+        laddr : Absolute address of new model file on servers, empty for their current model file ( default : empty )
+
+        Method Output
+        ==============
+        List of reload outcomes as dictionaries, one per server
+                            [ { 'server', 'model_version', 'status', 'message' }, ... ]
+        """
+        outcomes = list()
+        for server in self.pool.servers:
+            out1 = self.pool.stubs[server].reload_model(communication_pb2.reload_input(laddr = laddr))
+            outcomes.append({'server': server, 'model_version': out1.model_version, 'status': out1.status, 'message': out1.message})
+        return outcomes
+
+    def profile(self, batches = 0):
+        """
+        This method is used to ask every GRPC server to capture torch profiler trace of its next batches, if servers allow it
+
+        Method Input
+        =============
+        batches : Number of batches to capture, 0 for server default ( default : 0 )
+
+        Method Output
+        ==============
+        List of capture outcomes as dictionaries, one per server, with trace file addresses on respective server
+                            [ { 'server', 'paths', 'status', 'message' }, ... ]
+        """
+        outcomes = list()
+        for server in self.pool.servers:
+            out1 = self.pool.stubs[server].profile(communication_pb2.profile_input(batches = batches))
+            outcomes.append({'server': server, 'paths': list(out1.paths), 'status': out1.status, 'message': out1.message})
+        return outcomes
+
+    def subscribe(self, client_id = None, timeout = None):
+        """
+        This method is used to follow label transitions of client session, instead of reading label of every frame
+
+        Subscription is opened on server which channel pool picks for followed session, which is where its frames go
+        as long as that server is healthy & not overloaded.
+
+        Method Input
+        =============
+        client_id : Client ID of session subject to follow ( default : this client )
+        timeout : Time in seconds after which subscription ends, None to follow until cancelled ( default : None )
+
+        Method Output
+        ==============
+        Iterator over transition events as dictionaries, starting with snapshot events of segments in progress
+                            { 'client_id', 'stream', 'label', 'previous_label', 'frame_index', 'timestamp', 'confidence', 'segment_duration', 'snapshot' }
+        """
+        client_id = self.client_name if client_id is None else client_id
+        server = self.pool.pick(client_id)
+        for event in self.pool.stubs[server].subscribe(communication_pb2.subscribe_input(client_id = client_id), timeout = timeout):
+            yield {'client_id': event.client_id, 'stream': event.stream, 'label': event.label, 'previous_label': event.previous_label, 'frame_index': event.frame_index, 'timestamp': event.timestamp, 'confidence': event.confidence, 'segment_duration': event.segment_duration, 'snapshot': event.snapshot}
+
+    def __batch__(self, x):
+        """
+        This method is used to stack images into batch, resizing them to model input size if required
+
+        Method Input
+        =============
+        x : List of Pillow images subject to required inference
+
+        Method Output
+        ==============
+        Stacked images as Numpy array
+                            [ Batch x Width x Height x Channel ]
+        """
+        if self.resize:
+            try:
+                info = self.model_info()
+            except grpc.RpcError:
+                info = dict()
+            if len(info) != 0:
+                size = (info['width'], info['height'])
+                return np.stack([np.asarray(i if i.size == size else i.resize(size, Image.BILINEAR)) for i in x])
+        return np.stack([np.asarray(i) for i in x])
     
-    def input_processor(self, inp1):
+    def input_processor(self, inp1, capture_time = None, server = None):
         """
         This method is used to process input & sends request to GRPC server
 
+        Raw frames for server on same host are written into shared memory ring, & request only carries their slot,
+        unless they do not fit in a slot or all slots are in use.
+
         Method Input
         =============
         inp1 : Input for inference request as Numpy array
                             [ Batch x Width x Height x Channel ]
+        capture_time : Unix time at which frames were captured ( default : current time )
+        server : Server IP to which request is sent ( default : none, frames are sent in request )
 
         Method Output
         ==============
@@ -53,44 +734,181 @@ class sc_client:
         """
         inp1_shape = inp1.shape
         self.__batch_size = inp1_shape[0]
-        return communication_pb2.server_input(imgs = inp1.tobytes(), batch = inp1_shape[0], width = inp1_shape[1], height = inp1_shape[2], channel = inp1_shape[3], data_type = inp1.dtype.name, client_id = self.client_name)
+        compact = self.compact and len(self.model_info()) != 0
+        capture_time = time.time() if capture_time is None else capture_time
+        offset = self.ring.write(inp1) if self.encoding == 'raw' and server in self.local_servers else None
+        if offset is not None:
+            return communication_pb2.server_input(shm_name = self.ring.name, shm_offset = offset, batch = inp1_shape[0], width = inp1_shape[1], height = inp1_shape[2], channel = inp1_shape[3], data_type = inp1.dtype.name, client_id = self.client_name, compact = compact, top_k = self.top_k, full_probs = self.full_probs, capture_time = capture_time, stage_timings = self.timings)
+        if self.encoding == 'raw':
+            return communication_pb2.server_input(imgs = inp1.tobytes(), batch = inp1_shape[0], width = inp1_shape[1], height = inp1_shape[2], channel = inp1_shape[3], data_type = inp1.dtype.name, client_id = self.client_name, compact = compact, top_k = self.top_k, full_probs = self.full_probs, capture_time = capture_time, stage_timings = self.timings)
+        return communication_pb2.server_input(encoded_imgs = [self.__encode__(i) for i in inp1], encoding = self.encoding, batch = inp1_shape[0], width = inp1_shape[1], height = inp1_shape[2], channel = inp1_shape[3], data_type = inp1.dtype.name, client_id = self.client_name, compact = compact, top_k = self.top_k, full_probs = self.full_probs, capture_time = capture_time, stage_timings = self.timings)
+
+    def __encode__(self, img):
+        """
+        This method is used to compress single image with client encoding
+
+        Method Input
+        =============
+        img : Image as Numpy array
+                            [ Width x Height x Channel ]
+
+        Method Output
+        ==============
+        Encoded image bytes
+        """
+        buf = io.BytesIO()
+        Image.fromarray(img).save(buf, format = self.encoding.upper(), quality = self.quality)
+        return buf.getvalue()
     
-    def output_processor(self, out1):
+    def output_processor(self, out1, batch_size = None):
         """
         This method is used to process output by receiving response from GRPC server
 
         Method Input
         =============
         out1 : GRPC server response after inference
+        batch_size : Batch size of respective request ( default : batch size of last processed input )
+
+        Method Output
+        ==============
+        Response from GRPC server, with dictionary of top-k & full probabilities as third item when requested
+                            ( Stream Classification Inference List, Stream Classificiation Probability List, Additional Outputs )
+        """
+        batch_size = self.__batch_size if batch_size is None else batch_size
+        if out1.model_version != '':
+            self.model_version = out1.model_version
+        if out1.stage_timings != '':
+            self.stage_timings = parse_timings(out1.stage_timings)
+        sc_probs = np.frombuffer(out1.probabilities, dtype = out1.data_type).reshape(batch_size, -1)
+        if out1.index_type == '':
+            sc_class = [''.join(i) for i in np.frombuffer(out1.stream_classification, dtype = '<U1').reshape(batch_size, -1)]
+            return sc_class, sc_probs
+        labels = self.model_info()['labels']
+        sc_class = [labels[i] for i in np.frombuffer(out1.class_indices, dtype = out1.index_type)]
+        if self.top_k <= 0 and not self.full_probs:
+            return sc_class, sc_probs
+        extras = dict()
+        if out1.top_k > 0:
+            extras['top_indices'] = np.frombuffer(out1.top_indices, dtype = out1.index_type).reshape(batch_size, out1.top_k)
+            extras['top_labels'] = [[labels[j] for j in i] for i in extras['top_indices']]
+            extras['top_probabilities'] = np.frombuffer(out1.top_probabilities, dtype = out1.data_type).reshape(batch_size, out1.top_k)
+        if len(out1.full_probabilities) != 0:
+            extras['probabilities'] = np.frombuffer(out1.full_probabilities, dtype = out1.data_type).reshape(batch_size, -1)
+        return sc_class, sc_probs, extras
+
+    def __open_stream__(self):
+        """
+        This method is used to open inference stream to GRPC server for this client session, chosen by channel pool
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        server = self.pool.pick(self.client_name)
+        self.__stream__ = {'requests': queue.Queue(), 'pending': deque(), 'slots': threading.Semaphore(self.in_flight), 'closed': False, 'server': server}
+        self.__stream__['call'] = self.pool.stubs[server].inference_stream(iter(self.__stream__['requests'].get, None), metadata = (('client_id', self.client_name),))
+        threading.Thread(target = self.__read_stream__, args = (self.__stream__,), daemon = True).start()
+
+    def __read_stream__(self, stream):
+        """
+        This method is used to resolve pending requests as responses arrive on inference stream
+
+        Method Input
+        =============
+        stream : Dictionary holding state of subject inference stream
 
         Method Output
         ==============
-        Response from GRPC server
+        None
         """
-        sc_class = [''.join(i) for i in np.frombuffer(out1.stream_classification, dtype = '<U1').reshape(self.__batch_size, -1)]
-        sc_probs = np.frombuffer(out1.probabilities, dtype = out1.data_type).reshape(self.__batch_size, -1)
-        return sc_class, sc_probs
+        error = RuntimeError('Inference stream closed by server')
+        try:
+            for response in stream['call']:
+                batch_size, fut, st, request = stream['pending'].popleft()
+                self.pool.release(stream['server'], st)
+                self.__release__(request, stream['server'], response.status or None)
+                if response.status != '':
+                    fut.set_exception(Frame_Dropped(response.status))
+                else:
+                    fut.set_result(self.output_processor(response, batch_size))
+                stream['slots'].release()
+        except grpc.RpcError as e:
+            error = e
+        with self.__stream_lock__:
+            stream['closed'] = True
+            if self.__stream__ is stream:
+                self.__stream__ = None
+            while len(stream['pending']) != 0:
+                batch_size, fut, st, request = stream['pending'].popleft()
+                self.pool.release(stream['server'], st, error)
+                self.__release__(request, stream['server'], error)
+                fut.set_exception(error)
+                stream['slots'].release()
 
-    def __call__(self, x):
+    def submit(self, x, capture_time = None):
+        """
+        This method is used to send inference request over stream without waiting for its response
+
+        Method Input
+        =============
+        x : List of Pillow images subject to required inference
+        capture_time : Unix time at which frames were captured ( default : current time )
+
+        Method Output
+        ==============
+        Future resolving to Stream Classification inference as tuple, or failing with Frame_Dropped if server dropped frames
+                             ( Stream Classification Inference List, Stream Classificiation Probability List )
+        """
+        capture_time = time.time() if capture_time is None else capture_time
+        x = self.__batch__(x)
+        fut = futures.Future()
+        while True:
+            with self.__stream_lock__:
+                if self.__stream__ is None:
+                    self.__open_stream__()
+                stream = self.__stream__
+            stream['slots'].acquire()
+            with self.__stream_lock__:
+                if not stream['closed']:
+                    request = self.input_processor(x, capture_time, stream['server'])
+                    stream['pending'].append((x.shape[0], fut, self.pool.acquire(stream['server']), request))
+                    stream['requests'].put(request)
+                    return fut
+            stream['slots'].release()
+
+    def __call__(self, x, capture_time = None):
         """
         This method is used to handle inference requests & returns inference results
 
+        Frames dropped by server admission control raise grpc.RpcError with respective status code,
+        or Frame_Dropped when streaming.
+
         Method Input
         =============
         x : List of Pillow images subject to required inference
+        capture_time : Unix time at which frames were captured ( default : current time )
 
         Method Output
         ==============
         Stream Classification inference as tuple
                              ( Stream Classification Inference List, Stream Classificiation Probability List )
         """
-        x = np.stack([np.asarray(i) for i in x])
-        response = self.stub.inference(self.input_processor(x))
+        capture_time = time.time() if capture_time is None else capture_time
+        if self.streaming:
+            return self.submit(x, capture_time).result()
+        x = self.__batch__(x)
+        response = self.__unary__('inference', lambda server: self.input_processor(x, capture_time, server), timeout = self.timeout)
         return self.output_processor(response)
     
     def __del__(self):
         """
-        This method is used to close communication channel to GRPC server
+        This method is used to close communication channels to GRPC servers
+
+        Attributes are looked up with defaults, as initialization may have failed before assigning them.
 
         Method Input
         =============
@@ -100,5 +918,10 @@ class sc_client:
         ==============
         None
         """
-        self.channel.close()
+        if getattr(self, '__stream__', None) is not None:
+            self.__stream__['requests'].put(None)
+        if getattr(self, 'pool', None) is not None:
+            self.pool.close()
+        if getattr(self, 'ring', None) is not None:
+            self.ring.close()
         
@@ -9,50 +9,420 @@ The following program is used to perform inference on the subject data
 
 # %%
 # Importing Libraries
-from model import *
 import time
+# Start time is taken before heavy imports, so they are included in reported startup time
+process_start = time.perf_counter()
+from model import *
+import io
 import sys
 import argparse
 import socket
+import queue
+import asyncio
+import threading
+import atexit
+import signal
+import itertools
+import zlib
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+from collections import OrderedDict, deque
 from concurrent import futures
 import grpc
 import communication_pb2
 import communication_pb2_grpc
+from metrics import *
+from smoothing import *
+from backends import *
+
+# %%
+# Client Session Store Class
+class Session_Store:
+    def __init__(self, window = 5, max_sessions = 1000, ttl = 600):
+        """
+        This method is used to initialize bounded & thread safe store of client averaging windows
+
+        Sessions are kept in least recently used order, so idle sessions are always dropped from the front.
+
+        Method Input
+        =============
+        window : Stream classification window size to observe ( default : 5 )
+        max_sessions : Maximum number of client sessions to keep, 0 for unlimited ( default : 1000 )
+        ttl : Time in seconds after which idle client session is dropped, 0 to keep forever ( default : 600 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.window = window
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.expired = 0
+        self.evicted = 0
+        self.__sessions__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+
+    def __len__(self):
+        """
+        This method is used to find number of active client sessions
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Number of active client sessions
+        """
+        return len(self.__sessions__)
+
+    def __contains__(self, client_id):
+        """
+        This method is used to check if client session is active
+
+        Method Input
+        =============
+        client_id : Client ID to identify connection & track inference
+
+        Method Output
+        ==============
+        Boolean value for session presence
+        """
+        return client_id in self.__sessions__
+
+    def __expire__(self, now):
+        """
+        This method is used to drop client sessions idle for more than TTL
+
+        Method Input
+        =============
+        now : Current monotonic time in seconds
+
+        Method Output
+        ==============
+        None
+        """
+        if self.ttl <= 0:
+            return
+        while len(self.__sessions__) != 0 and now - next(iter(self.__sessions__.values()))[1] > self.ttl:
+            self.__sessions__.popitem(last = False)
+            self.expired += 1
+
+    def stats(self):
+        """
+        This method is used to report session store status
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of active sessions, TTL expired sessions & LRU evicted sessions
+        """
+        with self.__lock__:
+            self.__expire__(time.monotonic())
+            return {'sessions': len(self.__sessions__), 'expired': self.expired, 'evicted': self.evicted}
+
+    def __call__(self, client_id, inf_probs):
+        """
+        This method is used to average probabilities over client session window, creating session if required
+
+        Method Input
+        =============
+        client_id : Client ID to identify connection & track inference
+        inf_probs : Stream classification output in the form of Numpy probabilities
+
+        Method Output
+        ==============
+        Averaged probabilities as Numpy array
+        """
+        with self.__lock__:
+            now = time.monotonic()
+            self.__expire__(now)
+            if client_id in self.__sessions__:
+                self.__sessions__.move_to_end(client_id)
+            else:
+                self.__sessions__[client_id] = [Smoothing_Window(self.window), now]
+                if self.max_sessions > 0 and len(self.__sessions__) > self.max_sessions:
+                    self.__sessions__.popitem(last = False)
+                    self.evicted += 1
+            session = self.__sessions__[client_id]
+            session[1] = now
+            return session[0](inf_probs)
+
+# %%
+# Perceptual Hash Result Cache Class
+class Frame_Cache:
+    def __init__(self, size = 4096, classes = 3, tolerance = 0, hash_size = 8):
+        """
+        This method is used to initialize LRU cache of raw probabilities keyed by perceptual hash of frames
+
+        Frames are keyed by difference hash of their downscaled grayscale version, so identical & near identical
+        frames, such as repeated frames of a channel watched by several clients, share single forward pass.
+
+        Method Input
+        =============
+        size : Maximum number of cached frames ( default : 4096 )
+        classes : Number of Stream Classification labels ( default : 3 )
+        tolerance : Maximum Hamming distance between hashes to consider frames same ( default : 0 )
+        hash_size : Side of hash grid from 1 to 8, hashes have hash_size x hash_size bits upto 64 ( default : 8 )
+
+        Method Output
+        ==============
+        None
+        """
+        # Hashes are packed into single uint64, so grid can not hold more than 64 bits
+        if not 1 <= hash_size <= 8:
+            raise ValueError(f'Hash size must be between 1 & 8, so hashes fit in 64 bits, got {hash_size}')
+        self.size = size
+        self.classes = classes
+        self.tolerance = tolerance
+        self.hash_size = hash_size
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0.0
+        self.__cost__ = 0.0
+        self.__data__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+        self.__popcount__ = np.array([bin(i).count('1') for i in range(256)], dtype = np.uint8)
+
+    def __len__(self):
+        """
+        This method is used to find number of cached frames
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Number of cached frames
+        """
+        return len(self.__data__)
+
+    def keys(self, img_btch):
+        """
+        This method is used to find difference hash of every frame in batch
+
+        Method Input
+        =============
+        img_btch : Stacked Numpy PIL images with following shape:
+                            [ Batch x Width x Height x Channel ]
+
+        Method Output
+        ==============
+        Hashes as Numpy uint64 array of batch size
+        """
+        rows, cols = self.hash_size, self.hash_size + 1
+        step = max(1, min(img_btch.shape[1] // rows, img_btch.shape[2] // cols) // 4)
+        small = img_btch[:, ::step, ::step].astype(np.float32)
+        gray = small.mean(axis = 3) if small.ndim == 4 else small
+        h, w = gray.shape[1] // rows * rows, gray.shape[2] // cols * cols
+        blocks = gray[:, :h, :w].reshape(gray.shape[0], rows, h // rows, cols, w // cols).mean(axis = (2, 4))
+        bits = (blocks[:, :, 1:] > blocks[:, :, :-1]).reshape(gray.shape[0], -1)
+        bits = np.pad(bits, ((0, 0), (0, 64 - bits.shape[1])))
+        return np.packbits(bits, axis = 1).view(np.uint64).ravel()
+
+    def __nearest__(self, key, cached):
+        """
+        This method is used to find cached hash within Hamming tolerance of subject hash
+
+        Method Input
+        =============
+        key : Hash of subject frame
+        cached : Numpy uint64 array of cached hashes
+
+        Method Output
+        ==============
+        Nearest cached hash as integer, None if no cached hash is within tolerance
+        """
+        if len(cached) == 0:
+            return None
+        dist = self.__popcount__[(cached ^ np.uint64(key)).view(np.uint8)].reshape(-1, 8).sum(axis = 1)
+        idx = int(np.argmin(dist))
+        return int(cached[idx]) if dist[idx] <= self.tolerance else None
+
+    def lookup(self, img_btch):
+        """
+        This method is used to find cached raw probabilities of frames in batch
+
+        Method Input
+        =============
+        img_btch : Stacked Numpy PIL images with following shape:
+                            [ Batch x Width x Height x Channel ]
+
+        Method Output
+        ==============
+        Tuple of hashes, raw probabilities with cached rows filled & boolean mask of rows not found in cache
+                            ( Hashes, Raw Probabilities, Miss Mask )
+        """
+        keys = self.keys(img_btch)
+        probs = np.zeros((len(keys), self.classes), dtype = np.float32)
+        miss = np.ones(len(keys), dtype = bool)
+        with self.__lock__:
+            cached = None
+            for i, key in enumerate(keys.tolist()):
+                if key not in self.__data__ and self.tolerance > 0:
+                    if cached is None:
+                        cached = np.fromiter(self.__data__.keys(), dtype = np.uint64, count = len(self.__data__))
+                    key = self.__nearest__(key, cached)
+                if key is not None and key in self.__data__:
+                    self.__data__.move_to_end(key)
+                    probs[i] = self.__data__[key]
+                    miss[i] = False
+            hits = int((~miss).sum())
+            self.hits += hits
+            self.misses += len(keys) - hits
+            self.saved += hits * self.__cost__
+        return keys, probs, miss
+
+    def store(self, keys, inf_probs, elapsed = None):
+        """
+        This method is used to cache raw probabilities of frames, evicting least recently used frames
+
+        Method Input
+        =============
+        keys : Hashes of subject frames
+        inf_probs : Raw Stream Classification probabilities of subject frames as Numpy array
+        elapsed : Time in seconds spent to find these probabilities, to estimate time saved by hits ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            if elapsed is not None and len(keys) != 0:
+                cost = elapsed / len(keys)
+                self.__cost__ = cost if self.__cost__ == 0 else 0.9 * self.__cost__ + 0.1 * cost
+            for key, probs in zip(keys.tolist(), inf_probs):
+                self.__data__[key] = probs.copy()
+                self.__data__.move_to_end(key)
+            while len(self.__data__) > self.size:
+                self.__data__.popitem(last = False)
+
+    def share(self, frames):
+        """
+        This method is used to count frames which missed cache, but reused result of same frame in their batch
+
+        Method Input
+        =============
+        frames : Number of frames which reused result of another frame
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            self.hits += frames
+            self.misses -= frames
+            self.saved += frames * self.__cost__
+
+    def clear(self):
+        """
+        This method is used to drop all cached frames, such as when results of current model are no longer valid
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            self.__data__.clear()
+
+    def stats(self):
+        """
+        This method is used to report cache status
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of cached frames, hits, misses & estimated time saved in seconds
+        """
+        with self.__lock__:
+            return {'cache_entries': len(self.__data__), 'cache_hits': self.hits, 'cache_misses': self.misses, 'cache_saved': self.saved}
 
 # %%
 # Main Inference Class
 class Inference:
-    def __init__(self, OHE, laddr, sc_window=5):
+    def __init__(self, OHE, laddr, sc_window=5, max_sessions=1000, session_ttl=600, cache_size=0, cache_tolerance=0, backend='eager', cpu_profile=False, bf16=False, screener='', screener_threshold=0.9, screener_audit=0.0, early_exit=0.0):
         """
         This method is used to initialize Model inference
 
+        With screener model, inference is run as cascade, where screener classifies every frame & only frames
+        it is not confident about are escalated to main model. Screener is loaded with same backend as main model,
+        and is kept as is on model reload. With early exit, main model trained with early exit heads is run on eager
+        backend, so every frame stops at first head confident about it.
+
         Method Input
         =============
         OHE : Absolute address of one hot encoded labels file
-        laddr : Absolute address of the file to which model is subject to load
+        laddr : Absolute address of the file to which model is subject to load, weights or exported model of subject backend
         sc_window : Stream classification window size to observe
+        max_sessions : Maximum number of client sessions to track, 0 for unlimited ( default : 1000 )
+        session_ttl : Time in seconds after which idle client session is dropped, 0 to keep forever ( default : 600 )
+        cache_size : Maximum number of frames in perceptual hash result cache, 0 to disable cache ( default : 0 )
+        cache_tolerance : Maximum Hamming distance between frame hashes to reuse cached result ( default : 0 )
+        backend : Inference backend, out of 'eager', 'torchscript' & 'onnx' ( default : eager )
+        cpu_profile : Boolean variable to serve model on CPU with model & input batches in channels last memory format ( default : False )
+        bf16 : Boolean variable to run eager model under bfloat16 autocast in CPU profile, if CPU supports it ( default : False )
+        screener : Absolute address of MobileNetV3-Small screener model file trained on same labels, empty to disable cascade ( default : '' )
+        screener_threshold : Screener top label probability below which frame is escalated to main model ( default : 0.9 )
+        screener_audit : Fraction of frames accepted by screener to also run through main model to measure agreement ( default : 0.0 )
+        early_exit : Top label probability at which frame exits at early exit head of main model, 0 to run all stages ( default : 0.0 )
 
         Method Output
         ==============
         None
         """
+        st = time.perf_counter()
         torch.cuda.empty_cache()
         self.OHE_address = OHE
         self.model_address = laddr
         self.__sc_window_size__ = sc_window
-        self.__device__ = 'cuda:0' if torch.cuda.is_available() else 'cpu'
+        self.__device__ = 'cuda:0' if torch.cuda.is_available() and not cpu_profile else 'cpu'
+        self.cpu_profile = cpu_profile
+        self.bf16 = cpu_profile and bf16 and backend == 'eager' and cpu_supports_bf16()
+        if bf16 and not self.bf16:
+            print('>>>>> bfloat16 Autocast Requires CPU Profile, Eager Backend & CPU with bfloat16 Instructions, Running Model in float32')
+        self.early_exit = early_exit if backend == 'eager' else 0.0
+        if early_exit > 0 and self.early_exit == 0:
+            print('>>>>> Early Exit Requires Eager Backend, Running All Model Stages')
+        self.exit_stats = dict() if self.early_exit > 0 else None
+        self.__backend_kwargs__ = {'channels_last': cpu_profile, 'bf16': self.bf16, 'exit_threshold': self.early_exit, 'exit_stats': self.exit_stats}
         with open(self.OHE_address, 'rb') as file1:
             self.class_ohe = pickle.load(file1)
             self.__stream_list__ = list(self.class_ohe.keys())
         self.reverse_class_ohe = { values : keys for keys, values in self.class_ohe.items() }
         print('>>>>> Stream Classification Labels Loaded')
+        self.startup_phases = OrderedDict([('Labels Loading', time.perf_counter() - st)])
         self.mod_probs = torch.nn.Softmax(dim=1)
-        self.mod = Model(len(self.class_ohe))
-        self.mod.load_state_dict(torch.load(self.model_address, map_location = self.__device__))
-        self.mod.to(self.__device__)
-        self.mod.eval()
-        print('>>>>> Inference Model Loaded')
-        self.__sc_win_data__ = dict()
+        self.batch_transforms = Batch_Transforms(size = dummy_input_shape[2:], channels_last = cpu_profile)
+        self.__lock__ = threading.Lock()
+        self.backend = load_backend(backend, self.model_address, len(self.class_ohe), self.__device__, **self.__backend_kwargs__)
+        self.__device__ = self.backend.device
+        self.screener_address = screener
+        self.screener_threshold = screener_threshold
+        self.screener_audit = screener_audit
+        self.cascade_stats = None
+        if screener:
+            self.cascade_stats = {'screened': 0, 'escalated': 0, 'audited': 0, 'agreed': 0}
+            screener_backend = load_backend(backend, screener, len(self.class_ohe), self.__device__, architecture = 'mobilenet', **self.__backend_kwargs__)
+            self.backend = self.__cascade__(self.backend, screener_backend)
+            print('>>>>> Screener Model Loaded for Inference Cascade')
+        self.startup_phases.update(self.backend.phases)
+        st = time.perf_counter()
+        self.model_version = model_version(self.model_address)
+        self.startup_phases['Model Versioning'] = time.perf_counter() - st
+        print(f'>>>>> Inference Model Loaded with {self.backend.name} Backend')
+        self.__sc_win_data__ = Session_Store(self.__sc_window_size__, max_sessions = max_sessions, ttl = session_ttl)
+        self.cache = Frame_Cache(cache_size, len(self.class_ohe), cache_tolerance) if cache_size > 0 else None
     
     def __str__(self):
         """
@@ -67,14 +437,22 @@ class Inference:
         New Line
         """
         print(f'Acceleration Device: {self.__device__}')
+        print(f'Inference Backend: {self.backend.name}')
+        print(f'CPU Profile: {"Channels Last" + (", bfloat16 Autocast" if self.bf16 else ", float32") if self.cpu_profile else "Disabled"}')
+        print(f'Model Version: {self.model_version}')
         print(f'Stream Classification Averaging Window Size: {self.__sc_window_size__}')
+        print(f'Maximum Client Sessions: {self.__sc_win_data__.max_sessions}')
+        print(f'Idle Client Session TTL: {self.__sc_win_data__.ttl} s')
+        print(f'Early Exit: {"Confidence Threshold " + str(self.early_exit) if self.early_exit > 0 else "Disabled"}')
+        print(f'Screener Cascade: {self.screener_address + ", escalation threshold " + str(self.screener_threshold) + ", audit fraction " + str(self.screener_audit) if self.screener_address else "Disabled"}')
+        print(f'Frame Result Cache: {str(self.cache.size) + " frames, Hamming tolerance " + str(self.cache.tolerance) if self.cache is not None else "Disabled"}')
         print(f'Number of Stream Classificaion Labels: {len(self.__stream_list__)}')
         print(f'Stream Classificaion Labels: {self.__stream_list__}')
         return '\n'
     
     def __input_batch__(self, btch_dat):
         """
-        This method converts stacked Numpy PIL images to stacked Torch tensors
+        This method converts stacked Numpy PIL images to stacked Torch tensors in vectorized form
 
         Method Input
         =============
@@ -85,8 +463,7 @@ class Inference:
         ==============
         Torch tensor
         """
-        input_tensors = [inference_transforms(Image.fromarray(i)) for i in btch_dat]
-        return torch.stack(input_tensors)
+        return self.batch_transforms(btch_dat)
     
     def __sc_probs__(self, inf_probs, client_id = 'abcdefghij'):
         """
@@ -101,21 +478,123 @@ class Inference:
         ==============
         Averaged probabilities as Numpy array
         """
-        curr_sizer = inf_probs.shape[0] 
-        if len(self.__sc_win_data__[client_id]) == 0:
-            self.__sc_win_data__[client_id].append(inf_probs)
-        else:
-            prev_sizer = max([i.shape[0] for i in self.__sc_win_data__[client_id]])
-            if curr_sizer <= prev_sizer:
-                inf_probs = np.pad(inf_probs, ((0,prev_sizer-curr_sizer),(0,0)))
-            else:
-                self.__sc_win_data__[client_id] = [np.pad(i, ((0,curr_sizer-prev_sizer),(0,0)))for i in self.__sc_win_data__[client_id]]
-            self.__sc_win_data__[client_id].append(inf_probs)
-            if len(self.__sc_win_data__[client_id]) > self.__sc_window_size__:
-                del self.__sc_win_data__[client_id][0]
-        avg = sum(self.__sc_win_data__[client_id]) / len(self.__sc_win_data__[client_id])
-        return avg[:curr_sizer]
+        return self.__sc_win_data__(client_id, inf_probs)
     
+    def __cascade__(self, backend, screener_backend = None):
+        """
+        This method is used to put screener model ahead of main model backend, if cascade is enabled
+
+        Method Input
+        =============
+        backend : Backend object of main model
+        screener_backend : Backend object of screener model ( default : screener of current cascade )
+
+        Method Output
+        ==============
+        Cascade backend object if cascade is enabled, otherwise main model backend as is
+        """
+        if self.cascade_stats is None:
+            return backend
+        screener_backend = self.backend.screener if screener_backend is None else screener_backend
+        return Cascade_Backend(screener_backend, backend, self.screener_threshold, self.screener_audit, self.cascade_stats)
+
+    def __forward__(self, inp_tensor, backend = None):
+        """
+        This method is used to perform forward pass on preprocessed input batch
+
+        Method Input
+        =============
+        inp_tensor : Torch tensor returned by __input_batch__ with following shape:
+                            [ Batch x Channel x Height x Width ]
+        backend : Backend to perform forward pass with ( default : current backend )
+
+        Method Output
+        ==============
+        Raw Stream Classification probabilities as Numpy array
+        """
+        with torch.no_grad():
+            inf1 = (self.backend if backend is None else backend)(inp_tensor)
+            return self.mod_probs(inf1).cpu().numpy()
+
+    def warmup(self, batch_sizes = (1,), rounds = 2, backend = None):
+        """
+        This method is used to run forward passes on dummy batches, so first requests do not pay for graph optimization & allocation
+
+        Method Input
+        =============
+        batch_sizes : Batch sizes to warm up with ( default : ( 1, ) )
+        rounds : Number of forward passes per batch size ( default : 2 )
+        backend : Backend to warm up, not yet serving requests, so it is run without lock ( default : current backend )
+
+        Method Output
+        ==============
+        Time taken for warm up in seconds
+        """
+        st = time.perf_counter()
+        # Cascade & early exit backends are warmed up through all their stages, which dummy batches may never reach, without counting frames
+        stages = getattr(self.backend if backend is None else backend, 'stages', (backend,))
+        for batch_size in sorted(set(batch_sizes)):
+            for _ in range(rounds):
+                inp_tensor = torch.zeros((batch_size,) + tuple(dummy_input_shape[1:]))
+                for stage in stages:
+                    if backend is not None:
+                        self.__forward__(inp_tensor, stage)
+                        continue
+                    with self.__lock__:
+                        self.__forward__(inp_tensor, stage)
+        return time.perf_counter() - st
+
+    def reload(self, laddr = None, batch_sizes = (1,), rounds = 2):
+        """
+        This method is used to load & warm up new model version while current one keeps serving, then swap them
+
+        Swap is done under forward pass lock, so running forward pass finishes on old model, while client sessions
+        & their averaging windows are kept. Cached results of old model are dropped.
+
+        Method Input
+        =============
+        laddr : Absolute address of new model file for current backend ( default : current model file )
+        batch_sizes : Batch sizes to warm up new model with ( default : ( 1, ) )
+        rounds : Number of warm up forward passes per batch size, 0 to disable ( default : 2 )
+
+        Method Output
+        ==============
+        Tuple of model version & boolean variable, False if model file has not changed
+                            ( Model Version, Swapped )
+        """
+        laddr = self.model_address if laddr is None else laddr
+        version = model_version(laddr)
+        if version == self.model_version:
+            return version, False
+        backend = self.__cascade__(load_backend(self.backend.name, laddr, len(self.class_ohe), self.__device__, **self.__backend_kwargs__))
+        if rounds > 0:
+            self.warmup(batch_sizes, rounds, backend)
+        with self.__lock__:
+            self.backend, self.model_address, self.model_version = backend, laddr, version
+            if self.cache is not None:
+                self.cache.clear()
+        return version, True
+
+    def __postprocess__(self, inf_probs, client_id = 'abcdefghij'):
+        """
+        This method is used to apply client based averaging on raw probabilities & find respective labels
+
+        Method Input
+        =============
+        inf_probs : Raw Stream Classification probabilities of a single client as Numpy array
+        client_id : Client ID to identify connection & track inference ( default: abcdefghij )
+
+        Method Output
+        ==============
+        Stream Classification as tuple
+                            ( Stream Classification Inference List, Stream Classification Probability List, Class Index Array, Averaged Probabilities )
+        """
+        sc_out1p = self.__sc_probs__(inf_probs, client_id)
+        sc_argmax = np.argmax(sc_out1p, axis=1)
+        sc_out1 = [self.reverse_class_ohe[i] for i in sc_argmax]
+        sc_outp = sc_out1p[np.arange(len(sc_argmax)), sc_argmax]
+        return sc_out1, sc_outp, sc_argmax, sc_out1p
+
     def __call__(self, img_btch, client_id = 'abcdefghij'):
         """
         This method is used to perform Stream Classification inference
@@ -131,111 +610,2315 @@ class Inference:
         Stream Classification as tuple
                             ( Stream Classification Inference List, Stream Classification Probability List )
         """
-        if client_id not in list(self.__sc_win_data__.keys()):
-            self.__sc_win_data__[client_id] = list()
-        img_btch = self.__input_batch__(img_btch)
-        inf1 = self.mod(img_btch.to(self.__device__))
-        sc_out1p = self.__sc_probs__(self.mod_probs(inf1).cpu().detach().numpy(), client_id)
-        sc_argmax = np.argmax(sc_out1p, axis=1)
-        sc_out1 = [self.reverse_class_ohe[i] for i in sc_argmax]
-        sc_outp = [j[i] for i, j in zip(sc_argmax, sc_out1p)]
-        return sc_out1, np.array(sc_outp)
+        if self.cache is None:
+            with self.__lock__:
+                inf_probs = self.__forward__(self.__input_batch__(img_btch))
+            return self.__postprocess__(inf_probs, client_id)[:2]
+        keys, inf_probs, miss = self.cache.lookup(img_btch)
+        if miss.any():
+            st = time.perf_counter()
+            with self.__lock__:
+                inf_probs[miss] = self.__forward__(self.__input_batch__(img_btch[miss]))
+                self.cache.store(keys[miss], inf_probs[miss], time.perf_counter() - st)
+        return self.__postprocess__(inf_probs, client_id)[:2]
 
 # %%
-# Inference Server Class
-class sc_service(communication_pb2_grpc.sc_serviceServicer):
-    def __init__(self, *args, **kwargs):
+# Dropped Frame Exception Class
+class Frame_Dropped(Exception):
+    def __init__(self, code, reason, message = ''):
         """
-        This method is used to initialize server class for Model inference
+        This method is used to initialize exception for frames rejected by admission control
 
         Method Input
         =============
-        None
+        code : Name of GRPC status code to report
+                            Example : 'DEADLINE_EXCEEDED', 'RESOURCE_EXHAUSTED', 'ABORTED'
+        reason : Short reason used as metrics label
+                            Example : 'deadline', 'queue_full', 'superseded'
+        message : Human readable details ( default : empty )
 
         Method Output
         ==============
         None
         """
-        pass
+        super().__init__(code, reason, message)
+        self.code = code
+        self.reason = reason
+        self.message = message
+
+# %%
+# Trailing Metadata Key Carrying Reason of Frames Dropped by Server
+dropped_metadata_key = 'sc-rejected'
 
-    def __request_processor(self, inp_req):
+# %%
+# Cross Client Batching Class
+class Batcher:
+    def __init__(self, inf, max_batch = 32, max_wait = 10, max_queue = 256, session_queue = 4, metrics = None):
         """
-        This method is used to process input request to server
+        This method is used to initialize scheduler which merges concurrent requests into single forward pass
+
+        Requests are admitted into a bounded queue. Requests which can not be served before their deadline are
+        rejected, and when a client session already has session_queue requests waiting, its oldest one is dropped
+        in favour of the new one.
 
         Method Input
         =============
-        inp_req : Request object generated by GRPC
+        inf : Inference object subject to batched inference
+        max_batch : Maximum number of frames in single forward pass ( default : 32 )
+        max_wait : Maximum time in milliseconds to wait for batch collection ( default : 10 )
+        max_queue : Maximum number of requests waiting for forward pass, 0 for unbounded ( default : 256 )
+        session_queue : Maximum number of waiting requests per client session, 0 for unbounded ( default : 4 )
+        metrics : Metrics registry to record batch sizes, queue depth & stage latencies ( default : new registry )
 
         Method Output
         ==============
-        Input data for inference as Numpy array along with client id
-                            ( Input Numpy data, Client ID )
+        None
         """
-        ret_dat = np.frombuffer(inp_req.imgs, dtype=inp_req.data_type).reshape(inp_req.batch, inp_req.width, inp_req.height, inp_req.channel)
-        print(f'Input Batch Shape: {ret_dat.shape}')
-        return ret_dat, inp_req.client_id
-    
-    def __output_processor(self, inf_out):
+        self.inf = inf
+        self.max_batch = max_batch
+        self.max_wait = max_wait / 1000
+        self.max_queue = max_queue
+        self.session_queue = session_queue
+        self.metrics = Metrics() if metrics is None else metrics
+        self.__queue__ = queue.Queue()
+        self.__admit_lock__ = threading.Lock()
+        self.__sessions__ = dict()
+        self.__queued__ = 0
+        self.__latency__ = 0.0
+        self.labels = [self.inf.reverse_class_ohe[i] for i in range(len(self.inf.reverse_class_ohe))]
+        self.metrics.register('sc_batch_size', 'histogram', 'Number of frames per batched forward pass', buckets = batch_buckets)
+        self.metrics.register('sc_queue_depth', 'gauge', 'Number of requests waiting for batched forward pass', callback = lambda: self.__queued__)
+        self.__carry__ = None
+        self.__profile__ = None
+        self.__worker__ = threading.Thread(target = self.__run__, daemon = True)
+        self.__worker__.start()
+
+    def __str__(self):
         """
-        This method is used to process output data after inference
+        This method is __str__ implementation of subject class
 
         Method Input
         =============
-        inf_out : Stream Classification inference as tuple
-                            ( Stream Classification Inference List, Stream Classificiation Probability List )
+        None
 
         Method Output
         ==============
-        Output object after inference
+        New Line
         """
-        return communication_pb2.server_output(
-            stream_classification = np.array(inf_out[0]).tobytes(),
-            probabilities = np.array(inf_out[1]).tobytes(),
-            data_type = inf_out[1].dtype.name
-        )
+        print(f'Maximum Frames per Batched Forward Pass: {self.max_batch}')
+        print(f'Maximum Batch Collection Wait Time: {self.max_wait * 1000} ms')
+        print(f'Maximum Waiting Requests: {self.max_queue if self.max_queue > 0 else "Unbounded"}')
+        print(f'Maximum Waiting Requests per Client Session: {self.session_queue if self.session_queue > 0 else "Unbounded"}')
+        return '\n'
 
-    def inference(self, request, context):
+    def stats(self):
         """
-        This method is used to handle requests & inference outputs
+        This method is used to report client session status of subject inference object
 
         Method Input
         =============
-        request : GPRC generated input request object
-        context : GRPC generated API context
+        None
 
         Method Output
         ==============
+        Dictionary of active sessions, TTL expired sessions & LRU evicted sessions, along with frame result cache,
+        screener cascade & early exit counters if enabled
+        """
+        stats = self.inf.__sc_win_data__.stats()
+        if self.inf.cache is not None:
+            stats.update(self.inf.cache.stats())
+        if self.inf.cascade_stats is not None:
+            stats.update({f'cascade_{k}': v for k, v in self.inf.cascade_stats.items()})
+        if self.inf.exit_stats is not None:
+            stats.update({f'exit_{k}': v for k, v in self.inf.exit_stats.items()})
+        return stats
+
+    @property
+    def model_version(self):
+        """
+        This method is used to find version of model serving requests
+
+        Method Input
+        =============
         None
+
+        Method Output
+        ==============
+        Model version
         """
-        inp_data, client_id = self.__request_processor(request)
-        print(f'Client ID: {client_id}')
-        st = time.time()
-        out_data = inf_obj(inp_data, client_id)
-        ed = time.time() - st
-        print(f'Inference Time: {ed}')
-        print(f'Stream Classification: {out_data[0]}')
-        print('---------------------------------------------\n')
-        return self.__output_processor(out_data)
+        return self.inf.model_version
 
-# %%
-# Server Execution
-if __name__ == '__main__':
+    def reload(self, laddr = None, rounds = 2, batch_sizes = None):
+        """
+        This method is used to load new model version in background & swap it in between two batches
+
+        Method Input
+        =============
+        laddr : Absolute address of new model file ( default : current model file )
+        rounds : Number of warm up forward passes per batch size, 0 to disable ( default : 2 )
+        batch_sizes : Batch sizes to warm up new model with ( default : 1 & max_batch )
+
+        Method Output
+        ==============
+        Tuple of model version & boolean variable, False if model file has not changed
+                            ( Model Version, Swapped )
+        """
+        return self.inf.reload(laddr, (1, self.max_batch) if batch_sizes is None else batch_sizes, rounds)
+
+    def profile(self, batches = 20, path = 'sc_profile.json'):
+        """
+        This method is used to capture torch profiler trace of next batches, without stopping to serve requests
+
+        Method Input
+        =============
+        batches : Number of batches to capture ( default : 20 )
+        path : Absolute address of Chrome trace file to write once capture is done ( default : sc_profile.json )
+
+        Method Output
+        ==============
+        List of trace file addresses, empty if a capture is already running
+        """
+        with self.__admit_lock__:
+            if self.__profile__ is not None:
+                return list()
+            self.__profile__ = {'batches': batches, 'path': path, 'profiler': None}
+        return [path]
+
+    def __profile_step__(self, capture):
+        """
+        This method is used to count captured batch & write trace once all requested batches are captured
+
+        Method Input
+        =============
+        capture : Dictionary holding running capture
+                            { 'batches', 'path', 'profiler' }
+
+        Method Output
+        ==============
+        None
+        """
+        capture['batches'] -= 1
+        if capture['batches'] > 0:
+            return
+        capture['profiler'].stop()
+        with self.__admit_lock__:
+            self.__profile__ = None
+        # Trace is written in background, so batch after capture is not held up by it
+        threading.Thread(target = capture['profiler'].export_chrome_trace, args = (capture['path'],), daemon = True).start()
+        print(f'>>>>> Profiler Trace Captured, Writing to {capture["path"]}')
+
+    def submit(self, img_btch, client_id = 'abcdefghij', deadline = None):
+        """
+        This method is used to admit request into queue for next batched forward pass
+
+        Method Input
+        =============
+        img_btch : Stacked Numpy PIL images with following shape:
+                            [ Batch x Width x Height x Channel ]
+        client_id : Client ID to identify connection & track inference ( default: abcdefghij )
+        deadline : Monotonic time by which result is needed, None for no deadline ( default : None )
+
+        Method Output
+        ==============
+        Future resolving to Stream Classification as tuple, or failing with Frame_Dropped
+                            ( Stream Classification Inference List, Stream Classification Probability List, Class Index Array, Averaged Probabilities, Model Version, Stage Timings )
+        """
+        fut = futures.Future()
+        if deadline is not None and deadline - time.monotonic() < self.__latency__:
+            fut.set_exception(Frame_Dropped('DEADLINE_EXCEEDED', 'deadline', 'Frame can not be classified before its deadline'))
+            return fut
+        superseded = None
+        with self.__admit_lock__:
+            sess = self.__sessions__.setdefault(client_id, deque())
+            if self.session_queue > 0 and len(sess) >= self.session_queue:
+                superseded = sess.popleft()
+                self.__queued__ -= 1
+            elif self.max_queue > 0 and self.__queued__ >= self.max_queue:
+                if len(sess) == 0:
+                    del self.__sessions__[client_id]
+                fut.set_exception(Frame_Dropped('RESOURCE_EXHAUSTED', 'queue_full', 'Inference queue is full'))
+                return fut
+            sess.append(fut)
+            self.__queued__ += 1
+        if superseded is not None:
+            superseded.set_exception(Frame_Dropped('ABORTED', 'superseded', 'Frame was superseded by newer frame of same session'))
+        self.__queue__.put((img_btch, client_id, fut, deadline, time.perf_counter()))
+        return fut
+
+    def __take__(self, item):
+        """
+        This method is used to take queued request out of admission queue, if it is still worth serving
+
+        Method Input
+        =============
+        item : Queued request as tuple
+                            ( Stacked Numpy PIL Images, Client ID, Future, Deadline, Arrival Time )
+
+        Method Output
+        ==============
+        Boolean variable, False if request was superseded or can not meet its deadline anymore
+        """
+        with self.__admit_lock__:
+            sess = self.__sessions__.get(item[1])
+            if sess is None or item[2] not in sess:
+                return False
+            sess.remove(item[2])
+            self.__queued__ -= 1
+            if len(sess) == 0:
+                del self.__sessions__[item[1]]
+        if item[3] is not None and item[3] < time.monotonic() + self.__latency__:
+            item[2].set_exception(Frame_Dropped('DEADLINE_EXCEEDED', 'deadline', 'Frame expired while waiting for inference'))
+            return False
+        return True
+
+    def __collect__(self):
+        """
+        This method is used to collect queued requests until batch is full or wait time is over
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        List of queued requests as tuples
+                            ( Stacked Numpy PIL Images, Client ID, Future, Deadline, Arrival Time )
+        """
+        if self.__carry__ is None:
+            item = self.__queue__.get()
+            while not self.__take__(item):
+                item = self.__queue__.get()
+            pending = [item]
+        else:
+            pending, self.__carry__ = [self.__carry__], None
+        rows = pending[0][0].shape[0]
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch:
+            try:
+                item = self.__queue__.get(timeout = max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if not self.__take__(item):
+                continue
+            if rows + item[0].shape[0] > self.max_batch:
+                self.__carry__ = item
+                break
+            pending.append(item)
+            rows += item[0].shape[0]
+        return pending
+
+    def __batch_forward__(self, frames):
+        """
+        This method is used to perform single forward pass over frames of multiple requests
+
+        Method Input
+        =============
+        frames : List of stacked Numpy PIL images, which may differ in size & data type
+
+        Method Output
+        ==============
+        Tuple of list of raw Stream Classification probabilities as Numpy arrays, in order of frames, & stage timings in seconds
+                            ( Raw Probabilities List, { 'preprocess', 'forward' } )
+
+        With screener cascade, forward pass time is also split into 'screen' & 'escalate' stages, latter only
+        if any frame is escalated to main model.
+        """
+        groups = dict()
+        for idx, img_btch in enumerate(frames):
+            groups.setdefault(img_btch.shape[1:] + (img_btch.dtype.str,), list()).append(idx)
+        with self.metrics.timer('sc_stage_latency_seconds', stage = 'preprocess') as pre_tm, torch.profiler.record_function('preprocess'):
+            grp_batches = [frames[grp[0]] if len(grp) == 1 else np.concatenate([frames[idx] for idx in grp]) for grp in groups.values()]
+            if len(grp_batches) == 1:
+                inp_tensor = self.inf.__input_batch__(grp_batches[0])
+            else:
+                # Transformed batches share preallocated buffers, so each group is copied out before the next one
+                inp_tensor = torch.cat([self.inf.__input_batch__(i).clone() for i in grp_batches])
+        with self.metrics.timer('sc_stage_latency_seconds', stage = 'forward') as fwd_tm, torch.profiler.record_function('forward'):
+            inf_probs = self.inf.__forward__(inp_tensor)
+        self.metrics.observe('sc_batch_size', inp_tensor.shape[0])
+        cascade_stages = getattr(self.inf.backend, 'timings', dict())
+        for stage, elapsed in cascade_stages.items():
+            self.metrics.observe('sc_stage_latency_seconds', elapsed, stage = stage)
+        out_probs, start = [None] * len(frames), 0
+        for idx in [idx for grp in groups.values() for idx in grp]:
+            out_probs[idx] = inf_probs[start:start + frames[idx].shape[0]]
+            start += frames[idx].shape[0]
+        return out_probs, {'preprocess': pre_tm.elapsed, 'forward': fwd_tm.elapsed, **cascade_stages}
+
+    def __process__(self, pending):
+        """
+        This method is used to perform single forward pass over collected requests & resolve their futures
+
+        With frame result cache, only frames not found in cache are passed to the model. Every request is resolved
+        with its own queue wait & smoothing time, along with preprocessing & forward pass time of the whole batch.
+
+        Method Input
+        =============
+        pending : List of queued requests as tuples
+                            ( Stacked Numpy PIL Images, Client ID, Future, Deadline, Arrival Time )
+
+        Method Output
+        ==============
+        None
+        """
+        st = time.monotonic()
+        batch_start = time.perf_counter()
+        version = self.inf.model_version
+        cache = self.inf.cache
+        stages = {'preprocess': 0.0, 'forward': 0.0}
+        if cache is None:
+            out_probs, stages = self.__batch_forward__([item[0] for item in pending])
+        else:
+            with self.metrics.timer('sc_stage_latency_seconds', stage = 'cache') as cache_tm:
+                lookups = [cache.lookup(item[0]) for item in pending]
+            stages['cache'] = cache_tm.elapsed
+            # Same frame sent by several clients within a batch is passed to the model once
+            seen, missed, frames = set(), list(), list()
+            for idx, (keys, probs, miss) in enumerate(lookups):
+                first = np.zeros(len(keys), dtype = bool)
+                for i in np.flatnonzero(miss):
+                    if int(keys[i]) not in seen:
+                        seen.add(int(keys[i]))
+                        first[i] = True
+                if first.any():
+                    missed.append((idx, first))
+                    frames.append(pending[idx][0] if first.all() else pending[idx][0][first])
+            if len(missed) != 0:
+                fst = time.perf_counter()
+                miss_probs, forward_stages = self.__batch_forward__(frames)
+                stages.update(forward_stages)
+                per_frame = (time.perf_counter() - fst) / sum([i.shape[0] for i in frames])
+                found = dict()
+                for (idx, first), probs in zip(missed, miss_probs):
+                    keys = lookups[idx][0]
+                    found.update(zip(keys[first].tolist(), probs))
+                    cache.store(keys[first], probs, per_frame * probs.shape[0])
+                for keys, probs, miss in lookups:
+                    for i in np.flatnonzero(miss):
+                        probs[i] = found[int(keys[i])]
+                cache.share(sum([int(miss.sum()) for keys, probs, miss in lookups]) - len(found))
+            out_probs = [probs for keys, probs, miss in lookups]
+        # Averaging is applied in arrival order, so frames of a client stay in sequence across shape groups
+        for item, inf_probs in zip(pending, out_probs):
+            with self.metrics.timer('sc_stage_latency_seconds', stage = 'smoothing') as smooth_tm, torch.profiler.record_function('smoothing'):
+                out_data = self.inf.__postprocess__(inf_probs, item[1])
+            item[2].set_result(out_data + (version, dict(queue = batch_start - item[4], **stages, smoothing = smooth_tm.elapsed)))
+        # Moving average of batch service time, used to reject requests which would miss their deadline anyway
+        ed = time.monotonic() - st
+        self.__latency__ = ed if self.__latency__ == 0 else 0.8 * self.__latency__ + 0.2 * ed
+
+    def __run__(self):
+        """
+        This method is used to continuously serve queued requests
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        while True:
+            pending = self.__collect__()
+            capture = self.__profile__
+            if capture is not None and capture['profiler'] is None:
+                capture['profiler'] = torch.profiler.profile(activities = [torch.profiler.ProfilerActivity.CPU] + ([torch.profiler.ProfilerActivity.CUDA] if torch.cuda.is_available() else []), record_shapes = True)
+                capture['profiler'].start()
+            try:
+                # Model reload swaps backend under same lock, so it only takes effect between two batches
+                with self.inf.__lock__:
+                    self.__process__(pending)
+            except Exception as e:
+                for item in pending:
+                    if not item[2].done():
+                        item[2].set_exception(e)
+            if capture is not None:
+                self.__profile_step__(capture)
+
+    def __call__(self, img_btch, client_id = 'abcdefghij'):
+        """
+        This method is used to perform batched Stream Classification inference
+
+        Method Input
+        =============
+        img_btch : Stacked Numpy PIL images with following shape:
+                            [ Batch x Width x Height x Channel ]
+        client_id : Client ID to identify connection & track inference ( default: abcdefghij )
+
+        Method Output
+        ==============
+        Stream Classification as tuple
+                            ( Stream Classification Inference List, Stream Classification Probability List, Class Index Array, Averaged Probabilities, Model Version, Stage Timings )
+        """
+        return self.submit(img_btch, client_id).result()
+
+# %%
+# Model Replica Result Function
+def replica_result(fut):
+    """
+    This function is used to convert resolved future of replica into picklable result
+
+    Function Input
+    ===============
+    fut : Resolved future of batching scheduler
+
+    Function Output
+    ================
+    Stream Classification Output, Frame_Dropped exception or RuntimeError with error description
+    """
+    if fut.exception() is None:
+        return fut.result()
+    if isinstance(fut.exception(), Frame_Dropped):
+        return fut.exception()
+    return RuntimeError(str(fut.exception()))
+
+# %%
+# Model Replica Reload Function
+def replica_reload(idx, batcher, laddr, rounds, batch_sizes, results):
+    """
+    This function is used to reload model of replica in background & report outcome to front end process
+
+    Function Input
+    ===============
+    idx : Replica number
+    batcher : Batching scheduler of replica
+    laddr : Absolute address of new model file, None for current model file
+    rounds : Number of warm up forward passes per batch size
+    batch_sizes : Batch sizes to warm up new model with, None for 1 & max_batch
+    results : Multiprocessing queue to put outcome to
+                            ( Replica Number, None, ( Model Version, Swapped ) or RuntimeError, Session Stats, Drained Metrics )
+
+    Function Output
+    ================
+    None
+    """
+    try:
+        out_data = batcher.reload(laddr, rounds, batch_sizes)
+    except Exception as e:
+        out_data = RuntimeError(str(e))
+    results.put((idx, None, out_data, batcher.stats(), batcher.metrics.drain()))
+
+# %%
+# CPU Core Set Parsing Function
+def parse_cores(spec):
+    """
+    This function is used to parse CPU core set written as comma separated cores & inclusive ranges
+
+    Function Input
+    ===============
+    spec : CPU core set as string => 0-3,8,10-11
+
+    Function Output
+    ================
+    Sorted list of CPU core numbers
+    """
+    cores = set()
+    for part in spec.split(','):
+        start, _, end = part.strip().partition('-')
+        cores.update(range(int(start), int(end or start) + 1))
+    if len(cores) == 0:
+        raise ValueError(f'Empty CPU core set: {spec}')
+    return sorted(cores)
+
+# %%
+# CPU Core Sets Function
+def core_sets(count, sets = None):
+    """
+    This function is used to assign CPU core set to every model process
+
+    Function Input
+    ===============
+    count : Number of model processes
+    sets : List of CPU core sets, reused in turn when fewer than processes ( default : available cores divided equally )
+
+    Function Output
+    ================
+    List of CPU core sets, one per model process
+    """
+    if sets:
+        return [sets[i % len(sets)] for i in range(count)]
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+    size = max(1, len(cores) // count)
+    return [cores[(i * size) % len(cores):(i * size) % len(cores) + size] for i in range(count)]
+
+# %%
+# CPU Pinning Function
+def pin_cpu(cores = None, threads = 0, interop_threads = 0):
+    """
+    This function is used to pin calling process to CPU core set & size its torch thread pools, before model is loaded
+
+    Threads started later inherit core set of thread which starts them, so it should be called before server threads start.
+
+    Function Input
+    ===============
+    cores : List of CPU cores to pin process to, None to keep current affinity ( default : None )
+    threads : Number of torch intra operation threads, 0 for one per pinned core or torch default ( default : 0 )
+    interop_threads : Number of torch inter operation threads, 0 for torch default ( default : 0 )
+
+    Function Output
+    ================
+    None
+    """
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+        threads = threads if threads > 0 else len(cores)
+    if threads > 0:
+        torch.set_num_threads(threads)
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Inter operation thread pool can only be sized before its first parallel work
+            pass
+
+# %%
+# Model Replica Worker Function
+def replica_worker(idx, inf_kwargs, batch_kwargs, threads, slot_names, jobs, results, warmup = 2, warmup_sizes = None, cores = None, interop_threads = 0):
+    """
+    This function is used to serve batched inference jobs in a separate model replica process
+
+    Function Input
+    ===============
+    idx : Replica number
+    inf_kwargs : Keyword arguments to initialize Inference object
+    batch_kwargs : Keyword arguments to initialize Batcher object
+    threads : Number of torch threads for this replica
+    slot_names : List of shared memory slot names assigned to this replica
+    jobs : Multiprocessing queue to receive jobs & control requests from, ended by None
+                            Job : ( Job ID, Slot Number or None, Shape, Data Type, Client ID, Numpy Data or None, Deadline )
+                            Reload Request : ( None, 'reload', ( Model File Address or None, Warm Up Rounds, Warm Up Batch Sizes or None ) )
+                            Profile Request : ( None, 'profile', ( Number of Batches, Trace File Address ) )
+    results : Multiprocessing queue to put results to, along with batch metrics recorded since previous result
+                            ( Replica Number, Job ID, Stream Classification Output or Exception, Session Stats, Drained Metrics )
+    warmup : Number of warm up forward passes per batch size before serving ( default : 2 )
+    warmup_sizes : Batch sizes to warm up with ( default : 1 & max_batch )
+    cores : List of CPU cores to pin this replica to ( default : None )
+    interop_threads : Number of torch inter operation threads for this replica, 0 for torch default ( default : 0 )
+
+    Function Output
+    ================
+    None
+    """
+    try:
+        pin_cpu(cores, threads, interop_threads)
+        # Spawned replicas share resource tracker of front end process, which owns & unlinks the slots
+        slots = [shared_memory.SharedMemory(name = name) for name in slot_names]
+        inf = Inference(**inf_kwargs)
+        if warmup > 0:
+            inf.startup_phases['Warm Up'] = inf.warmup((1, batch_kwargs['max_batch']) if warmup_sizes is None else warmup_sizes, warmup)
+        # Batch metrics are handed to front end process with results, which serves them
+        batcher = Batcher(inf, metrics = Metrics_Relay(), **batch_kwargs)
+    except Exception as e:
+        # Front end process waits for every replica to start, so it is told why this one could not
+        results.put((idx, None, RuntimeError(f'{type(e).__name__}: {e}'), dict(), (list(), dict())))
+        raise
+    results.put((idx, None, ('ready', inf.model_version, inf.startup_phases), batcher.stats(), batcher.metrics.drain()))
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            job = jobs.get(timeout = 1)
+        except queue.Empty:
+            # Replica should not outlive front end process, if it got killed without closing pool
+            if parent is not None and not parent.is_alive():
+                break
+            continue
+        if job is None:
+            break
+        if job[0] is None and job[1] == 'reload':
+            threading.Thread(target = replica_reload, args = (idx, batcher, *job[2], results), daemon = True).start()
+            continue
+        if job[0] is None and job[1] == 'profile':
+            batcher.profile(*job[2])
+            continue
+        job_id, slot, shape, dtype, client_id, img_btch, deadline = job
+        if slot is not None:
+            img_btch = np.ndarray(shape, dtype = dtype, buffer = slots[slot].buf)
+        fut = batcher.submit(img_btch, client_id, deadline)
+        fut.add_done_callback(lambda f, job_id = job_id: results.put((idx, job_id, replica_result(f), batcher.stats(), batcher.metrics.drain())))
+
+# %%
+# Model Replica Pool Class
+class Replica_Pool:
+    def __init__(self, replicas, inf_kwargs, max_batch = 32, max_wait = 10, max_queue = 256, session_queue = 4, threads = 0, slots = 8, slot_size = 8, warmup = 2, warmup_sizes = None, metrics = None, cores = None, interop_threads = 0):
+        """
+        This method is used to start model replica processes & shared memory slots to hand frames to them
+
+        Every replica holds its own Inference copy & batching scheduler. Requests of a client ID are always sent to
+        same replica, so its averaging window stays consistent.
+
+        Method Input
+        =============
+        replicas : Number of model replica processes
+        inf_kwargs : Keyword arguments to initialize Inference object of every replica
+        max_batch : Maximum number of frames in single forward pass of a replica ( default : 32 )
+        max_wait : Maximum time in milliseconds to wait for batch collection ( default : 10 )
+        max_queue : Maximum number of requests waiting for forward pass per replica, 0 for unbounded ( default : 256 )
+        session_queue : Maximum number of waiting requests per client session, 0 for unbounded ( default : 4 )
+        threads : Number of torch threads per replica, 0 to divide CPU cores equally or one per pinned core ( default : 0 )
+        slots : Number of shared memory slots per replica ( default : 8 )
+        slot_size : Size of every shared memory slot in megabytes ( default : 8 )
+        warmup : Number of warm up forward passes per batch size in every replica ( default : 2 )
+        warmup_sizes : Batch sizes to warm up every replica with ( default : 1 & max_batch )
+        metrics : Metrics registry to record handoff counts & batch metrics of replicas ( default : new registry )
+        cores : List of CPU core sets to pin replicas to, one per replica ( default : None )
+        interop_threads : Number of torch inter operation threads per replica, 0 for torch default ( default : 0 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.replicas = replicas
+        self.cores = cores
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.threads = threads if threads > 0 or cores else max(1, (os.cpu_count() or 1) // replicas)
+        self.slot_size = slot_size * 1024 * 1024
+        self.metrics = Metrics() if metrics is None else metrics
+        self.metrics.register('sc_replica_jobs_total', 'counter', 'Number of requests handed to model replicas, by handoff type')
+        self.metrics.register('sc_batch_size', 'histogram', 'Number of frames per batched forward pass', buckets = batch_buckets)
+        self.metrics.register('sc_queue_depth', 'gauge', 'Number of requests waiting for batched forward pass', callback = lambda: sum([i.get('sc_queue_depth', 0) for i in self.__gauges__]))
+        with open(inf_kwargs['OHE'], 'rb') as file1:
+            reverse_class_ohe = { values : keys for keys, values in pickle.load(file1).items() }
+        self.labels = [reverse_class_ohe[i] for i in range(len(reverse_class_ohe))]
+        ctx = multiprocessing.get_context('spawn')
+        self.__results__ = ctx.Queue()
+        self.__jobs__, self.__slots__, self.__free__, self.__procs__ = list(), list(), list(), list()
+        self.__pending__ = dict()
+        self.__failed__ = set()
+        self.__closing__ = False
+        self.__stats__ = [{'sessions': 0, 'expired': 0, 'evicted': 0} for _ in range(replicas)]
+        self.__versions__ = [None] * replicas
+        self.__gauges__ = [dict() for _ in range(replicas)]
+        self.__reloads__ = list()
+        self.__ids__ = itertools.count()
+        self.__lock__ = threading.Lock()
+        self.__reload_lock__ = threading.Lock()
+        batch_kwargs = {'max_batch': max_batch, 'max_wait': max_wait, 'max_queue': max_queue, 'session_queue': session_queue}
+        for i in range(replicas):
+            self.__slots__.append([shared_memory.SharedMemory(create = True, size = self.slot_size) for _ in range(slots)])
+            self.__free__.append(queue.SimpleQueue())
+            for j in range(slots):
+                self.__free__[i].put(j)
+            self.__jobs__.append(ctx.Queue())
+            proc = ctx.Process(target = replica_worker, args = (i, inf_kwargs, batch_kwargs, self.threads, [k.name for k in self.__slots__[i]], self.__jobs__[i], self.__results__, warmup, warmup_sizes, None if cores is None else cores[i], interop_threads), daemon = True)
+            proc.start()
+            self.__procs__.append(proc)
+        atexit.register(self.close)
+        ready, st = 0, time.perf_counter()
+        # Replicas start in parallel, so slowest replica is reported for every phase
+        self.startup_phases = OrderedDict()
+        while ready < replicas:
+            try:
+                idx, job_id, out_data, stats, drained = self.__results__.get(timeout = 1)
+            except queue.Empty:
+                exited = [i for i, proc in enumerate(self.__procs__) if not proc.is_alive()]
+                if len(exited) != 0:
+                    self.__abort__()
+                    raise RuntimeError(f'Model replica {exited[0]} exited with code {self.__procs__[exited[0]].exitcode} during startup')
+                continue
+            if isinstance(out_data, Exception):
+                self.__abort__()
+                raise RuntimeError(f'Model replica {idx} failed to start: {out_data}')
+            self.__record__(idx, drained)
+            if isinstance(out_data, tuple) and out_data[0] == 'ready':
+                self.__stats__[idx], self.__versions__[idx] = stats, out_data[1]
+                for phase, elapsed in out_data[2].items():
+                    self.startup_phases[phase] = max(self.startup_phases.get(phase, 0), elapsed)
+                ready += 1
+        self.startup_phases['Replica Startup'] = time.perf_counter() - st
+        print(f'>>>>> {replicas} Model Replicas Started')
+        threading.Thread(target = self.__collect__, daemon = True).start()
+
+    def __str__(self):
+        """
+        This method is __str__ implementation of subject class
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        New Line
+        """
+        print(f'Number of Model Replicas: {self.replicas}')
+        print(f'Number of Torch Threads per Replica: {self.threads if self.threads > 0 else "One per Pinned Core"}')
+        if self.cores is not None:
+            print(f'Replica CPU Cores: {" | ".join(",".join(str(j) for j in i) for i in self.cores)}')
+        print(f'Model Version: {self.model_version}')
+        print(f'Shared Memory Slots per Replica: {len(self.__slots__[0])} x {self.slot_size // (1024 * 1024)} MB')
+        print(f'Maximum Frames per Batched Forward Pass: {self.max_batch}')
+        print(f'Maximum Batch Collection Wait Time: {self.max_wait} ms')
+        return '\n'
+
+    def stats(self):
+        """
+        This method is used to report client session status summed over all replicas
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of active sessions, TTL expired sessions & LRU evicted sessions, along with frame result cache,
+        screener cascade & early exit counters if enabled, summed over counters reported by any replica
+        """
+        with self.__lock__:
+            # Counters such as early exit heads may only be reported by replicas which produced them yet
+            keys = list(OrderedDict.fromkeys([k for i in self.__stats__ for k in i]))
+            return {k: sum([i.get(k, 0) for i in self.__stats__]) for k in keys}
+
+    @property
+    def model_version(self):
+        """
+        This method is used to find version of model serving requests
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Model version, comma separated versions if replicas run different versions after failed reload
+        """
+        with self.__lock__:
+            return ','.join(sorted(set(self.__versions__)))
+
+    def reload(self, laddr = None, rounds = 2, batch_sizes = None):
+        """
+        This method is used to reload model of every replica in background & wait till all of them swap it in
+
+        Concurrent reloads are run one after another, so replicas can not end up serving different model versions.
+
+        Method Input
+        =============
+        laddr : Absolute address of new model file ( default : current model file )
+        rounds : Number of warm up forward passes per batch size, 0 to disable ( default : 2 )
+        batch_sizes : Batch sizes to warm up new model with ( default : 1 & max_batch )
+
+        Method Output
+        ==============
+        Tuple of model version & boolean variable, False if model file has not changed
+                            ( Model Version, Swapped )
+        """
+        with self.__reload_lock__:
+            with self.__lock__:
+                self.__reloads__ = [futures.Future() for _ in range(self.replicas)]
+                reloads = self.__reloads__
+            for jobs in self.__jobs__:
+                jobs.put((None, 'reload', (laddr, rounds, batch_sizes)))
+            outs, errors = list(), list()
+            for fut in reloads:
+                try:
+                    outs.append(fut.result())
+                except Exception as e:
+                    errors.append(str(e))
+        if len(errors) != 0:
+            raise RuntimeError(f'{len(errors)} of {self.replicas} replicas failed to reload model: {errors[0]}')
+        return outs[0][0], any([i[1] for i in outs])
+
+    def profile(self, batches = 20, path = 'sc_profile.json'):
+        """
+        This method is used to capture torch profiler trace of next batches in every replica, each to its own file
+
+        Replicas which are already capturing ignore the request.
+
+        Method Input
+        =============
+        batches : Number of batches to capture per replica ( default : 20 )
+        path : Absolute address of Chrome trace file, suffixed with replica number ( default : sc_profile.json )
+
+        Method Output
+        ==============
+        List of trace file addresses
+        """
+        stem, ext = os.path.splitext(path)
+        paths = [f'{stem}_replica{idx}{ext}' for idx in range(self.replicas)]
+        for jobs, trace_path in zip(self.__jobs__, paths):
+            jobs.put((None, 'profile', (batches, trace_path)))
+        return paths
+
+    def __record__(self, idx, drained):
+        """
+        This method is used to record batch metrics drained from replica into metrics registry of front end process
+
+        Method Input
+        =============
+        idx : Replica number
+        drained : Batch observations & gauge values drained from metrics registry of replica
+                            ( [ ( Histogram Name, Value, Labels ) ], { Gauge Name : Value } )
+
+        Method Output
+        ==============
+        None
+        """
+        observations, gauges = drained
+        for name, value, labels in observations:
+            self.metrics.observe(name, value, **labels)
+        with self.__lock__:
+            self.__gauges__[idx] = gauges
+
+    def __check__(self):
+        """
+        This method is used to fail requests & model reload of replicas which exited while serving
+
+        Requests of exited replica are rejected with UNAVAILABLE, including those submitted to it afterwards.
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        if self.__closing__:
+            return
+        for idx, proc in enumerate(self.__procs__):
+            if proc.is_alive():
+                continue
+            error = Frame_Dropped('UNAVAILABLE', 'replica_failed', f'Model replica {idx} exited with code {proc.exitcode}')
+            with self.__lock__:
+                first = idx not in self.__failed__
+                self.__failed__.add(idx)
+                failed = [self.__pending__.pop(i)[0] for i in [k for k, v in self.__pending__.items() if v[2] == idx]]
+                reload = self.__reloads__[idx] if idx < len(self.__reloads__) else None
+            for fut in failed:
+                if not fut.done():
+                    fut.set_exception(error)
+            if reload is not None and not reload.done():
+                reload.set_exception(RuntimeError(error.message))
+            if first:
+                print(f'>>>>> {error.message}, Its Requests are Rejected')
+
+    def __abort__(self):
+        """
+        This method is used to stop all replica processes & release shared memory slots, after a replica failed to start
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        for proc in self.__procs__:
+            if proc.is_alive():
+                proc.terminate()
+        self.close()
+
+    def __collect__(self):
+        """
+        This method is used to resolve futures as results arrive from replicas & release their slots
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        while True:
+            try:
+                idx, job_id, out_data, stats, drained = self.__results__.get(timeout = 1)
+            except queue.Empty:
+                self.__check__()
+                continue
+            self.__record__(idx, drained)
+            with self.__lock__:
+                self.__stats__[idx] = stats
+                if job_id is None:
+                    # Outcome of model reload, which does not hold a slot
+                    if not isinstance(out_data, Exception):
+                        self.__versions__[idx] = out_data[0]
+                    fut, slot = self.__reloads__[idx], None
+                else:
+                    # Jobs of exited replica may already be failed
+                    fut, slot, _ = self.__pending__.pop(job_id, (None, None, None))
+            if slot is not None:
+                self.__free__[idx].put(slot)
+            if fut is None or fut.done():
+                continue
+            if isinstance(out_data, Exception):
+                fut.set_exception(out_data)
+            else:
+                fut.set_result(out_data)
+
+    def submit(self, img_btch, client_id = 'abcdefghij', deadline = None):
+        """
+        This method is used to hand request to replica of subject client through shared memory slot
+
+        Requests larger than a slot, or arriving when all slots of replica are in use, are pickled instead.
+
+        Method Input
+        =============
+        img_btch : Stacked Numpy PIL images with following shape:
+                            [ Batch x Width x Height x Channel ]
+        client_id : Client ID to identify connection & track inference ( default: abcdefghij )
+        deadline : Monotonic time by which result is needed, None for no deadline ( default : None )
+
+        Method Output
+        ==============
+        Future resolving to Stream Classification as tuple
+                            ( Stream Classification Inference List, Stream Classification Probability List, Class Index Array, Averaged Probabilities, Model Version, Stage Timings )
+        """
+        idx = zlib.crc32(client_id.encode('utf-8')) % self.replicas
+        fut, slot = futures.Future(), None
+        if idx in self.__failed__:
+            fut.set_exception(Frame_Dropped('UNAVAILABLE', 'replica_failed', f'Model replica {idx} exited with code {self.__procs__[idx].exitcode}'))
+            return fut
+        if img_btch.nbytes <= self.slot_size:
+            try:
+                slot = self.__free__[idx].get_nowait()
+            except queue.Empty:
+                pass
+        if slot is not None:
+            np.ndarray(img_btch.shape, dtype = img_btch.dtype, buffer = self.__slots__[idx][slot].buf)[...] = img_btch
+            job_data = None
+        else:
+            job_data = np.ascontiguousarray(img_btch)
+        self.metrics.inc('sc_replica_jobs_total', handoff = 'pickle' if slot is None else 'shared_memory')
+        job_id = next(self.__ids__)
+        with self.__lock__:
+            self.__pending__[job_id] = (fut, slot, idx)
+        self.__jobs__[idx].put((job_id, slot, img_btch.shape, img_btch.dtype.str, client_id, job_data, deadline))
+        return fut
+
+    def __call__(self, img_btch, client_id = 'abcdefghij'):
+        """
+        This method is used to perform Stream Classification inference on replica of subject client
+
+        Method Input
+        =============
+        img_btch : Stacked Numpy PIL images with following shape:
+                            [ Batch x Width x Height x Channel ]
+        client_id : Client ID to identify connection & track inference ( default: abcdefghij )
+
+        Method Output
+        ==============
+        Stream Classification as tuple
+                            ( Stream Classification Inference List, Stream Classification Probability List, Class Index Array, Averaged Probabilities, Model Version, Stage Timings )
+        """
+        return self.submit(img_btch, client_id).result()
+
+    def close(self):
+        """
+        This method is used to stop replica processes & release shared memory slots
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        self.__closing__ = True
+        for jobs in self.__jobs__:
+            jobs.put(None)
+        for proc in self.__procs__:
+            proc.join(timeout = 5)
+        for slots in self.__slots__:
+            for shm in slots:
+                shm.close()
+                shm.unlink()
+        self.__slots__ = list()
+
+# %%
+# Model Reloader Class
+class Model_Reloader:
+    def __init__(self, batch_obj, laddr, warmup = 2, warmup_sizes = None, watch = 0, metrics = None, reload_dirs = ()):
+        """
+        This method is used to initialize reloader which swaps in new model version without restarting server
+
+        Reload can be triggered by SIGHUP, reload_model RPC or change of model file. Only one reload runs at a time.
+        reload_model RPC may only load configured model file, or model files inside reload_dirs.
+
+        Method Input
+        =============
+        batch_obj : Batching scheduler or replica pool serving requests
+        laddr : Absolute address of model file being served
+        warmup : Number of warm up forward passes per batch size for new model, 0 to disable ( default : 2 )
+        warmup_sizes : Batch sizes to warm up new model with ( default : 1 & max_batch )
+        watch : Interval in seconds to poll model file for changes, 0 to disable ( default : 0 )
+        metrics : Metrics registry to record reload outcomes ( default : new registry )
+        reload_dirs : List of absolute addresses of directories reload_model RPC may load other model files from ( default : none )
+
+        Method Output
+        ==============
+        None
+        """
+        self.batch_obj = batch_obj
+        self.model_address = laddr
+        self.reload_dirs = [os.path.realpath(i) for i in reload_dirs]
+        self.__configured__ = os.path.abspath(laddr)
+        self.warmup = warmup
+        self.warmup_sizes = warmup_sizes
+        self.watch = watch
+        self.metrics = Metrics() if metrics is None else metrics
+        self.metrics.register('sc_model_reloads_total', 'counter', 'Number of model reload attempts, by status')
+        self.__lock__ = threading.Lock()
+        if self.watch > 0:
+            threading.Thread(target = self.__watch__, daemon = True).start()
+
+    def allows(self, laddr):
+        """
+        This method is used to find whether reload_model RPC may load model file
+
+        Method Input
+        =============
+        laddr : Absolute address of model file requested by client, empty for current model file
+
+        Method Output
+        ==============
+        Boolean variable, True if model file is configured model file or inside one of reload_dirs
+        """
+        if not laddr or os.path.abspath(laddr) == self.__configured__:
+            return True
+        # Symbolic links & relative components are resolved, so they can not lead out of allowed directories
+        path = os.path.realpath(laddr)
+        return any([os.path.commonpath([path, i]) == i for i in self.reload_dirs])
+
+    def __call__(self, laddr = None):
+        """
+        This method is used to reload model & wait till new version is serving
+
+        Method Input
+        =============
+        laddr : Absolute address of new model file ( default : current model file )
+
+        Method Output
+        ==============
+        Tuple of active model version, reload status & details
+                            ( Model Version, 'reloaded' / 'unchanged' / 'busy' / 'failed', Message )
+        """
+        laddr = self.model_address if not laddr else laddr
+        if not self.__lock__.acquire(blocking = False):
+            self.metrics.inc('sc_model_reloads_total', status = 'busy')
+            return self.batch_obj.model_version, 'busy', 'Another model reload is in progress'
+        try:
+            st = time.perf_counter()
+            version, swapped = self.batch_obj.reload(laddr, self.warmup, self.warmup_sizes)
+            self.model_address = laddr
+            status = 'reloaded' if swapped else 'unchanged'
+            message = f'Model {version} loaded from {laddr} in {time.perf_counter() - st:.2f} s' if swapped else f'Model {version} is already serving'
+        except Exception as e:
+            status, message = 'failed', f'Model reload from {laddr} failed, previous model keeps serving: {e}'
+        finally:
+            self.__lock__.release()
+        self.metrics.inc('sc_model_reloads_total', status = status)
+        print(f'>>>>> {message}')
+        return self.batch_obj.model_version, status, message
+
+    def trigger(self, laddr = None):
+        """
+        This method is used to start model reload in background, such as from signal handler
+
+        Method Input
+        =============
+        laddr : Absolute address of new model file ( default : current model file )
+
+        Method Output
+        ==============
+        None
+        """
+        threading.Thread(target = self, args = (laddr,), daemon = True).start()
+
+    def __file_state__(self):
+        """
+        This method is used to find state of model file to detect changes
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Tuple of model file address, inode, modification time & size, None if file is missing
+                            ( Model File Address, Inode, Modification Time, Size )
+        """
+        try:
+            stat = os.stat(self.model_address)
+        except OSError:
+            return None
+        return self.model_address, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def __watch__(self):
+        """
+        This method is used to continuously poll model file & reload model once changed file stops changing
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        loaded = previous = self.__file_state__()
+        while True:
+            time.sleep(self.watch)
+            current = self.__file_state__()
+            if current is not None and loaded is not None and current[0] != loaded[0]:
+                # Model file was switched by another reload, which has already loaded it
+                loaded = current
+            # File still being written changes between polls, so it is only loaded once it stays same for a poll
+            if current is not None and current == previous and current != loaded:
+                if self(current[0])[1] != 'busy':
+                    loaded = current
+            previous = current
+
+# %%
+# Profiler Trigger Class
+class Profile_Trigger:
+    def __init__(self, batch_obj, profile_dir = '/tmp', batches = 20):
+        """
+        This method is used to initialize trigger which captures torch profiler trace of next batches into profile directory
+
+        Method Input
+        =============
+        batch_obj : Batching scheduler or model replica pool subject to profiling
+        profile_dir : Absolute address of directory to write trace files to ( default : /tmp )
+        batches : Number of batches to capture when not given ( default : 20 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.batch_obj = batch_obj
+        self.profile_dir = profile_dir
+        self.batches = batches
+
+    def __call__(self, batches = 0):
+        """
+        This method is used to start capture of next batches, which is written once all of them are served
+
+        Method Input
+        =============
+        batches : Number of batches to capture, 0 for default ( default : 0 )
+
+        Method Output
+        ==============
+        Tuple of trace file addresses, capture status out of 'started' & 'busy' & details
+                            ( Trace File Addresses, Status, Message )
+        """
+        batches = self.batches if batches <= 0 else batches
+        path = os.path.join(self.profile_dir, f'sc_profile_{time.strftime("%Y%m%d_%H%M%S")}.json')
+        paths = self.batch_obj.profile(batches, path)
+        if len(paths) == 0:
+            return paths, 'busy', 'Profiler trace capture is already running'
+        print(f'>>>>> Capturing Profiler Trace of Next {batches} Batches')
+        return paths, 'started', f'Trace of next {batches} batches is written once they are served'
+
+# %%
+# Label Transition Tracker Class
+class Transition_Tracker:
+    def __init__(self, max_sessions = 1000, ttl = 600, queue_size = 256):
+        """
+        This method is used to initialize tracker of smoothed label segments per client session & their subscribers
+
+        Every row of a session batch is tracked as a separate stream, so multi channel clients get one segment per channel.
+        Only label changes are sent to subscribers, each through its own bounded queue, dropping its oldest event when full,
+        so slow subscriber never holds up inference or other subscribers.
+
+        Method Input
+        =============
+        max_sessions : Maximum number of client sessions to track, 0 for unlimited ( default : 1000 )
+        ttl : Time in seconds after which idle client session is dropped, 0 to keep forever ( default : 600 )
+        queue_size : Maximum number of undelivered events per subscriber ( default : 256 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.queue_size = queue_size
+        self.events = 0
+        self.dropped = 0
+        self.__sessions__ = OrderedDict()
+        self.__subscribers__ = dict()
+        self.__lock__ = threading.Lock()
+
+    def stats(self):
+        """
+        This method is used to report transition tracker status
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of tracked sessions, subscribers, transition events sent & events dropped for slow subscribers
+        """
+        with self.__lock__:
+            return {'sessions': len(self.__sessions__), 'subscribers': sum(len(i) for i in self.__subscribers__.values()), 'events': self.events, 'dropped': self.dropped}
+
+    def __event__(self, client_id, stream, segment, previous_label, segment_duration, snapshot = False):
+        """
+        This method is used to build transition event at start of subject segment
+
+        Method Input
+        =============
+        client_id : Client ID of subject session
+        stream : Row of session batch subject segment belongs to
+        segment : Segment as list
+                            [ Label, Start Timestamp, Start Frame Index, Confidence ]
+        previous_label : Label of segment which just ended, empty for first segment of stream
+        segment_duration : Duration in seconds of segment which just ended, or of subject segment so far for snapshot
+        snapshot : Boolean variable for event describing segment in progress at subscription time ( default : False )
+
+        Method Output
+        ==============
+        Transition event as dictionary
+                            { 'client_id', 'stream', 'label', 'previous_label', 'frame_index', 'timestamp', 'confidence', 'segment_duration', 'snapshot' }
+        """
+        return {'client_id': client_id, 'stream': stream, 'label': segment[0], 'previous_label': previous_label, 'frame_index': segment[2], 'timestamp': segment[1], 'confidence': segment[3], 'segment_duration': segment_duration, 'snapshot': snapshot}
+
+    def __deliver__(self, events_queue, event):
+        """
+        This method is used to put event into subscriber queue, dropping its oldest event if queue is full
+
+        Method Input
+        =============
+        events_queue : Subscriber queue, either thread queue or asyncio queue owned by calling event loop
+        event : Transition event as dictionary
+
+        Method Output
+        ==============
+        None
+        """
+        try:
+            events_queue.put_nowait(event)
+        except (queue.Full, asyncio.QueueFull):
+            events_queue.get_nowait()
+            events_queue.put_nowait(event)
+            self.dropped += 1
+
+    def __expire__(self, now):
+        """
+        This method is used to drop client sessions idle for more than TTL
+
+        Method Input
+        =============
+        now : Current monotonic time in seconds
+
+        Method Output
+        ==============
+        None
+        """
+        if self.ttl <= 0:
+            return
+        while len(self.__sessions__) != 0 and now - next(iter(self.__sessions__.values()))[2] > self.ttl:
+            self.__sessions__.popitem(last = False)
+
+    def subscribe(self, client_id, events_queue = None):
+        """
+        This method is used to register subscriber of client session, which first gets segments in progress as snapshot events
+
+        Method Input
+        =============
+        client_id : Client ID of session subject to follow, which does not need to be active yet
+        events_queue : Queue to receive transition events in, asyncio queue when called from event loop ( default : new thread queue )
+
+        Method Output
+        ==============
+        Subscriber queue of transition events as dictionaries
+        """
+        events_queue = queue.Queue(self.queue_size) if events_queue is None else events_queue
+        with self.__lock__:
+            self.__subscribers__.setdefault(client_id, list()).append(events_queue)
+            if client_id in self.__sessions__:
+                _, segments, _, timestamp = self.__sessions__[client_id]
+                for stream, segment in enumerate(segments):
+                    self.__deliver__(events_queue, self.__event__(client_id, stream, segment, '', timestamp - segment[1], True))
+        return events_queue
+
+    def unsubscribe(self, client_id, events_queue):
+        """
+        This method is used to remove subscriber of client session
+
+        Method Input
+        =============
+        client_id : Client ID of followed session
+        events_queue : Subscriber queue returned by subscribe
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            subscribers = self.__subscribers__.get(client_id, list())
+            if events_queue in subscribers:
+                subscribers.remove(events_queue)
+            if len(subscribers) == 0:
+                self.__subscribers__.pop(client_id, None)
+
+    def __call__(self, client_id, labels, confidences, timestamp = 0):
+        """
+        This method is used to update session segments with smoothed labels of next batch & send transitions to subscribers
+
+        Method Input
+        =============
+        client_id : Client ID of subject session
+        labels : Stream Classification Inference List, one label per stream
+        confidences : Stream Classification Probability List, smoothed probability of every label
+        timestamp : Unix time at which frames were captured, 0 for current time ( default : 0 )
+
+        Method Output
+        ==============
+        List of transition events as dictionaries
+        """
+        timestamp = time.time() if timestamp <= 0 else timestamp
+        events = list()
+        with self.__lock__:
+            now = time.monotonic()
+            self.__expire__(now)
+            if client_id in self.__sessions__:
+                self.__sessions__.move_to_end(client_id)
+            else:
+                self.__sessions__[client_id] = [0, list(), now, timestamp]
+                if self.max_sessions > 0 and len(self.__sessions__) > self.max_sessions:
+                    self.__sessions__.popitem(last = False)
+            session = self.__sessions__[client_id]
+            frame_index, segments = session[0], session[1]
+            session[0], session[2], session[3] = frame_index + 1, now, timestamp
+            for stream, label in enumerate(labels):
+                if stream < len(segments) and segments[stream][0] == label:
+                    continue
+                segment = [label, timestamp, frame_index, float(confidences[stream])]
+                if stream < len(segments):
+                    events.append(self.__event__(client_id, stream, segment, segments[stream][0], timestamp - segments[stream][1]))
+                    segments[stream] = segment
+                else:
+                    events.append(self.__event__(client_id, stream, segment, '', 0.0))
+                    segments.append(segment)
+            self.events += len(events)
+            for events_queue in self.__subscribers__.get(client_id, ()):
+                for event in events:
+                    self.__deliver__(events_queue, event)
+        return events
+
+# %%
+# Shared Memory Frame Reader Class
+class Shared_Frames:
+    def __init__(self, max_rings = 64, prefix = 'sc_ring_'):
+        """
+        This method is used to initialize reader of frames written by same host clients into their shared memory rings
+
+        Rings are attached once & kept mapped, least recently used ring is detached once more than max_rings are attached.
+        Frames are read in place, so ring slot of request must not be reused by client until its response arrives.
+
+        Method Input
+        =============
+        max_rings : Maximum number of client rings kept attached ( default : 64 )
+        prefix : Name prefix of client rings, so only rings of inference clients can be read ( default : sc_ring_ )
+
+        Method Output
+        ==============
+        None
+        """
+        self.max_rings = max_rings
+        self.prefix = prefix
+        self.__rings__ = OrderedDict()
+        self.__detached__ = list()
+        self.__lock__ = threading.Lock()
+
+    def stats(self):
+        """
+        This method is used to report number of attached client rings
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Dictionary of attached rings & detached rings waiting for their frames to be released
+        """
+        with self.__lock__:
+            return {'rings': len(self.__rings__), 'detached': len(self.__detached__)}
+
+    def attach(self, name):
+        """
+        This method is used to attach client ring, if not attached already
+
+        Method Input
+        =============
+        name : Shared memory name of client ring
+
+        Method Output
+        ==============
+        SharedMemory object of client ring
+        """
+        if not name.startswith(self.prefix) or '/' in name:
+            raise PermissionError(f'Shared memory {name} is not an inference client ring')
+        with self.__lock__:
+            if name in self.__rings__:
+                self.__rings__.move_to_end(name)
+                return self.__rings__[name]
+            try:
+                shm = shared_memory.SharedMemory(name = name, track = False)
+            except TypeError:
+                shm = shared_memory.SharedMemory(name = name)
+                # Ring belongs to client, so resource tracker of server should not unlink it on exit
+                resource_tracker.unregister(shm._name, 'shared_memory')
+            self.__rings__[name] = shm
+            if len(self.__rings__) > self.max_rings:
+                self.__detached__.append(self.__rings__.popitem(last = False)[1])
+            self.__detached__ = [i for i in self.__detached__ if not self.__close__(i)]
+            return shm
+
+    def __close__(self, shm):
+        """
+        This method is used to close detached ring, once no frames read from it are in use
+
+        Method Input
+        =============
+        shm : SharedMemory object of detached ring
+
+        Method Output
+        ==============
+        Boolean variable, False if ring is still in use
+        """
+        try:
+            shm.close()
+        except BufferError:
+            return False
+        return True
+
+    def __call__(self, name, offset, shape, dtype):
+        """
+        This method is used to read frames from client ring without copying them
+
+        Method Input
+        =============
+        name : Shared memory name of client ring
+        offset : Offset in bytes of frames in ring
+        shape : Shape of stacked frames
+        dtype : Data type of frames
+
+        Method Output
+        ==============
+        Read only Numpy array backed by client ring
+        """
+        shm = self.attach(name)
+        count = int(np.prod(shape))
+        if offset < 0 or offset + count * np.dtype(dtype).itemsize > shm.size:
+            raise ValueError(f'Frames at offset {offset} of shape {tuple(shape)} do not fit in ring {name}')
+        ret_dat = np.frombuffer(shm.buf, dtype = dtype, count = count, offset = offset).reshape(shape)
+        ret_dat.flags.writeable = False
+        return ret_dat
+
+# %%
+# Inference Server Class
+class sc_service(communication_pb2_grpc.sc_serviceServicer):
+    def __init__(self, decode_workers = 4, max_age = 0, metrics = None, logger = None, reloader = None, tracker = None, profiler = None, unix_socket = '', max_pixels = 4096 * 4096, max_subscribers = 0, *args, **kwargs):
+        """
+        This method is used to initialize server class for Model inference
+
+        Method Input
+        =============
+        decode_workers : Number of threads to decode compressed images of a batch in parallel ( default : 4 )
+        max_age : Maximum age in milliseconds of frame since its capture time, 0 to ignore capture time ( default : 0 )
+        metrics : Metrics registry to record requests & stage latencies ( default : new registry )
+        logger : Rate limited per request logger ( default : disabled logger )
+        reloader : Model reloader to serve reload_model RPC with, None to reject reload through RPC ( default : None )
+        tracker : Label transition tracker to feed inference results into & serve subscribe RPC with ( default : new tracker )
+        profiler : Profiler trigger to serve profile RPC with, None to reject profiling through RPC ( default : None )
+        unix_socket : Absolute address of Unix domain socket server also listens on, to accept shared memory frames over ( default : none )
+        max_pixels : Maximum number of pixels of compressed image to decode ( default : 4096 x 4096 )
+        max_subscribers : Maximum number of concurrent subscribers of thread pool server, each holding a GRPC worker, 0 for unbounded ( default : 0 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.unix_socket = unix_socket
+        self.max_pixels = max_pixels
+        self.max_subscribers = max_subscribers
+        self.__subscribers__ = 0
+        self.__subscriber_lock__ = threading.Lock()
+        # Same host clients compare it over TCP & Unix domain socket, to know both reach same server
+        self.instance_id = os.urandom(8).hex()
+        self.frames = Shared_Frames() if unix_socket else None
+        self.reloader = reloader
+        self.tracker = Transition_Tracker() if tracker is None else tracker
+        self.profiler = profiler
+        self.decode_pool = futures.ThreadPoolExecutor(max_workers = decode_workers)
+        self.max_age = max_age / 1000
+        self.metrics = Metrics() if metrics is None else metrics
+        self.logger = Request_Logger() if logger is None else logger
+        self.metrics.register('sc_requests_total', 'counter', 'Number of inference requests received')
+        self.metrics.register('sc_frames_total', 'counter', 'Number of frames received for inference')
+        self.metrics.register('sc_request_latency_seconds', 'histogram', 'Time from request arrival to response')
+        self.metrics.register('sc_stage_latency_seconds', 'histogram', 'Time spent in each inference stage')
+        self.metrics.register('sc_admitted_frames_total', 'counter', 'Number of frames admitted & classified')
+        self.metrics.register('sc_dropped_frames_total', 'counter', 'Number of frames dropped by admission control, by reason')
+        if self.frames is not None:
+            self.metrics.register('sc_shared_memory_frames_total', 'counter', 'Number of frames read from shared memory rings of same host clients')
+            self.metrics.register('sc_shared_memory_rings', 'gauge', 'Number of attached shared memory rings of same host clients', callback = lambda: self.frames.stats()['rings'])
+
+    def __local__(self, context):
+        """
+        This method is used to find whether request arrived over Unix domain socket, so it may carry shared memory frames
+
+        Method Input
+        =============
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Boolean variable, True if client is connected over Unix domain socket
+        """
+        return self.frames is not None and context is not None and context.peer().startswith('unix:')
+
+    def __deadline__(self, inp_req, context = None):
+        """
+        This method is used to find time by which request should be answered
+
+        Deadline is earliest of GRPC call deadline & client capture time plus max_age.
+
+        Method Input
+        =============
+        inp_req : Request object generated by GRPC
+        context : GRPC generated API context ( default : None )
+
+        Method Output
+        ==============
+        Monotonic deadline time, None if request has no deadline
+        """
+        now = time.monotonic()
+        deadlines = list()
+        remaining = None if context is None else context.time_remaining()
+        if remaining is not None:
+            deadlines.append(now + remaining)
+        if self.max_age > 0 and inp_req.capture_time > 0:
+            deadlines.append(now + inp_req.capture_time + self.max_age - time.time())
+        return min(deadlines) if len(deadlines) != 0 else None
+
+    def __dropped_output__(self, err, frames):
+        """
+        This method is used to record dropped frames & build stream output carrying reason of drop
+
+        Method Input
+        =============
+        err : Frame_Dropped exception raised by admission control
+        frames : Number of dropped frames
+
+        Method Output
+        ==============
+        Output object with GRPC status code name of drop
+        """
+        self.metrics.inc('sc_dropped_frames_total', frames, reason = err.reason)
+        return communication_pb2.server_output(status = err.code)
+
+    def __decode_image__(self, ret_dat, idx, enc_img):
+        """
+        This method is used to decode single compressed image into its row of batch
+
+        Method Input
+        =============
+        ret_dat : Preallocated Numpy array for decoded batch
+        idx : Row of batch subject to decode into
+        enc_img : JPEG / WebP encoded image bytes
+
+        Method Output
+        ==============
+        None
+        """
+        with Image.open(io.BytesIO(enc_img)) as img1:
+            if (img1.height, img1.width) != ret_dat.shape[1:3]:
+                raise ValueError(f'image {idx} is {img1.width}x{img1.height}, while first image of batch is {ret_dat.shape[2]}x{ret_dat.shape[1]}')
+            ret_dat[idx] = np.asarray(img1.convert('RGB'))
+
+    def __request_processor__(self, inp_req, local = False):
+        """
+        This method is used to process input request to server
+
+        Frames in shared memory ring of client are read in place, & raise Frame_Dropped if they can not be read,
+        so client can send them again in request. Frames which do not match their declared shape, & compressed
+        images which are corrupt, larger than maximum pixels or differ in size within batch raise Frame_Dropped
+        with INVALID_ARGUMENT.
+
+        Method Input
+        =============
+        inp_req : Request object generated by GRPC
+        local : Boolean variable, True if request arrived over Unix domain socket ( default : False )
+
+        Method Output
+        ==============
+        Input data for inference as Numpy array along with client id
+                            ( Input Numpy data, Client ID )
+        """
+        with self.metrics.timer('sc_stage_latency_seconds', stage = 'deserialize'):
+            if inp_req.shm_name != '':
+                if not local:
+                    raise Frame_Dropped('FAILED_PRECONDITION', 'shared_memory', 'Shared memory frames are only accepted over Unix domain socket of inference server')
+                try:
+                    ret_dat = self.frames(inp_req.shm_name, inp_req.shm_offset, (inp_req.batch, inp_req.width, inp_req.height, inp_req.channel), inp_req.data_type)
+                except (OSError, ValueError, TypeError) as e:
+                    raise Frame_Dropped('FAILED_PRECONDITION', 'shared_memory', f'Shared memory frames can not be read: {e}')
+                self.metrics.inc('sc_shared_memory_frames_total', ret_dat.shape[0])
+            elif inp_req.encoding in ('', 'raw'):
+                try:
+                    ret_dat = np.frombuffer(inp_req.imgs, dtype=inp_req.data_type).reshape(inp_req.batch, inp_req.width, inp_req.height, inp_req.channel)
+                except (ValueError, TypeError) as e:
+                    raise Frame_Dropped('INVALID_ARGUMENT', 'invalid_image', f'Frames do not match their declared shape: {e}')
+            else:
+                try:
+                    with Image.open(io.BytesIO(inp_req.encoded_imgs[0])) as img1:
+                        if img1.width * img1.height > self.max_pixels:
+                            raise ValueError(f'image is {img1.width}x{img1.height}, larger than {self.max_pixels} pixels')
+                        ret_dat = np.empty((len(inp_req.encoded_imgs), img1.height, img1.width, 3), dtype = np.uint8)
+                    list(self.decode_pool.map(self.__decode_image__, [ret_dat] * ret_dat.shape[0], range(ret_dat.shape[0]), inp_req.encoded_imgs))
+                # Pillow raises SyntaxError for some malformed image headers
+                except (OSError, ValueError, IndexError, SyntaxError, Image.DecompressionBombError) as e:
+                    raise Frame_Dropped('INVALID_ARGUMENT', 'invalid_image', f'Images can not be decoded: {e}')
+        self.metrics.inc('sc_frames_total', ret_dat.shape[0])
+        return ret_dat, inp_req.client_id
+    
+    def __output_processor__(self, inf_out, inp_req = None):
+        """
+        This method is used to process output data after inference
+
+        Compact output carries class indices instead of label strings, along with float16 probabilities,
+        optional top-k classes & optional full probability vectors, as requested by client.
+
+        Method Input
+        =============
+        inf_out : Stream Classification inference as tuple
+                            ( Stream Classification Inference List, Stream Classificiation Probability List, Class Index Array, Averaged Probabilities, Model Version, Stage Timings )
+        inp_req : Respective request object generated by GRPC ( default : None )
+
+        Method Output
+        ==============
+        Output object after inference
+        """
+        with self.metrics.timer('sc_stage_latency_seconds', stage = 'serialize'):
+            return self.__serialize_output__(inf_out, inp_req)
+
+    def __serialize_output__(self, inf_out, inp_req = None):
+        """
+        This method is used to build output object from inference results
+
+        Method Input
+        =============
+        inf_out : Stream Classification inference as tuple
+                            ( Stream Classification Inference List, Stream Classificiation Probability List, Class Index Array, Averaged Probabilities, Model Version, Stage Timings )
+        inp_req : Respective request object generated by GRPC ( default : None )
+
+        Method Output
+        ==============
+        Output object after inference
+        """
+        if inp_req is None or not inp_req.compact:
+            return communication_pb2.server_output(
+                stream_classification = np.array(inf_out[0]).tobytes(),
+                probabilities = np.array(inf_out[1]).tobytes(),
+                data_type = inf_out[1].dtype.name,
+                model_version = inf_out[4]
+            )
+        index_type = np.uint8 if inf_out[3].shape[1] <= 256 else np.uint16
+        out1 = communication_pb2.server_output(
+            class_indices = inf_out[2].astype(index_type).tobytes(),
+            index_type = np.dtype(index_type).name,
+            probabilities = inf_out[1].astype(np.float16).tobytes(),
+            data_type = 'float16',
+            model_version = inf_out[4]
+        )
+        if inp_req.top_k > 0:
+            top_k = min(inp_req.top_k, inf_out[3].shape[1])
+            top_indices = np.argsort(-inf_out[3], axis = 1)[:, :top_k]
+            out1.top_k = top_k
+            out1.top_indices = top_indices.astype(index_type).tobytes()
+            out1.top_probabilities = np.take_along_axis(inf_out[3], top_indices, axis = 1).astype(np.float16).tobytes()
+        if inp_req.full_probs:
+            out1.full_probabilities = inf_out[3].astype(np.float16).tobytes()
+        return out1
+
+    def __stage_timings__(self, decode, inf_out, serialize, total):
+        """
+        This method is used to format stage timings of request in milliseconds, to be returned to client
+
+        Method Input
+        =============
+        decode : Time in seconds taken to decode request
+        inf_out : Stream Classification inference as tuple, with stage timings of batching scheduler as last item
+        serialize : Time in seconds taken to build output object
+        total : Time in seconds from request arrival to response
+
+        Method Output
+        ==============
+        Stage timings as comma separated string
+                            Example : 'decode=0.412,queue=3.105,preprocess=1.870,forward=41.203,smoothing=0.051,serialize=0.090,total=47.001'
+        """
+        return ','.join([f'{stage}={elapsed * 1000:.3f}' for stage, elapsed in dict(decode = decode, **inf_out[5], serialize = serialize, total = total).items()])
+
+    def inference(self, request, context):
+        """
+        This method is used to handle requests & inference outputs
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        None
+        """
+        st = time.perf_counter()
+        self.metrics.inc('sc_requests_total', rpc = 'inference')
+        try:
+            inp_data, client_id = self.__request_processor__(request, self.__local__(context))
+            decode = time.perf_counter() - st
+            out_data = batch_obj.submit(inp_data, client_id, self.__deadline__(request, context)).result()
+        except Frame_Dropped as e:
+            self.__dropped_output__(e, request.batch)
+            # Reason tells clients that server dropped the frames, as DEADLINE_EXCEEDED is also raised by their own deadline
+            context.set_trailing_metadata(((dropped_metadata_key, e.reason),))
+            context.abort(getattr(grpc.StatusCode, e.code), e.message)
+        self.metrics.inc('sc_admitted_frames_total', inp_data.shape[0])
+        self.tracker(client_id, out_data[0], out_data[1], request.capture_time)
+        sst = time.perf_counter()
+        out1 = self.__output_processor__(out_data, request)
+        ed = time.perf_counter() - st
+        context.set_trailing_metadata((('sc-stage-timings', self.__stage_timings__(decode, out_data, time.perf_counter() - sst, ed)),))
+        self.metrics.observe('sc_request_latency_seconds', ed, rpc = 'inference')
+        self.logger({'Input Batch Shape': inp_data.shape, 'Client ID': client_id, 'Inference Time': ed, 'Stream Classification': out_data[0]})
+        return out1
+
+    def model_info(self, request, context):
+        """
+        This method is used to share model input requirements & labels with clients
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object with model input size, channel order, labels ordered by class index & model version, along with
+        Unix domain socket & instance ID of server, & whether shared memory ring named in request could be attached
+        """
+        out1 = communication_pb2.info_output(
+            height = dummy_input_shape[2],
+            width = dummy_input_shape[3],
+            channel = dummy_input_shape[1],
+            channel_order = 'RGB',
+            labels = batch_obj.labels,
+            model_version = batch_obj.model_version,
+            unix_socket = self.unix_socket,
+            instance_id = self.instance_id
+        )
+        if request.shm_name != '' and self.__local__(context):
+            try:
+                self.frames.attach(request.shm_name)
+                out1.shared_memory = True
+            except (OSError, ValueError):
+                pass
+        return out1
+
+    def reload_model(self, request, context):
+        """
+        This method is used to load new model version & swap it in, if server allows reload through RPC
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object with active model version, reload status & details
+        """
+        if self.reloader is None:
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'Model reload through RPC is disabled on this server')
+        if not self.reloader.allows(request.laddr):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, f'Model file {request.laddr} is neither configured model file nor inside allowed reload directories')
+        version, status, message = self.reloader(request.laddr)
+        return communication_pb2.reload_output(model_version = version, status = status, message = message)
+
+    def profile(self, request, context):
+        """
+        This method is used to capture torch profiler trace of next batches, if server allows profiling through RPC
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object with trace file addresses on server, capture status & details
+        """
+        if self.profiler is None:
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'Profiling through RPC is disabled on this server')
+        paths, status, message = self.profiler(request.batches)
+        return communication_pb2.profile_output(paths = paths, status = status, message = message)
+
+    def subscribe(self, request, context):
+        """
+        This method is used to stream label transitions of client session to subscriber, until subscriber cancels
+
+        Segments in progress are sent first as snapshot events, followed by one event every time smoothed label
+        of a stream changes. Subscription can be opened before client session starts. Every subscriber holds a
+        GRPC worker till it cancels, so subscribers beyond max_subscribers are rejected with RESOURCE_EXHAUSTED,
+        to keep workers free for inference requests.
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Iterator over transition event objects
+        """
+        with self.__subscriber_lock__:
+            admitted = self.max_subscribers <= 0 or self.__subscribers__ < self.max_subscribers
+            self.__subscribers__ += int(admitted)
+        if not admitted:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f'Server already serves {self.max_subscribers} subscribers, which is its limit')
+        events_queue = self.tracker.subscribe(request.client_id)
+        try:
+            while context.is_active():
+                try:
+                    event = events_queue.get(timeout = 1)
+                except queue.Empty:
+                    continue
+                yield communication_pb2.transition_event(**event)
+        finally:
+            self.tracker.unsubscribe(request.client_id, events_queue)
+            with self.__subscriber_lock__:
+                self.__subscribers__ -= 1
+
+    def __stream_reader__(self, request_iterator, session, pending, context = None):
+        """
+        This method is used to read stream requests & queue them for batched inference
+
+        Method Input
+        =============
+        request_iterator : GRPC generated iterator over input request objects
+        session : Dictionary holding Client ID of subject stream
+        pending : Queue to put tuples of request arrival time, inference future, request, frame count & decode time, ended by None
+                            ( Request Time, Future or Exception, Request, Number of Frames, Decode Time )
+        context : GRPC generated API context ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        try:
+            local = self.__local__(context)
+            for request in request_iterator:
+                st = time.perf_counter()
+                self.metrics.inc('sc_requests_total', rpc = 'inference_stream')
+                try:
+                    inp_data, client_id = self.__request_processor__(request, local)
+                except Frame_Dropped as e:
+                    fut = futures.Future()
+                    fut.set_exception(e)
+                    pending.put((st, fut, request, request.batch, 0.0))
+                    continue
+                if session['client_id'] is None:
+                    session['client_id'] = client_id
+                decode = time.perf_counter() - st
+                pending.put((st, batch_obj.submit(inp_data, session['client_id'], self.__deadline__(request, context)), request, inp_data.shape[0], decode))
+        except Exception as e:
+            pending.put((time.perf_counter(), e, None, 0, 0.0))
+        pending.put(None)
+
+    def inference_stream(self, request_iterator, context):
+        """
+        This method is used to handle long lived stream of requests from a single client session
+
+        Client ID is fixed when stream is opened, either from 'client_id' invocation metadata or from first request.
+        Requests are queued for batched inference as soon as they arrive, so multiple frames can be in flight,
+        while responses are returned in the same order as requests. Stage timings are only added to responses
+        of requests asking for them, as trailing metadata is sent once per stream. Frames dropped by admission
+        control are answered with an output carrying only status code name of the drop.
+
+        Method Input
+        =============
+        request_iterator : GRPC generated iterator over input request objects
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Iterator over output objects after inference
+        """
+        session = {'client_id': dict(context.invocation_metadata()).get('client_id')}
+        pending = queue.Queue()
+        threading.Thread(target = self.__stream_reader__, args = (request_iterator, session, pending, context), daemon = True).start()
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            if isinstance(item[1], Exception):
+                raise item[1]
+            try:
+                out_data = item[1].result()
+            except Frame_Dropped as e:
+                yield self.__dropped_output__(e, item[3])
+                continue
+            self.metrics.inc('sc_admitted_frames_total', item[3])
+            self.tracker(session['client_id'], out_data[0], out_data[1], item[2].capture_time)
+            sst = time.perf_counter()
+            out1 = self.__output_processor__(out_data, item[2])
+            ed = time.perf_counter() - item[0]
+            if item[2].stage_timings:
+                out1.stage_timings = self.__stage_timings__(item[4], out_data, time.perf_counter() - sst, ed)
+            self.metrics.observe('sc_request_latency_seconds', ed, rpc = 'inference_stream')
+            self.logger({'Batch Size': out_data[3].shape[0], 'Client ID': session['client_id'], 'Inference Time': ed, 'Stream Classification': out_data[0]})
+            yield out1
+
+# %%
+# Asyncio Inference Server Class
+class sc_service_aio(sc_service):
+    """
+    Asyncio variant of inference server class, used with grpc.aio server
+
+    Network I/O & (de)serialization run on event loop, while model execution is left to batching scheduler thread,
+    so idle streams only cost a coroutine instead of a GRPC worker thread.
+    """
+    async def __deserialize__(self, request, local = False):
+        """
+        This method is used to process input request without blocking event loop on image decoding
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        local : Boolean variable, True if request arrived over Unix domain socket ( default : False )
+
+        Method Output
+        ==============
+        Input data for inference as Numpy array along with client id
+                            ( Input Numpy data, Client ID )
+        """
+        if request.encoding in ('', 'raw'):
+            return self.__request_processor__(request, local)
+        return await asyncio.get_running_loop().run_in_executor(None, self.__request_processor__, request, local)
+
+    async def inference(self, request, context):
+        """
+        This method is used to handle requests & inference outputs
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object after inference
+        """
+        st = time.perf_counter()
+        self.metrics.inc('sc_requests_total', rpc = 'inference')
+        try:
+            inp_data, client_id = await self.__deserialize__(request, self.__local__(context))
+            decode = time.perf_counter() - st
+            out_data = await asyncio.wrap_future(batch_obj.submit(inp_data, client_id, self.__deadline__(request, context)))
+        except Frame_Dropped as e:
+            self.__dropped_output__(e, request.batch)
+            await context.abort(getattr(grpc.StatusCode, e.code), e.message, trailing_metadata = ((dropped_metadata_key, e.reason),))
+        self.metrics.inc('sc_admitted_frames_total', inp_data.shape[0])
+        self.tracker(client_id, out_data[0], out_data[1], request.capture_time)
+        sst = time.perf_counter()
+        out1 = self.__output_processor__(out_data, request)
+        ed = time.perf_counter() - st
+        context.set_trailing_metadata((('sc-stage-timings', self.__stage_timings__(decode, out_data, time.perf_counter() - sst, ed)),))
+        self.metrics.observe('sc_request_latency_seconds', ed, rpc = 'inference')
+        self.logger({'Input Batch Shape': inp_data.shape, 'Client ID': client_id, 'Inference Time': ed, 'Stream Classification': out_data[0]})
+        return out1
+
+    async def model_info(self, request, context):
+        """
+        This method is used to share model input requirements & labels with clients
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object with model input size, channel order, labels ordered by class index & model version, along with
+        Unix domain socket & instance ID of server, & whether shared memory ring named in request could be attached
+        """
+        return super().model_info(request, context)
+
+    async def reload_model(self, request, context):
+        """
+        This method is used to load new model version & swap it in without blocking event loop
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object with active model version, reload status & details
+        """
+        if self.reloader is None:
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, 'Model reload through RPC is disabled on this server')
+        if not self.reloader.allows(request.laddr):
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, f'Model file {request.laddr} is neither configured model file nor inside allowed reload directories')
+        version, status, message = await asyncio.get_running_loop().run_in_executor(None, self.reloader, request.laddr)
+        return communication_pb2.reload_output(model_version = version, status = status, message = message)
+
+    async def profile(self, request, context):
+        """
+        This method is used to capture torch profiler trace of next batches, if server allows profiling through RPC
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Output object with trace file addresses on server, capture status & details
+        """
+        if self.profiler is None:
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, 'Profiling through RPC is disabled on this server')
+        paths, status, message = self.profiler(request.batches)
+        return communication_pb2.profile_output(paths = paths, status = status, message = message)
+
+    async def subscribe(self, request, context):
+        """
+        This method is used to stream label transitions of client session to subscriber, until subscriber cancels
+
+        Idle subscriber only costs a coroutine & its queue, so a single server can be followed by many lightweight consumers.
+
+        Method Input
+        =============
+        request : GPRC generated input request object
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Async iterator over transition event objects
+        """
+        events_queue = self.tracker.subscribe(request.client_id, asyncio.Queue(self.tracker.queue_size))
+        try:
+            while True:
+                yield communication_pb2.transition_event(**(await events_queue.get()))
+        finally:
+            self.tracker.unsubscribe(request.client_id, events_queue)
+
+    async def __stream_reader__(self, request_iterator, session, pending, context = None):
+        """
+        This method is used to read stream requests & queue them for batched inference
+
+        Method Input
+        =============
+        request_iterator : GRPC generated async iterator over input request objects
+        session : Dictionary holding Client ID of subject stream
+        pending : Asyncio queue to put tuples of request arrival time, inference future, request, frame count & decode time, ended by None
+                            ( Request Time, Future or Exception, Request, Number of Frames, Decode Time )
+        context : GRPC generated API context ( default : None )
+
+        Method Output
+        ==============
+        None
+        """
+        try:
+            local = self.__local__(context)
+            async for request in request_iterator:
+                st = time.perf_counter()
+                self.metrics.inc('sc_requests_total', rpc = 'inference_stream')
+                try:
+                    inp_data, client_id = await self.__deserialize__(request, local)
+                except Frame_Dropped as e:
+                    fut = futures.Future()
+                    fut.set_exception(e)
+                    await pending.put((st, asyncio.wrap_future(fut), request, request.batch, 0.0))
+                    continue
+                if session['client_id'] is None:
+                    session['client_id'] = client_id
+                decode = time.perf_counter() - st
+                await pending.put((st, asyncio.wrap_future(batch_obj.submit(inp_data, session['client_id'], self.__deadline__(request, context))), request, inp_data.shape[0], decode))
+        except Exception as e:
+            await pending.put((time.perf_counter(), e, None, 0, 0.0))
+        await pending.put(None)
+
+    async def inference_stream(self, request_iterator, context):
+        """
+        This method is used to handle long lived stream of requests from a single client session
+
+        Method Input
+        =============
+        request_iterator : GRPC generated async iterator over input request objects
+        context : GRPC generated API context
+
+        Method Output
+        ==============
+        Async iterator over output objects after inference
+        """
+        session = {'client_id': dict(context.invocation_metadata()).get('client_id')}
+        pending = asyncio.Queue()
+        reader = asyncio.ensure_future(self.__stream_reader__(request_iterator, session, pending, context))
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+                if isinstance(item[1], Exception):
+                    raise item[1]
+                try:
+                    out_data = await item[1]
+                except Frame_Dropped as e:
+                    yield self.__dropped_output__(e, item[3])
+                    continue
+                self.metrics.inc('sc_admitted_frames_total', item[3])
+                self.tracker(session['client_id'], out_data[0], out_data[1], item[2].capture_time)
+                sst = time.perf_counter()
+                out1 = self.__output_processor__(out_data, item[2])
+                ed = time.perf_counter() - item[0]
+                if item[2].stage_timings:
+                    out1.stage_timings = self.__stage_timings__(item[4], out_data, time.perf_counter() - sst, ed)
+                self.metrics.observe('sc_request_latency_seconds', ed, rpc = 'inference_stream')
+                self.logger({'Batch Size': out_data[3].shape[0], 'Client ID': session['client_id'], 'Inference Time': ed, 'Stream Classification': out_data[0]})
+                yield out1
+        finally:
+            reader.cancel()
+
+# %%
+# Asyncio Server Execution
+async def serve_aio(servicer, server_ip, server_opts, unix_socket = ''):
+    """
+    This function is used to run grpc.aio server until termination
+
+    Function Input
+    ===============
+    servicer : Asyncio inference server object
+    server_ip : IP address to start GRPC server
+    server_opts : List of GRPC server options
+    unix_socket : Absolute address of Unix domain socket to also listen on ( default : none )
+
+    Function Output
+    ================
+    None
+    """
+    server = grpc.aio.server(options = server_opts)
+    communication_pb2_grpc.add_sc_serviceServicer_to_server(servicer, server)
+    server.add_insecure_port(server_ip)
+    if unix_socket:
+        server.add_insecure_port('unix:' + unix_socket)
+    await server.start()
+    await server.wait_for_termination()
+
+# %%
+# Server Execution
+if __name__ == '__main__':
     parser = argparse.ArgumentParser(description = 'Stream Classification Inference Server.')
     parser.add_argument('-scw', '--sc_window', type = int, help = 'Stream Classification Averaging Window Size', default = 5)
     parser.add_argument('-ip', '--server_ip', type = str, help = 'IP Address to Start GRPC Server', default = '[::]:1234')
+    parser.add_argument('-uds', '--unix_socket', type = str, help = 'Absolute Address of Unix Domain Socket to Also Listen on, for Same Host Clients to Send Frames Through Shared Memory ( Empty to Disable )', default = '')
     parser.add_argument('-msg', '--msg_len', type = int, help = 'Message Length Subject to Communication by GRPC', default = 1000000000)
-    parser.add_argument('-wrk', '--workers', type = int, help = 'Number of Workers to Used by GRPC', default = 1)
+    parser.add_argument('-wrk', '--workers', type = int, help = 'Number of Workers Used by GRPC', default = 16)
+    parser.add_argument('-mbs', '--max_batch', type = int, help = 'Maximum Number of Frames per Batched Forward Pass', default = 32)
+    parser.add_argument('-mbw', '--max_wait', type = float, help = 'Maximum Time in Milliseconds to Wait for Batch Collection', default = 10)
+    parser.add_argument('-mq', '--max_queue', type = int, help = 'Maximum Number of Requests Waiting for Forward Pass ( 0 for Unbounded )', default = 256)
+    parser.add_argument('-sq', '--session_queue', type = int, help = 'Maximum Number of Waiting Requests per Client Session, Oldest is Dropped ( 0 for Unbounded )', default = 4)
+    parser.add_argument('-mxa', '--max_age', type = float, help = 'Maximum Age in Milliseconds of Frame Since Client Capture Time ( 0 to Ignore Capture Time )', default = 0)
+    parser.add_argument('-dwk', '--decode_workers', type = int, help = 'Number of Threads to Decode Compressed Images in Parallel', default = 4)
+    parser.add_argument('-mpx', '--max_pixels', type = int, help = 'Maximum Number of Pixels of Compressed Image to Decode, Larger Images are Rejected', default = 4096 * 4096)
+    parser.add_argument('-mss', '--max_sessions', type = int, help = 'Maximum Number of Client Sessions to Track ( 0 for Unlimited )', default = 1000)
+    parser.add_argument('-sttl', '--session_ttl', type = float, help = 'Time in Seconds After Which Idle Client Session is Dropped ( 0 to Keep Forever )', default = 600)
+    parser.add_argument('-cs', '--cache_size', type = int, help = 'Maximum Number of Frames in Perceptual Hash Result Cache ( 0 to Disable )', default = 0)
+    parser.add_argument('-cht', '--cache_tolerance', type = int, help = 'Maximum Hamming Distance Between Frame Hashes to Reuse Cached Result ( 0 - 64 )', default = 0)
+    parser.add_argument('-mip', '--metrics_ip', type = str, help = 'IP Address to Serve Prometheus Metrics => IP:Port ( Empty to Disable )', default = '127.0.0.1:9464')
+    parser.add_argument('-lg', '--log_requests', action = 'store_true', help = 'Print Per Request Logs')
+    parser.add_argument('-lgr', '--log_rate', type = float, help = 'Maximum Number of Per Request Logs to Print per Second', default = 1)
+    parser.add_argument('-aio', '--aio', action = 'store_true', help = 'Run Asyncio GRPC Server Instead of Thread Pool Server')
+    parser.add_argument('-ith', '--inference_threads', type = int, help = 'Number of Torch Threads for Model Execution ( 0 for Torch Default )', default = 0)
+    parser.add_argument('-iop', '--interop_threads', type = int, help = 'Number of Torch Inter Operation Threads per Model Process ( 0 for Torch Default, 1 in CPU Profile )', default = 0)
+    parser.add_argument('-cpp', '--cpu_profile', action = 'store_true', help = 'Serve Model on CPU in Channels Last Memory Format with Model Processes Pinned to CPU Core Sets')
+    parser.add_argument('-bf16', '--bfloat16', action = 'store_true', help = 'Run Eager Model Under bfloat16 Autocast in CPU Profile, on CPUs with bfloat16 Instructions')
+    parser.add_argument('-cst', '--core_sets', nargs = '+', type = parse_cores, help = 'CPU Core Sets to Pin Model Processes to, One per Replica => 0-3 4-7 ( Default in CPU Profile : Available Cores Divided Equally Between Replicas )', default = None)
+    parser.add_argument('-rep', '--replicas', type = int, help = 'Number of Model Replica Processes ( 0 to Run Model in Server Process )', default = 0)
+    parser.add_argument('-rth', '--replica_threads', type = int, help = 'Number of Torch Threads per Model Replica ( 0 to Divide CPU Cores Equally )', default = 0)
+    parser.add_argument('-rsl', '--replica_slots', type = int, help = 'Number of Shared Memory Frame Slots per Model Replica', default = 8)
+    parser.add_argument('-rss', '--slot_size', type = int, help = 'Size of Every Shared Memory Frame Slot in Megabytes', default = 8)
     parser.add_argument('-ohe', '--OHE', type = str, help = 'Absolute Address of One Hot Encoded Labels File', default = '/resources/OHE.labels')
     parser.add_argument('-la', '--laddr', type = str, help = 'Absolute Address of Model File', default = '/resources/convnext.model')
+    parser.add_argument('-bk', '--backend', type = str, choices = backend_names, help = 'Inference Backend to Run Model With', default = 'eager')
+    parser.add_argument('-scr', '--screener', type = str, help = 'Absolute Address of MobileNetV3-Small Screener Model File to Run Ahead of Model as Cascade ( Empty to Disable )', default = '')
+    parser.add_argument('-sth', '--screener_threshold', type = float, help = 'Screener Confidence Below Which Frame is Escalated to Model ( 0 - 1 )', default = 0.9)
+    parser.add_argument('-sau', '--screener_audit', type = float, help = 'Fraction of Frames Accepted by Screener to Also Run Through Model to Measure Agreement ( 0 - 1 )', default = 0.0)
+    parser.add_argument('-eet', '--early_exit', type = float, help = 'Confidence at Which Frame Exits at First Early Exit Head of Model Trained With Them, Eager Backend Only ( 0 to Run All Stages )', default = 0)
+    parser.add_argument('-wu', '--warmup', type = int, help = 'Number of Warm Up Forward Passes per Batch Size at Startup & Model Reload ( 0 to Disable )', default = 2)
+    parser.add_argument('-wbs', '--warmup_batch_sizes', nargs = '+', type = int, help = 'Batch Sizes to Warm Up Model With ( Default : 1 & Maximum Batch Size )', default = None)
+    parser.add_argument('-wm', '--watch_model', type = float, help = 'Interval in Seconds to Poll Model File & Reload Model Once It Changes ( 0 to Disable )', default = 0)
+    parser.add_argument('-rrpc', '--reload_rpc', action = 'store_true', help = 'Allow Clients to Reload Model Through reload_model RPC')
+    parser.add_argument('-rdir', '--reload_dirs', nargs = '*', type = str, help = 'Absolute Addresses of Directories reload_model RPC May Load Other Model Files From ( Only Configured Model File if Not Given )', default = [])
+    parser.add_argument('-pb', '--profile_batches', type = int, help = 'Number of Batches to Capture in Profiler Trace', default = 20)
+    parser.add_argument('-pd', '--profile_dir', type = str, help = 'Absolute Address of Directory to Write Profiler Traces To', default = '/tmp')
+    parser.add_argument('-prpc', '--profile_rpc', action = 'store_true', help = 'Allow Clients to Capture Profiler Trace Through profile RPC')
+    parser.add_argument('-sbq', '--subscriber_queue', type = int, help = 'Maximum Number of Undelivered Transition Events per Subscriber, Oldest is Dropped', default = 256)
+    parser.add_argument('-msb', '--max_subscribers', type = int, help = 'Maximum Number of Concurrent Subscribers of Thread Pool Server, Each Holding a GRPC Worker ( 0 for Unbounded )', default = 4)
     args = vars(parser.parse_args())
+    imports_time = time.perf_counter() - process_start
     print("""
     ==========================================
     | Stream Classification Inference Server |
     ==========================================
     """)
-    inf_obj = Inference(OHE = args['OHE'], laddr = args['laddr'], sc_window = args['sc_window'])
+    # Single model process is only pinned to given core set, as it also runs GRPC & decoding threads
+    cores = core_sets(max(args['replicas'], 1), args['core_sets']) if args['core_sets'] or (args['cpu_profile'] and args['replicas'] > 0) else None
+    interop_threads = args['interop_threads'] if args['interop_threads'] > 0 else int(args['cpu_profile'])
+    inf_kwargs = {'OHE': args['OHE'], 'laddr': args['laddr'], 'sc_window': args['sc_window'], 'max_sessions': args['max_sessions'], 'session_ttl': args['session_ttl'], 'cache_size': args['cache_size'], 'cache_tolerance': args['cache_tolerance'], 'backend': args['backend'], 'cpu_profile': args['cpu_profile'], 'bf16': args['bfloat16'], 'screener': args['screener'], 'screener_threshold': args['screener_threshold'], 'screener_audit': args['screener_audit'], 'early_exit': args['early_exit']}
+    metrics_obj = Metrics()
+    if args['replicas'] > 0:
+        inf_obj = None
+        batch_obj = Replica_Pool(args['replicas'], inf_kwargs, max_batch = args['max_batch'], max_wait = args['max_wait'], max_queue = args['max_queue'], session_queue = args['session_queue'], threads = args['replica_threads'], slots = args['replica_slots'], slot_size = args['slot_size'], warmup = args['warmup'], warmup_sizes = args['warmup_batch_sizes'], metrics = metrics_obj, cores = cores, interop_threads = interop_threads)
+        startup_phases = batch_obj.startup_phases
+    else:
+        pin_cpu(None if cores is None else cores[0], args['inference_threads'], interop_threads)
+        inf_obj = Inference(**inf_kwargs)
+        if args['warmup'] > 0:
+            inf_obj.startup_phases['Warm Up'] = inf_obj.warmup((1, args['max_batch']) if args['warmup_batch_sizes'] is None else args['warmup_batch_sizes'], args['warmup'])
+            print(f'>>>>> Inference Model Warmed Up in {inf_obj.startup_phases["Warm Up"]:.2f} s')
+        startup_phases = inf_obj.startup_phases
+        batch_obj = Batcher(inf_obj, max_batch = args['max_batch'], max_wait = args['max_wait'], max_queue = args['max_queue'], session_queue = args['session_queue'], metrics = metrics_obj)
+    metrics_obj.register('sc_active_sessions', 'gauge', 'Number of tracked client sessions', callback = lambda: batch_obj.stats()['sessions'])
+    metrics_obj.register('sc_expired_sessions_total', 'counter', 'Number of client sessions dropped after idle TTL', callback = lambda: batch_obj.stats()['expired'])
+    metrics_obj.register('sc_evicted_sessions_total', 'counter', 'Number of least recently used client sessions evicted', callback = lambda: batch_obj.stats()['evicted'])
+    if args['cache_size'] > 0:
+        metrics_obj.register('sc_cache_entries', 'gauge', 'Number of frames in perceptual hash result cache', callback = lambda: batch_obj.stats()['cache_entries'])
+        metrics_obj.register('sc_cache_hits_total', 'counter', 'Number of frames served from result cache', callback = lambda: batch_obj.stats()['cache_hits'])
+        metrics_obj.register('sc_cache_misses_total', 'counter', 'Number of frames not found in result cache', callback = lambda: batch_obj.stats()['cache_misses'])
+        metrics_obj.register('sc_cache_hit_ratio', 'gauge', 'Fraction of frames served from result cache', callback = lambda: (lambda i: i['cache_hits'] / max(i['cache_hits'] + i['cache_misses'], 1))(batch_obj.stats()))
+        metrics_obj.register('sc_cache_saved_seconds_total', 'counter', 'Estimated model time saved by result cache hits', callback = lambda: batch_obj.stats()['cache_saved'])
+    if args['screener']:
+        metrics_obj.register('sc_cascade_frames_total', 'counter', 'Number of frames classified by screener model', callback = lambda: batch_obj.stats()['cascade_screened'])
+        metrics_obj.register('sc_cascade_escalated_total', 'counter', 'Number of frames escalated from screener to model', callback = lambda: batch_obj.stats()['cascade_escalated'])
+        metrics_obj.register('sc_cascade_escalation_ratio', 'gauge', 'Fraction of frames escalated from screener to model', callback = lambda: (lambda i: i['cascade_escalated'] / max(i['cascade_screened'], 1))(batch_obj.stats()))
+        metrics_obj.register('sc_cascade_audited_total', 'counter', 'Number of frames accepted by screener & audited against model', callback = lambda: batch_obj.stats()['cascade_audited'])
+        metrics_obj.register('sc_cascade_agreement_ratio', 'gauge', 'Fraction of audited frames on which screener & model agree on top label', callback = lambda: (lambda i: i['cascade_agreed'] / max(i['cascade_audited'], 1))(batch_obj.stats()))
+    if args['early_exit'] > 0 and args['backend'] == 'eager':
+        metrics_obj.register('sc_early_exit_frames_total', 'counter', 'Number of frames classified by every exit head of model, by exit', callback = lambda: {k[5:]: v for k, v in batch_obj.stats().items() if k.startswith('exit_')}, callback_label = 'exit')
+        metrics_obj.register('sc_early_exit_ratio', 'gauge', 'Fraction of frames which exit before final head of model', callback = lambda: (lambda i: (sum(i.values()) - i.get('final', 0)) / max(sum(i.values()), 1))({k[5:]: v for k, v in batch_obj.stats().items() if k.startswith('exit_')}))
+    tracker = Transition_Tracker(max_sessions = args['max_sessions'], ttl = args['session_ttl'], queue_size = args['subscriber_queue'])
+    metrics_obj.register('sc_transition_subscribers', 'gauge', 'Number of subscribers following label transitions', callback = lambda: tracker.stats()['subscribers'])
+    metrics_obj.register('sc_transition_events_total', 'counter', 'Number of label transition events', callback = lambda: tracker.stats()['events'])
+    metrics_obj.register('sc_transition_events_dropped_total', 'counter', 'Number of transition events dropped for slow subscribers', callback = lambda: tracker.stats()['dropped'])
+    profiler = Profile_Trigger(batch_obj, args['profile_dir'], args['profile_batches'])
+    reloader = Model_Reloader(batch_obj, args['laddr'], warmup = args['warmup'], warmup_sizes = args['warmup_batch_sizes'], watch = args['watch_model'], metrics = metrics_obj, reload_dirs = args['reload_dirs'])
     print('---------------------------------------------')
-    print(inf_obj)
+    if inf_obj is not None:
+        print(inf_obj)
+    print(batch_obj)
     print("""
     =============================================
     |       Inference GRPC Server Details       |
@@ -243,9 +2926,32 @@ if __name__ == '__main__':
     """)
     duip, msle, wrke = args['server_ip'], args['msg_len'], args['workers']
     print(f'Inference IP: {duip}')
+    print(f'Unix Domain Socket: {args["unix_socket"] + ", Shared Memory Frames Accepted" if args["unix_socket"] else "Disabled"}')
     print(f'Server IP: {socket.gethostbyname(socket.gethostname())}')
     print(f'Maximum Server Communication Message Length: {msle}')
-    print(f'Number of Worker Allowed for GRPC Server: {wrke}')
+    print(f'GRPC Server Mode: {"Asyncio" if args["aio"] else "Thread Pool"}')
+    if not args['aio']:
+        print(f'Number of Worker Allowed for GRPC Server: {wrke}')
+    if inf_obj is not None:
+        print(f'Number of Torch Threads for Model Execution: {torch.get_num_threads()}')
+        print(f'Number of Torch Inter Operation Threads: {torch.get_num_interop_threads()}')
+        if cores is not None:
+            print(f'Server CPU Cores: {",".join(str(i) for i in cores[0])}')
+    print(f'Number of Image Decoding Threads: {args["decode_workers"]}')
+    print(f'Maximum Pixels of Decoded Image: {args["max_pixels"]}')
+    print(f'Maximum Frame Age: {str(args["max_age"]) + " ms" if args["max_age"] > 0 else "Disabled"}')
+    print(f'Transition Subscriber Queue: {args["subscriber_queue"]} events')
+    print(f'Maximum Concurrent Subscribers: {"Unbounded" if args["aio"] or args["max_subscribers"] <= 0 else args["max_subscribers"]}')
+    print(f'Model Reload Triggers: {", ".join(["SIGHUP"] + (["reload_model RPC"] if args["reload_rpc"] else []) + (["File Change, Polled Every " + str(args["watch_model"]) + " s"] if args["watch_model"] > 0 else []))}')
+    if args['reload_rpc']:
+        print(f'Model Files Loadable Through reload_model RPC: {", ".join([args["laddr"]] + [i + "/*" for i in args["reload_dirs"]])}')
+    print(f'Profiler Trace Triggers: {", ".join(["SIGUSR1"] + (["profile RPC"] if args["profile_rpc"] else []))}, {args["profile_batches"]} Batches to {args["profile_dir"]}')
+    print(f'Prometheus Metrics Endpoint: {"http://" + args["metrics_ip"] + "/metrics" if args["metrics_ip"] else "Disabled"}')
+    print(f'Per Request Logs: {"Enabled, at most " + str(args["log_rate"]) + " per second" if args["log_requests"] else "Disabled"}')
+    print('Startup Time:')
+    for phase, elapsed in [('Library Imports', imports_time)] + list(startup_phases.items()):
+        print(f'    {phase}: {elapsed:.3f} s')
+    print(f'    Total: {time.perf_counter() - process_start:.3f} s')
     print('---------------------------------------------')
     print('>>>>> Press Ctrl+C To Shutdown Server')
     print("""
@@ -254,12 +2960,25 @@ if __name__ == '__main__':
     =============================================
     """)
     server_opts = [('grpc.max_send_message_length', args['msg_len']), ('grpc.max_receive_message_length', args['msg_len'])]
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers = args['workers']), options = server_opts)
-    communication_pb2_grpc.add_sc_serviceServicer_to_server(sc_service(), server)
-    server.add_insecure_port(args['server_ip'])
-    server.start()
+    servicer_cls = sc_service_aio if args['aio'] else sc_service
+    servicer = servicer_cls(decode_workers = args['decode_workers'], max_age = args['max_age'], metrics = metrics_obj, logger = Request_Logger(args['log_requests'], args['log_rate']), reloader = reloader if args['reload_rpc'] else None, tracker = tracker, profiler = profiler if args['profile_rpc'] else None, unix_socket = args['unix_socket'], max_pixels = args['max_pixels'], max_subscribers = 0 if args['aio'] else args['max_subscribers'])
+    if args['metrics_ip']:
+        serve_metrics(metrics_obj, args['metrics_ip'])
+    # Container stop should shut down like Ctrl+C, so replica processes & shared memory are released
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    signal.signal(signal.SIGHUP, lambda signum, frame: reloader.trigger())
+    signal.signal(signal.SIGUSR1, lambda signum, frame: profiler())
     try:
-        server.wait_for_termination()
+        if args['aio']:
+            asyncio.run(serve_aio(servicer, args['server_ip'], server_opts, args['unix_socket']))
+        else:
+            server = grpc.server(futures.ThreadPoolExecutor(max_workers = args['workers']), options = server_opts)
+            communication_pb2_grpc.add_sc_serviceServicer_to_server(servicer, server)
+            server.add_insecure_port(args['server_ip'])
+            if args['unix_socket']:
+                server.add_insecure_port('unix:' + args['unix_socket'])
+            server.start()
+            server.wait_for_termination()
     except KeyboardInterrupt:
         print("""
     =============================================
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION SERVER METRICS
+====================================
+
+The following program is used to record inference server metrics & serve them in Prometheus text format
+"""
+
+# %%
+# Importing Libraries
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# %%
+# Default Histogram Buckets
+latency_buckets = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+batch_buckets = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# %%
+# Histogram Class
+class Histogram:
+    def __init__(self, buckets = latency_buckets):
+        """
+        This method is used to initialize cumulative histogram
+
+        Method Input
+        =============
+        buckets : Sorted upper bounds of histogram buckets ( default : latency buckets in seconds )
+
+        Method Output
+        ==============
+        None
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        This method is used to record single observation
+
+        Method Input
+        =============
+        value : Observed value
+
+        Method Output
+        ==============
+        None
+        """
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        self.counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+# %%
+# Stage Timer Class
+class Timer:
+    def __init__(self, metrics, name, **labels):
+        """
+        This method is used to initialize context manager which records elapsed time into histogram
+
+        Method Input
+        =============
+        metrics : Metrics registry to record into
+        name : Histogram name
+        labels : Histogram labels as keyword arguments
+
+        Method Output
+        ==============
+        None
+        """
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        """
+        This method is used to start timer
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Timer object
+        """
+        self.__start__ = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        """
+        This method is used to stop timer & record elapsed time
+
+        Method Input
+        =============
+        Context manager exit arguments
+
+        Method Output
+        ==============
+        None
+        """
+        self.elapsed = time.perf_counter() - self.__start__
+        self.metrics.observe(self.name, self.elapsed, **self.labels)
+
+# %%
+# Metrics Registry Class
+class Metrics:
+    def __init__(self):
+        """
+        This method is used to initialize thread safe in-process metrics registry
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        self.__lock__ = threading.Lock()
+        self.__help__ = dict()
+        self.__types__ = dict()
+        self.__values__ = dict()
+        self.__callbacks__ = dict()
+
+    def __key__(self, name, labels):
+        """
+        This method is used to build series key from metric name & labels
+
+        Method Input
+        =============
+        name : Metric name
+        labels : Dictionary of metric labels
+
+        Method Output
+        ==============
+        Series key as tuple
+        """
+        return (name, tuple(sorted(labels.items())))
+
+    def register(self, name, kind, help = '', buckets = latency_buckets, callback = None, callback_label = ''):
+        """
+        This method is used to declare metric before it is recorded
+
+        Method Input
+        =============
+        name : Metric name
+        kind : Metric type, out of 'counter', 'gauge' & 'histogram'
+        help : Metric description ( default : empty )
+        buckets : Histogram bucket upper bounds ( default : latency buckets in seconds )
+        callback : Function returning counter or gauge value, evaluated on every scrape ( default : None )
+        callback_label : Label name, if callback returns dictionary of label values to respective values ( default : empty )
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            self.__help__[name] = help
+            self.__types__[name] = (kind, buckets)
+            if callback is not None:
+                self.__callbacks__[name] = (callback, callback_label)
+
+    def inc(self, name, value = 1, **labels):
+        """
+        This method is used to increment counter
+
+        Method Input
+        =============
+        name : Counter name
+        value : Value to increment counter by ( default : 1 )
+        labels : Counter labels as keyword arguments
+
+        Method Output
+        ==============
+        None
+        """
+        key = self.__key__(name, labels)
+        with self.__lock__:
+            self.__values__[key] = self.__values__.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        This method is used to set gauge value
+
+        Method Input
+        =============
+        name : Gauge name
+        value : Current gauge value
+        labels : Gauge labels as keyword arguments
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            self.__values__[self.__key__(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        """
+        This method is used to record observation into histogram
+
+        Method Input
+        =============
+        name : Histogram name
+        value : Observed value
+        labels : Histogram labels as keyword arguments
+
+        Method Output
+        ==============
+        None
+        """
+        key = self.__key__(name, labels)
+        with self.__lock__:
+            if key not in self.__values__:
+                self.__values__[key] = Histogram(self.__types__.get(name, ('histogram', latency_buckets))[1])
+            self.__values__[key].observe(value)
+
+    def timer(self, name, **labels):
+        """
+        This method is used to time a block of code into histogram
+
+        Method Input
+        =============
+        name : Histogram name
+        labels : Histogram labels as keyword arguments
+
+        Method Output
+        ==============
+        Timer context manager
+        """
+        return Timer(self, name, **labels)
+
+    def get(self, name, **labels):
+        """
+        This method is used to read current value of counter or gauge
+
+        Method Input
+        =============
+        name : Metric name
+        labels : Metric labels as keyword arguments
+
+        Method Output
+        ==============
+        Current value, 0 if not recorded yet
+        """
+        with self.__lock__:
+            return self.__values__.get(self.__key__(name, labels), 0)
+
+    def __labels__(self, labels, extra = ()):
+        """
+        This method is used to format labels in Prometheus text format
+
+        Method Input
+        =============
+        labels : Tuple of label name & value pairs
+        extra : Additional label name & value pairs ( default : empty )
+
+        Method Output
+        ==============
+        Formatted labels string
+        """
+        pairs = tuple(labels) + tuple(extra)
+        if len(pairs) == 0:
+            return ''
+        return '{' + ','.join([f'{k}="{v}"' for k, v in pairs]) + '}'
+
+    def render(self):
+        """
+        This method is used to export all metrics in Prometheus text format
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Metrics as string
+        """
+        for name, (callback, callback_label) in list(self.__callbacks__.items()):
+            try:
+                if callback_label:
+                    for label, value in callback().items():
+                        self.set(name, value, **{callback_label: label})
+                else:
+                    self.set(name, callback())
+            except Exception:
+                pass
+        with self.__lock__:
+            series = dict()
+            for (name, labels), value in self.__values__.items():
+                series.setdefault(name, list()).append((labels, value))
+            lines = list()
+            for name in sorted(series):
+                kind = self.__types__.get(name, ('gauge', None))[0]
+                lines.append(f'# HELP {name} {self.__help__.get(name, "")}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in series[name]:
+                    if isinstance(value, Histogram):
+                        cumulative = 0
+                        for bound, count in zip(value.buckets, value.counts):
+                            cumulative += count
+                            lines.append(f'{name}_bucket{self.__labels__(labels, (("le", bound),))} {cumulative}')
+                        lines.append(f'{name}_bucket{self.__labels__(labels, (("le", "+Inf"),))} {value.count}')
+                        lines.append(f'{name}_sum{self.__labels__(labels)} {value.sum}')
+                        lines.append(f'{name}_count{self.__labels__(labels)} {value.count}')
+                    else:
+                        lines.append(f'{name}{self.__labels__(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+# %%
+# Metrics Relay Class
+class Metrics_Relay(Metrics):
+    def __init__(self):
+        """
+        This method is used to initialize metrics registry of a child process, which keeps histogram observations
+        until they are drained & recorded into registry served by parent process
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        super(Metrics_Relay, self).__init__()
+        self.__pending__ = list()
+
+    def observe(self, name, value, **labels):
+        """
+        This method is used to keep observation until next drain
+
+        Method Input
+        =============
+        name : Histogram name
+        value : Observed value
+        labels : Histogram labels as keyword arguments
+
+        Method Output
+        ==============
+        None
+        """
+        with self.__lock__:
+            self.__pending__.append((name, value, labels))
+
+    def drain(self):
+        """
+        This method is used to hand over observations kept since last drain, along with current gauge values
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Tuple of list of observations & dictionary of unlabelled gauge callbacks to their current values
+                            ( [ ( Histogram Name, Value, Labels ) ], { Gauge Name : Value } )
+        """
+        gauges = dict()
+        for name, (callback, callback_label) in list(self.__callbacks__.items()):
+            if not callback_label:
+                try:
+                    gauges[name] = callback()
+                except Exception:
+                    pass
+        with self.__lock__:
+            pending, self.__pending__ = self.__pending__, list()
+        return pending, gauges
+
+# %%
+# Metrics HTTP Request Handler Class
+class Metrics_Handler(BaseHTTPRequestHandler):
+    metrics = None
+
+    def do_GET(self):
+        """
+        This method is used to serve metrics on /metrics path
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """
+        This method is used to silence per scrape access logs
+
+        Method Input
+        =============
+        HTTP request handler log arguments
+
+        Method Output
+        ==============
+        None
+        """
+        pass
+
+# %%
+# Metrics HTTP Server Function
+def serve_metrics(metrics, addr):
+    """
+    This function is used to serve metrics registry over HTTP in background thread
+
+    Function Input
+    ===============
+    metrics : Metrics registry to serve
+    addr : Address to serve metrics on
+                            Format : "IP:Port"
+                            Example : '127.0.0.1:9464'
+
+    Function Output
+    ================
+    HTTP server object
+    """
+    host, port = addr.rsplit(':', 1)
+    handler = type('Bound_Metrics_Handler', (Metrics_Handler,), {'metrics': metrics})
+    server = ThreadingHTTPServer((host.strip('[]'), int(port)), handler)
+    server.daemon_threads = True
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    return server
+
+# %%
+# Rate Limited Request Logger Class
+class Request_Logger:
+    def __init__(self, enabled = False, rate = 1.0):
+        """
+        This method is used to initialize opt-in per request logger with rate limit
+
+        Method Input
+        =============
+        enabled : Boolean variable to print per request logs ( default : False )
+        rate : Maximum number of request logs to print per second ( default : 1.0 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.enabled = enabled
+        self.rate = rate
+        self.suppressed = 0
+        self.__tokens__ = max(rate, 1)
+        self.__last__ = time.monotonic()
+        self.__lock__ = threading.Lock()
+
+    def __call__(self, fields):
+        """
+        This method is used to print request log if rate limit allows it
+
+        Method Input
+        =============
+        fields : Dictionary of log field names & values, printed as "Name: Value"
+
+        Method Output
+        ==============
+        None
+        """
+        if not self.enabled:
+            return
+        with self.__lock__:
+            now = time.monotonic()
+            self.__tokens__ = min(max(self.rate, 1), self.__tokens__ + (now - self.__last__) * self.rate)
+            self.__last__ = now
+            if self.__tokens__ < 1:
+                self.suppressed += 1
+                return
+            self.__tokens__ -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+        for k, v in fields.items():
+            print(f'{k}: {v}')
+        if suppressed != 0:
+            print(f'Suppressed Request Logs: {suppressed}')
+        print('---------------------------------------------\n')
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION AVERAGING WINDOW
+======================================
+
+The following program is used to average Stream Classification probabilities over last frames of a client
+"""
+
+# %%
+# Importing Libraries
+import numpy as np
+
+# %%
+# Stream Classification Averaging Window Class
+class Smoothing_Window:
+    def __init__(self, window = 5):
+        """
+        This method is used to initialize fixed size circular buffer of probabilities for a single client
+
+        Every update replaces the oldest entry & adjusts a running sum, so it costs the same regardless of window size.
+        Batches smaller than the largest batch seen are treated as zero padded, same as padding the whole history.
+
+        Method Input
+        =============
+        window : Stream classification window size to observe ( default : 5 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.window = window
+        self.__data__ = None
+        self.__sum__ = None
+        self.__index__ = 0
+        self.__count__ = 0
+
+    def __grow__(self, rows, classes):
+        """
+        This method is used to extend buffer capacity when a larger batch than before is received
+
+        Method Input
+        =============
+        rows : New number of rows to keep for every entry
+        classes : Number of Stream Classification labels
+
+        Method Output
+        ==============
+        None
+        """
+        data, run_sum = np.zeros((self.window, rows, classes)), np.zeros((rows, classes))
+        if self.__data__ is not None:
+            data[:, :self.__data__.shape[1]] = self.__data__
+            run_sum[:self.__sum__.shape[0]] = self.__sum__
+        self.__data__, self.__sum__ = data, run_sum
+
+    def __call__(self, inf_probs):
+        """
+        This method is used to push new probabilities into window & find average over window
+
+        Method Input
+        =============
+        inf_probs : Stream classification output in the form of Numpy probabilities
+
+        Method Output
+        ==============
+        Averaged probabilities as Numpy array
+        """
+        curr_sizer = inf_probs.shape[0]
+        if self.__data__ is None or curr_sizer > self.__data__.shape[1]:
+            self.__grow__(curr_sizer, inf_probs.shape[1])
+        slot = self.__data__[self.__index__]
+        if self.__count__ == self.window:
+            self.__sum__ -= slot
+        else:
+            self.__count__ += 1
+        slot[:curr_sizer] = inf_probs
+        slot[curr_sizer:] = 0
+        self.__sum__ += slot
+        self.__index__ = (self.__index__ + 1) % self.window
+        return (self.__sum__[:curr_sizer] / self.__count__).astype(inf_probs.dtype)
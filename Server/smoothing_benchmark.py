@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION AVERAGING WINDOW BENCHMARK
+================================================
+
+The following program is used to compare list based & circular buffer based averaging of Stream Classification probabilities
+"""
+
+# %%
+# Importing Libraries
+from smoothing import *
+import numpy as np
+import time
+import argparse
+
+# %%
+# List Based Averaging Window Class
+class List_Window:
+    def __init__(self, window = 5):
+        """
+        This method is used to initialize list based averaging window, as previously used by inference server
+
+        Method Input
+        =============
+        window : Stream classification window size to observe ( default : 5 )
+
+        Method Output
+        ==============
+        None
+        """
+        self.window = window
+        self.__data__ = list()
+
+    def __call__(self, inf_probs):
+        """
+        This method is used to push new probabilities into window & find average over window
+
+        Method Input
+        =============
+        inf_probs : Stream classification output in the form of Numpy probabilities
+
+        Method Output
+        ==============
+        Averaged probabilities as Numpy array
+        """
+        curr_sizer = inf_probs.shape[0]
+        if len(self.__data__) == 0:
+            self.__data__.append(inf_probs)
+        else:
+            prev_sizer = max([i.shape[0] for i in self.__data__])
+            if curr_sizer <= prev_sizer:
+                inf_probs = np.pad(inf_probs, ((0,prev_sizer-curr_sizer),(0,0)))
+            else:
+                self.__data__ = [np.pad(i, ((0,curr_sizer-prev_sizer),(0,0)))for i in self.__data__]
+            self.__data__.append(inf_probs)
+            if len(self.__data__) > self.window:
+                del self.__data__[0]
+        avg = sum(self.__data__) / len(self.__data__)
+        return avg[:curr_sizer]
+
+# %%
+# Benchmark Function
+def benchmark(window_cls, window, batches):
+    """
+    This function is used to time averaging window over sequence of batches
+
+    Function Input
+    ===============
+    window_cls : Averaging window class subject to benchmark
+    window : Stream classification window size to observe
+    batches : List of Numpy probabilities to push through window
+
+    Function Output
+    ================
+    Tuple of average time per update in microseconds & list of averaged outputs
+                            ( Time per Update, Averaged Outputs )
+    """
+    win_obj = window_cls(window)
+    st = time.perf_counter()
+    outs = [win_obj(i) for i in batches]
+    return (time.perf_counter() - st) / len(batches) * 1e6, outs
+
+# %%
+# Benchmark Execution
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Stream Classification Averaging Window Benchmark.')
+    parser.add_argument('-w', '--windows', nargs = '+', type = int, help = 'Averaging Window Sizes to Benchmark', default = [5, 50, 500])
+    parser.add_argument('-u', '--updates', type = int, help = 'Number of Updates per Window Size', default = 2000)
+    parser.add_argument('-mb', '--max_batch', type = int, help = 'Maximum Batch Size of Generated Updates', default = 8)
+    parser.add_argument('-c', '--classes', type = int, help = 'Number of Stream Classification Labels', default = 3)
+    parser.add_argument('-sd', '--seed', type = int, help = 'Seed Value for Generated Probabilities', default = 42)
+    args = vars(parser.parse_args())
+    generator = np.random.default_rng(args['seed'])
+    batches = [generator.dirichlet(np.ones(args['classes']), size = generator.integers(1, args['max_batch'] + 1)).astype(np.float32) for _ in range(args['updates'])]
+    print(f'{"Window":>8} | {"List (us/update)":>18} | {"Circular (us/update)":>20} | {"Speedup":>8} | {"Max Abs Difference":>18}')
+    for window in args['windows']:
+        list_time, list_outs = benchmark(List_Window, window, batches)
+        ring_time, ring_outs = benchmark(Smoothing_Window, window, batches)
+        max_diff = max([np.abs(i - j).max() for i, j in zip(list_outs, ring_outs)])
+        print(f'{window:>8} | {list_time:>18.2f} | {ring_time:>20.2f} | {list_time / ring_time:>7.1f}x | {max_diff:>18.2e}')
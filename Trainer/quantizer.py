@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+"""
+STREAM CLASSIFICATION MODEL QUANTIZER
+=====================================
+
+The following program is used to quantize trained model to INT8 for faster CPU inference
+"""
+
+# %%
+# Importing Libraries
+from trainer import *
+import time
+import copy
+from torch.ao.quantization import get_default_qconfig_mapping, quantize_dynamic
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+# %%
+# Main Quantizer Class
+class Quantizer(Trainer):
+    def __init__(self, addr, OHE, mod_addr, q_addr, percentage=[70, 15, 15], calib_samples = 256, batch_size = 32, mode = 'static', engine = 'x86', seed = 42):
+        """
+        This method is used to initialize post training quantizer on same data splits as model trainer
+
+        Method Input
+        =============
+        addr : Absolute address of the parent directory of images sub-directories
+        OHE : Absolute address of one hot encoded labels file of trained model
+        mod_addr : Absolute address of trained model file
+        q_addr : Absolute address to save quantized TorchScript model file
+        percentage : List of splitting percentage of the data into Training, Testing & Validation
+                            FORMAT : [ Training Data, Validation Data, Testing Data]
+        calib_samples : Number of training images to calibrate static quantization on ( default : 256 )
+        batch_size : Batch size of input data ( default : 32 )
+        mode : Quantization mode, 'static' for INT8 convolutions & linears, 'dynamic' for INT8 linears only ( default : static )
+        engine : Quantized engine to run model on, 'x86' / 'fbgemm' for x86 & 'qnnpack' for ARM hosts ( default : x86 )
+        seed : Seed value for the random split, same as used in training ( default : 42 )
+
+        Method Output
+        ==============
+        None
+        """
+        super().__init__(addr, OHE, mod_addr, percentage = percentage, batch_size = batch_size, seed = seed)
+        self.quantized_address = q_addr
+        self.calibration_samples = calib_samples
+        self.mode = mode
+        self.engine = engine
+        self.__device__ = 'cpu'
+        with open(self.ohe_address, 'rb') as file1:
+            self.current_ohes = pickle.load(file1)
+        # Labels are taken from trained model, as sub-directories may be listed in different order now
+        self.__addr_labels__['labels'] = [self.current_ohes[i.split('/')[-2]] for i in self.__addr_labels__['addrs']]
+        torch.backends.quantized.engine = self.engine
+
+    def __str__(self):
+        """
+        This method is __str__ implementation of subject class
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        New Line
+        """
+        print(f'Dataset Address: {self.dataset_address}')
+        print(f'Model Address: {self.model_address}')
+        print(f'Quantized Model Address: {self.quantized_address}')
+        print(f'Stream Classification Labels: {list(self.current_ohes.keys())}')
+        print(f'Quantization Mode: {self.mode}')
+        print(f'Quantized Engine: {self.engine}')
+        print(f'Calibration Samples: {self.calibration_samples}')
+        print(f'Batch Size: {self.batch_size}')
+        print(f'Data Split Percentage: {self.percentage}')
+        print(f'Data Split Seed: {self.seed}')
+        return '\n'
+
+    def __calibrate__(self, prepared):
+        """
+        This method is used to record activation ranges of prepared model on calibration images
+
+        Method Input
+        =============
+        prepared : Model prepared for static quantization with observers
+
+        Method Output
+        ==============
+        None
+        """
+        calib_data = Data(self.train_data.__files__[:self.calibration_samples], self.train_data.label[:self.calibration_samples], inference_transforms)
+        calib_loader = torch.utils.data.DataLoader(calib_data, batch_size = self.batch_size, shuffle = False)
+        with torch.no_grad():
+            with tqdm.tqdm(total = len(calib_loader), bar_format = '{l_bar}{bar:10}{r_bar}{bar:-10b}', position = 0, leave = True) as bar:
+                for dat, labs in calib_loader:
+                    prepared(dat)
+                    bar.set_description('Calibrating Activation Ranges | Batch')
+                    bar.update(1)
+
+    def __quantize__(self):
+        """
+        This method is used to quantize loaded model, statically if possible & dynamically otherwise
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        Tuple of quantized model & quantization mode used
+                            ( Quantized Model, Quantization Mode )
+        """
+        if self.mode == 'static':
+            try:
+                prepared = prepare_fx(copy.deepcopy(self.mod), get_default_qconfig_mapping(self.engine), (torch.rand(dummy_input_shape),))
+                self.__calibrate__(prepared)
+                return convert_fx(prepared), 'static'
+            except Exception as e:
+                print(f'>>>>> Static Quantization Failed, Falling Back to Dynamic Quantization: {e}')
+        return quantize_dynamic(copy.deepcopy(self.mod), {torch.nn.Linear}, dtype = torch.qint8), 'dynamic'
+
+    def __evaluate__(self, mod, data, name):
+        """
+        This method is used to find accuracy & forward pass time of model on held out data
+
+        Method Input
+        =============
+        mod : Model subject to evaluation
+        data : Data object of held out images
+        name : Model name to show in progress bar
+
+        Method Output
+        ==============
+        Tuple of accuracy & average forward pass time per batch in milliseconds
+                            ( Accuracy, Time per Batch )
+        """
+        loader = torch.utils.data.DataLoader(data, batch_size = self.batch_size, shuffle = False)
+        correct, total, elapsed = 0, 0, 0.0
+        with torch.no_grad():
+            with tqdm.tqdm(total = len(loader), bar_format = '{l_bar}{bar:10}{r_bar}{bar:-10b}', position = 0, leave = True) as bar:
+                for dat, labs in loader:
+                    st = time.perf_counter()
+                    out = mod(dat)
+                    elapsed += time.perf_counter() - st
+                    correct += (torch.argmax(out, axis = 1) == labs.view(-1)).sum().item()
+                    total += len(labs)
+                    bar.set_description(f'Evaluating {name} Model | Batch')
+                    bar.update(1)
+        return correct / max(total, 1), elapsed / max(len(loader), 1) * 1000
+
+    def __call__(self):
+        """
+        This method is used to quantize, save & evaluate the model
+
+        Method Input
+        =============
+        None
+
+        Method Output
+        ==============
+        None
+        """
+        self.__data_process__()
+        self.mod = Model(len(self.current_ohes))
+        self.mod.load_state_dict(torch.load(self.model_address, map_location = self.__device__))
+        self.mod.eval()
+        quantized, mode = self.__quantize__()
+        with torch.no_grad():
+            scripted = torch.jit.freeze(torch.jit.trace(quantized, torch.rand(dummy_input_shape)).eval())
+        torch.jit.save(scripted, self.quantized_address)
+        held_out = self.test_data if len(self.test_data) != 0 else self.valid_data
+        fp32_acc, fp32_time = self.__evaluate__(self.mod, held_out, 'FP32')
+        int8_acc, int8_time = self.__evaluate__(scripted, held_out, 'INT8')
+        print('\n---------------------------------------------\n')
+        print(f'Quantization Mode: {mode}')
+        print(f'Held Out Images: {len(held_out)}')
+        print(f'FP32 Accuracy: {fp32_acc * 100:.2f} % | INT8 Accuracy: {int8_acc * 100:.2f} % | Accuracy Delta: {(int8_acc - fp32_acc) * 100:+.2f} %')
+        print(f'FP32 Batch Time: {fp32_time:.2f} ms | INT8 Batch Time: {int8_time:.2f} ms | Speedup: {fp32_time / max(int8_time, 1e-9):.2f}x')
+        print(f'\n>>>>> Quantized Model Saved at {self.quantized_address}')
+        print('\n---------------------------------------------\n')
+
+# %%
+# Quantization Execution
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Stream Classification Model Quantizer.')
+    parser.add_argument('-qm', '--mode', type = str, choices = ['static', 'dynamic'], help = 'Quantization Mode ( Static for INT8 Convolutions & Linears, Dynamic for INT8 Linears Only )', default = 'static')
+    parser.add_argument('-qe', '--engine', type = str, choices = ['x86', 'fbgemm', 'qnnpack'], help = 'Quantized Engine of Inference Hosts', default = 'x86')
+    parser.add_argument('-cs', '--calib_samples', type = int, help = 'Number of Training Images to Calibrate Static Quantization On', default = 256)
+    parser.add_argument('-bs', '--batch_size', type = int, help = 'Batch Size of Input Data', default = 32)
+    parser.add_argument('-trs', '--training_split', type = int, help = 'Training Split Percentage', default = 70)
+    parser.add_argument('-vas', '--validation_split', type = int, help = 'Validation Split Percentage', default = 15)
+    parser.add_argument('-tes', '--testing_split', type = int, help = 'Testing Split Percentage', default = 15)
+    parser.add_argument('-sd', '--seed', type = int, help = 'Seed Value Used to Randomize Dataset During Training', default = 42)
+    parser.add_argument('-d', '--data', type = str, help = 'Absolute Aaddress of the Parent Directory of Images Sub-Directories', default = '/data')
+    parser.add_argument('-ohe', '--OHE', type = str, help = 'Absolute Address of One Hot Encoded Labels file', default = '/resources/OHE.labels')
+    parser.add_argument('-ms', '--msaddr', type = str, help = 'Absolute Address of Trained Model File', default = '/resources/convnext.model')
+    parser.add_argument('-qa', '--qaddr', type = str, help = 'Absolute Address to Save Quantized Model File', default = '/resources/convnext_int8.pt')
+    args = vars(parser.parse_args())
+    qua = Quantizer(addr = args['data'], OHE = args['OHE'], mod_addr = args['msaddr'], q_addr = args['qaddr'], percentage = [args['training_split'], args['validation_split'], args['testing_split']], calib_samples = args['calib_samples'], batch_size = args['batch_size'], mode = args['mode'], engine = args['engine'], seed = args['seed'])
+    print(qua)
+    qua()
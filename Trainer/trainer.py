@@ -71,10 +71,13 @@ class Data(torch.utils.data.Dataset):
 # %%
 # Main Trainer Class
 class Trainer:
-    def __init__(self, addr, OHE, mod_addr, percentage=[70, 15, 15], epochs = 5, learn_rate = 0.001, batch_size=32, train_shuffle=True, seed=42):
+    def __init__(self, addr, OHE, mod_addr, percentage=[70, 15, 15], epochs = 5, learn_rate = 0.001, batch_size=32, train_shuffle=True, seed=42, architecture='convnext'):
         """
         This method is used to initialize model trainer
 
+        If one hot encoded labels file already exists with same classes as dataset, its labels are reused,
+        so models trained on same data, such as screener for inference cascade, share class indices.
+
         Method Input
         =============
         addr : Absolute address of the parent directory of images sub-directories
@@ -87,6 +90,7 @@ class Trainer:
         batch_size : Batch size of input data ( default : 32 )
         train_shuffle : Boolean valiable to shuffle training data ( default : True )
         seed : Seed value for the random split ( default : 42 )
+        architecture : Model architecture to train, out of 'convnext', 'convnext_exits' & 'mobilenet' ( default : convnext )
 
         Method Output
         ==============
@@ -102,7 +106,13 @@ class Trainer:
         self.batch_size = batch_size
         self.training_shuffle = train_shuffle
         self.seed = seed
+        self.architecture = architecture
         self.classes = os.listdir(self.dataset_address)
+        if os.path.isfile(self.ohe_address):
+            with open(self.ohe_address, 'rb') as file1:
+                existing_ohes = pickle.load(file1)
+            if set(existing_ohes) == set(self.classes):
+                self.classes = sorted(existing_ohes, key = existing_ohes.get)
         self.current_ohes = dict()
         self.distribution = dict()
         self.__addr_labels__ = {'addrs': list(), 'labels': list()}
@@ -135,6 +145,7 @@ class Trainer:
         ========================================
         """)
         print(f'Acceleration Device: {self.__device__}')
+        print(f'Model Architecture: {self.architecture}')
         print(f'Training Epochs: {self.epochs}')
         print(f'Learning Rate: {self.learning_rate}')
         print(f'Batch Size: {self.batch_size}')
@@ -319,8 +330,10 @@ class Trainer:
                 dat, labs = next(self.training_data_loader_iter)
                 labs = labs.squeeze().type(torch.LongTensor).to(self.__device__)
                 with torch.cuda.amp.autocast():
-                    out = self.mod(dat.to(self.__device__))
-                    loss1 = self.loss(out, labs)
+                    # Early exit heads are trained jointly with final head, on equally weighted losses
+                    outs = self.mod.forward_exits(dat.to(self.__device__)) if isinstance(self.mod, Early_Exit_Model) else [self.mod(dat.to(self.__device__))]
+                    out = outs[-1]
+                    loss1 = sum([self.loss(i, labs) for i in outs]) / len(outs)
                     self.__history__['training']['epoch'].append(current_epoch + 1)
                     self.__history__['training']['batch'].append(tb + 1)
                     self.__history__['training']['accuracy'].append(self.__accuracy__(out, labs))
@@ -416,7 +429,7 @@ class Trainer:
         None
         """
         self.__data_process__()
-        self.mod = Model(len(self.classes))
+        self.mod = model_architectures[self.architecture](len(self.classes))
         self.mod.to(self.__device__)
         self.loss = torch.nn.CrossEntropyLoss()
         self.optimizer = torch.optim.Adam(self.mod.parameters(), lr =self.learning_rate, weight_decay=1e-4)
@@ -458,8 +471,9 @@ if __name__ == '__main__':
     parser.add_argument('-d', '--data', type = str, help = 'Absolute Aaddress of the Parent Directory of Images Sub-Directories', default = '/data')
     parser.add_argument('-ohe', '--OHE', type = str, help = 'Absolute Address to Save One Hot Encoded Labels file', default = '/resources/OHE.labels')
     parser.add_argument('-ms', '--msaddr', type = str, help = 'Absolute Address to Save Model File', default = '/resources/convnext.model')
+    parser.add_argument('-arc', '--architecture', type = str, choices = list(model_architectures), help = 'Model Architecture to Train ( ConvNeXt-Tiny / ConvNeXt-Tiny with Early Exit Heads / MobileNetV3-Small Screener )', default = 'convnext')
     args = vars(parser.parse_args())
-    tra = Trainer(addr = args['data'], OHE = args['OHE'], mod_addr = args['msaddr'], percentage = [args['training_split'], args['validation_split'], args['testing_split']], epochs = args['epochs'], learn_rate = args['lr'], batch_size = args['batch_size'], train_shuffle = args['train_shuffle'], seed = args['seed'])
+    tra = Trainer(addr = args['data'], OHE = args['OHE'], mod_addr = args['msaddr'], percentage = [args['training_split'], args['validation_split'], args['testing_split']], epochs = args['epochs'], learn_rate = args['lr'], batch_size = args['batch_size'], train_shuffle = args['train_shuffle'], seed = args['seed'], architecture = args['architecture'])
     print(tra)
     tra()
     
\ No newline at end of file
@@ -11,6 +11,8 @@ The following program is the model definition for Stream Classification
 # Importing Libraries
 import os
 import pickle
+import warnings
+from collections import OrderedDict
 from PIL import Image
 import numpy as np
 import torch
@@ -37,6 +39,104 @@ inference_transforms = tv.transforms.Compose([
 # Input Shape
 dummy_input_shape = (1,3,224,224)
 
+# %%
+# Batched Inference Transforms
+class Batch_Transforms:
+    def __init__(self, size = (224, 224), mean = [0.485, 0.456, 0.406], std = [0.229, 0.224, 0.225], cache_size = 8, channels_last = False):
+        """
+        This method is used to initialize vectorized equivalent of inference transforms
+
+        Outputs match inference_transforms within one 8-bit intensity level per pixel, i.e. absolute
+        difference of at most 1 / ( 255 * std ) ( ~0.0175 ) after normalization, as both resize with
+        antialiased bilinear interpolation but round intermediate pixels differently.
+
+        Method Input
+        =============
+        size : Output spatial size as ( Height, Width ) ( default : ( 224, 224 ) )
+        mean : Per channel normalization mean ( default : ImageNet mean )
+        std : Per channel normalization standard deviation ( default : ImageNet standard deviation )
+        cache_size : Number of batch sizes for which output buffers are kept preallocated ( default : 8 )
+        channels_last : Boolean variable to keep output buffers in channels last memory format ( default : False )
+
+        Method Output
+        ==============
+        None
+        """
+        self.size = tuple(size)
+        self.cache_size = cache_size
+        self.memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        self.__scale__ = (1 / (255 * torch.tensor(std))).view(1, -1, 1, 1)
+        self.__bias__ = (-torch.tensor(mean) / torch.tensor(std)).view(1, -1, 1, 1)
+        self.__uint8_resize__ = True
+        self.__buffers__ = OrderedDict()
+
+    def __buffer__(self, shape):
+        """
+        This method is used to fetch preallocated output buffer for subject batch shape
+
+        Method Input
+        =============
+        shape : Buffer shape as ( Batch, Channel, Height, Width )
+
+        Method Output
+        ==============
+        Float32 Torch tensor of subject shape, in output memory format
+        """
+        if shape in self.__buffers__:
+            self.__buffers__.move_to_end(shape)
+        else:
+            self.__buffers__[shape] = torch.empty(shape, dtype = torch.float32, memory_format = self.memory_format)
+            if len(self.__buffers__) > self.cache_size:
+                self.__buffers__.popitem(last = False)
+        return self.__buffers__[shape]
+
+    def __resize__(self, src):
+        """
+        This method is used to resize complete image batch to output size
+
+        Method Input
+        =============
+        src : uint8 Torch tensor with following shape:
+                            [ Batch x Channel x Height x Width ]
+
+        Method Output
+        ==============
+        Resized Torch tensor
+        """
+        if self.__uint8_resize__:
+            try:
+                return torch.nn.functional.interpolate(src, size = self.size, mode = 'bilinear', align_corners = False, antialias = True)
+            except (RuntimeError, NotImplementedError):
+                self.__uint8_resize__ = False
+        return torch.nn.functional.interpolate(src.float(), size = self.size, mode = 'bilinear', align_corners = False, antialias = True)
+
+    def __call__(self, btch_dat):
+        """
+        This method is used to resize, scale & normalize complete image batch in vectorized form
+
+        Returned tensor is a preallocated buffer, which is overwritten by the next call with same batch size.
+        In channels last memory format, unresized images are copied into it as is, since they are already
+        stored with channels last.
+
+        Method Input
+        =============
+        btch_dat : Stacked uint8 Numpy images with following shape:
+                            [ Batch x Height x Width x Channel ]
+
+        Method Output
+        ==============
+        Normalized Torch tensor with following shape:
+                            [ Batch x Channel x Height x Width ]
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            src = torch.from_numpy(btch_dat).permute(0, 3, 1, 2)
+        if tuple(src.shape[2:]) != self.size:
+            src = self.__resize__(src)
+        out = self.__buffer__(tuple(src.shape))
+        out.copy_(src)
+        return out.mul_(self.__scale__).add_(self.__bias__)
+
 # %%
 # Main Model Definition
 class Model(torch.nn.Module):
@@ -69,4 +169,120 @@ class Model(torch.nn.Module):
         Output results after forward propagation
         """
         return self.convnext(x)
-    
\ No newline at end of file
+    
+# %%
+# Early Exit Model Definition
+class Early_Exit_Model(Model):
+    def __init__(self, num_classes, exit_channels = (96, 192, 384)):
+        """
+        This method is used to initialize Model with auxiliary classification heads after its first three stages,
+        so confidently classified frames can stop before running all stages
+
+        Method Input
+        =============
+        num_classes : Number of classes to make classification model for
+        exit_channels : Number of output channels of ConvNeXt-Tiny stages with early exit heads ( default : ( 96, 192, 384 ) )
+
+        Method Output
+        ==============
+        None
+        """
+        super(Early_Exit_Model, self).__init__(num_classes)
+        self.exits = torch.nn.ModuleList([torch.nn.Sequential(torch.nn.AdaptiveAvgPool2d(1), tv.models.convnext.LayerNorm2d(i, eps = 1e-6), torch.nn.Flatten(1), torch.nn.Linear(i, num_classes)) for i in exit_channels])
+        self.exits.requires_grad_(True)
+        self.exit_names = tuple(f'stage_{i + 1}' for i in range(len(exit_channels))) + ('final',)
+
+    def forward_exits(self, x):
+        """
+        This method is used to perform forward propagation through all stages, with outputs of every head
+
+        Method Input
+        =============
+        x : Input data as image batch ( Batch x Channel x Height x Width)
+
+        Method Output
+        ==============
+        List of output results of early exit heads, in order of stages, followed by output results of final head
+        """
+        outs = list()
+        # ConvNeXt features alternate between downsampling & stage layers, so stage N ends at layer 2N - 1
+        for idx, layer in enumerate(self.convnext.features):
+            x = layer(x)
+            if idx % 2 == 1 and idx // 2 < len(self.exits):
+                outs.append(self.exits[idx // 2](x))
+        outs.append(self.convnext.classifier(self.convnext.avgpool(x)))
+        return outs
+
+    def early_exit(self, x, threshold = 0.9):
+        """
+        This method is used to perform forward propagation in which every frame stops at first head whose top label
+        probability reaches threshold, so only frames not yet classified are passed through later stages
+
+        Method Input
+        =============
+        x : Input data as image batch ( Batch x Channel x Height x Width)
+        threshold : Top label probability at which frame exits ( default : 0.9 )
+
+        Method Output
+        ==============
+        Tuple of float32 output results of exit head of every frame & index of its exit head in exit_names
+                            ( Output Results, Exit Indices )
+        """
+        rows = torch.arange(x.shape[0], device = x.device)
+        exits = torch.full((x.shape[0],), len(self.exits), dtype = torch.long, device = x.device)
+        logits = None
+        for idx, layer in enumerate(self.convnext.features):
+            x = layer(x)
+            if idx % 2 == 0 or idx // 2 >= len(self.exits):
+                continue
+            out = self.exits[idx // 2](x).float()
+            if logits is None:
+                logits = out.new_empty((rows.shape[0], out.shape[1]))
+            confident = torch.softmax(out, dim = 1).max(dim = 1).values >= threshold
+            if not confident.any():
+                continue
+            logits[rows[confident]] = out[confident]
+            exits[rows[confident]] = idx // 2
+            rows, x = rows[~confident], x[~confident]
+            if rows.shape[0] == 0:
+                return logits, exits
+        logits[rows] = self.convnext.classifier(self.convnext.avgpool(x)).float()
+        return logits, exits
+
+# %%
+# Screener Model Definition
+class Screener_Model(torch.nn.Module):
+    def __init__(self, num_classes):
+        """
+        This method is used to initialize Screener Model, a small & fast model which classifies every frame
+        ahead of Model in inference cascade, so only frames it is not confident about are run through Model
+
+        Method Input
+        =============
+        num_classes : Number of classes to make classification model for
+
+        Method Output
+        ==============
+        None
+        """
+        super(Screener_Model, self).__init__()
+        self.mobilenet = tv.models.mobilenet_v3_small(pretrained=False, progress = False, num_classes = num_classes)
+        self.mobilenet.requires_grad_(True)
+
+    def forward(self, x):
+        """
+        This method is used to perform forward propagation on input data
+
+        Method Input
+        =============
+        x : Input data as image batch ( Batch x Channel x Height x Width)
+
+        Method Output
+        ==============
+        Output results after forward propagation
+        """
+        return self.mobilenet(x)
+
+# %%
+# Available Model Architectures
+model_architectures = {'convnext': Model, 'convnext_exits': Early_Exit_Model, 'mobilenet': Screener_Model}